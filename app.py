@@ -1,15 +1,11 @@
 
-import os
-import json
 import datetime
-import importlib
-import pandas as pd
 import streamlit as st
 
-from core.utils import load_yaml
+from core.registry import get_registry, get_providers
 from core.detectors import detect_environment
 from core.schema import AuditReport, UserEnvironment
-from core.report import generate_pdf
+from core import export_cache
 
 # --- Page config ---
 st.set_page_config(page_title="AI Shield Auditor", page_icon="🛡️", layout="wide")
@@ -18,10 +14,10 @@ st.title("🛡️ AI Shield Security Auditor")
 st.caption("Self-guided audit for LLM/chatbot security, privacy, and governance")
 
 # --- Load templates ---
-QUESTIONS = load_yaml("templates/questions.yml")
-PROVIDERS = load_yaml("templates/providers.yml")
+REGISTRY = get_registry()
+PROVIDERS = get_providers()
 
-SECTIONS = list(QUESTIONS["sections"].keys())
+SECTIONS = REGISTRY.sections
 
 # --- Session State ---
 if "env" not in st.session_state:
@@ -63,16 +59,7 @@ for i, section in enumerate(SECTIONS):
     with tabs[i]:
         st.subheader(section)
 
-        # Load questions
-        qlist = QUESTIONS["sections"][section]["questions"]
-
-        # Inject questions into audit class module before instantiation
-        module_name = section.lower().replace(" & ", "_").replace(" ", "_")
-        mod = importlib.import_module(f"audits.{module_name}")
-        setattr(mod, "template_questions", qlist)
-        # Find class in module by convention
-        class_name = "".join([w.capitalize() for w in module_name.split("_")]) + "Audit"
-        audit_cls = getattr(mod, class_name)()
+        qlist = REGISTRY.questions(section)
 
         # Render questions
         cols = st.columns(2)
@@ -101,14 +88,8 @@ if run:
 
     # Evaluate each section
     results = []
-    for section in SECTIONS:
-        module_name = section.lower().replace(" & ", "_").replace(" ", "_")
-        mod = importlib.import_module(f"audits.{module_name}")
-        class_name = "".join([w.capitalize() for w in module_name.split("_")]) + "Audit"
-        audit_cls = getattr(mod, class_name)()
-
-        answers = st.session_state.answers[section]
-        res = audit_cls.evaluate(answers)
+    for entry in REGISTRY:
+        res = entry.audit.evaluate(st.session_state.answers[entry.section])
         results.append(res)
 
     # Build report
@@ -122,7 +103,8 @@ if run:
         }
     )
 
-    # Display overview table
+    # Display overview table (pandas is only loaded once there are results)
+    import pandas as pd
     df = pd.DataFrame([{
         "Category": r.category,
         "Score": r.score,
@@ -138,23 +120,16 @@ if export_json:
     if not st.session_state.results:
         st.error("Run the audit first.")
     else:
-        payload = st.session_state.results.model_dump()
-        payload["summary"]["overall_score"] = st.session_state.results.overall_score()
-        payload["summary"]["overall_risk"] = st.session_state.results.overall_risk()
-        js = json.dumps(payload, indent=2)
+        js = export_cache.export_json(st.session_state.results)
         st.download_button("Download JSON", js, file_name="ai_shield_audit.json", mime="application/json")
 
 if export_pdf:
     if not st.session_state.results:
         st.error("Run the audit first.")
     else:
-        payload = st.session_state.results
-        payload.summary["overall_score"] = str(payload.overall_score())
-        payload.summary["overall_risk"] = payload.overall_risk()
-        path = f"reports/audit_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = generate_pdf(payload, path)
-        with open(pdf_path, "rb") as f:
-            st.download_button("Download PDF", f, file_name=os.path.basename(pdf_path), mime="application/pdf")
+        pdf_bytes = export_cache.export_pdf(st.session_state.results)
+        file_name = f"audit_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
+        st.download_button("Download PDF", pdf_bytes, file_name=file_name, mime="application/pdf")
 
 st.markdown("---")
 st.caption("Starter kit • Checklist-first design • Optional LLM enhancements can be added in core/scoring.py and prompts/")
@@ -7,10 +7,8 @@ Enhanced AI Shield Security Auditor with production features
 """
 
 import os
-import json
 import datetime
-import importlib
-import pandas as pd
+import time
 import streamlit as st
 from dotenv import load_dotenv
 
@@ -18,19 +16,31 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import core modules
-from core.utils import load_yaml
+from core.registry import get_registry, get_providers
 from core.detectors import detect_environment
 from core.schema import AuditReport, UserEnvironment
-from core.report import generate_pdf
+from core import export_cache
 from core.logging_config import setup_logging, get_logger
 from core.security import SecurityValidator, RateLimiter, redact_sensitive_info
-from core.health import get_health_status, check_dependencies, check_llm_providers
+from core.health import get_health_status, check_dependencies, check_llm_providers, get_system_metrics
+from core.metrics import AUDIT_SECONDS, AUDITS_IN_PROGRESS, LLM_REVIEW_SECONDS, start_exporters_from_env
+from core.llm_scoring import get_provider, enhance_results_sync
+from core.llm_cache import get_llm_cache
+from core.incremental import SectionMemo
+from core.history import get_history
+from core.threat_index import get_threat_index
 
 # Setup logging
 log_level = os.getenv("LOG_LEVEL", "INFO")
 setup_logging(log_level)
 logger = get_logger(__name__)
 
+# Prometheus exporters (METRICS_PORT / METRICS_FILE); started once per process
+start_exporters_from_env()
+
+# Optional directory to keep a copy of every exported PDF (e.g. a mounted volume)
+pdf_archive_dir = os.getenv("PDF_ARCHIVE_DIR")
+
 # Initialize security components
 validator = SecurityValidator()
 rate_limiter = RateLimiter(max_requests=50, window_seconds=60)
@@ -80,9 +90,9 @@ def safe_execute(func, error_message="An error occurred"):
 
 # --- Load templates with error handling ---
 try:
-    QUESTIONS = load_yaml("templates/questions.yml")
-    PROVIDERS = load_yaml("templates/providers.yml")
-    SECTIONS = list(QUESTIONS["sections"].keys())
+    REGISTRY = get_registry()
+    PROVIDERS = get_providers()
+    SECTIONS = REGISTRY.sections
     logger.info("Templates loaded successfully", sections=len(SECTIONS))
 except Exception as e:
     logger.error("Failed to load templates", error=str(e))
@@ -96,8 +106,12 @@ if "answers" not in st.session_state:
     st.session_state.answers = {s: {} for s in SECTIONS}
 if "results" not in st.session_state:
     st.session_state.results = None
+if "results_key" not in st.session_state:
+    st.session_state.results_key = None
 if "audit_count" not in st.session_state:
     st.session_state.audit_count = 0
+if "section_memo" not in st.session_state:
+    st.session_state.section_memo = SectionMemo()
 
 # --- Sidebar: Environment & Settings ---
 with st.sidebar:
@@ -108,6 +122,10 @@ with st.sidebar:
         health = get_health_status()
         st.json(health)
 
+        # Latest background sample; never blocks the rerun
+        st.write("**System:**")
+        st.json(get_system_metrics())
+
         deps = check_dependencies()
         st.write("**Dependencies:**")
         for dep, status in deps.items():
@@ -148,6 +166,12 @@ with st.sidebar:
         help="Vector database for RAG (if applicable)"
     )
 
+    app_id = st.text_input(
+        "Application ID",
+        value="default",
+        help="Audits are recorded in the local history under this name"
+    )
+
     sensitive_data_types = st.multiselect(
         "Sensitive Data Types",
         ["PII", "PHI", "PCI", "Secrets", "Proprietary"],
@@ -202,7 +226,7 @@ st.markdown("---")
 # Progress indicator
 if st.session_state.env:
     answered = sum(len(answers) for answers in st.session_state.answers.values())
-    total = sum(len(QUESTIONS["sections"][s]["questions"]) for s in SECTIONS)
+    total = REGISTRY.total_questions
     progress = answered / total if total > 0 else 0
 
     col1, col2, col3 = st.columns(3)
@@ -224,21 +248,7 @@ for i, section in enumerate(SECTIONS):
     with tabs[i]:
         st.subheader(f"📋 {section}")
 
-        # Load questions
-        qlist = QUESTIONS["sections"][section]["questions"]
-
-        # Inject questions into audit class module
-        module_name = section.lower().replace(" & ", "_").replace(" ", "_")
-
-        try:
-            mod = importlib.import_module(f"audits.{module_name}")
-            setattr(mod, "template_questions", qlist)
-            class_name = "".join([w.capitalize() for w in module_name.split("_")]) + "Audit"
-            audit_cls = getattr(mod, class_name)()
-        except Exception as e:
-            logger.error(f"Failed to load audit module: {module_name}", error=str(e))
-            st.error(f"⚠️ Failed to load {section} audit module")
-            continue
+        qlist = REGISTRY.questions(section)
 
         # Render questions in a cleaner layout
         st.markdown(f"**Answer {len(qlist)} questions honestly:**")
@@ -281,6 +291,7 @@ with col4:
 if clear:
     st.session_state.answers = {s: {} for s in SECTIONS}
     st.session_state.results = None
+    st.session_state.results_key = None
     st.rerun()
 
 if run:
@@ -298,17 +309,47 @@ if run:
 
     with st.spinner("🔍 Running comprehensive security audit..."):
         def run_audit():
-            results = []
-
-            for section in SECTIONS:
-                module_name = section.lower().replace(" & ", "_").replace(" ", "_")
-                mod = importlib.import_module(f"audits.{module_name}")
-                class_name = "".join([w.capitalize() for w in module_name.split("_")]) + "Audit"
-                audit_cls = getattr(mod, class_name)()
-
-                answers = st.session_state.answers[section]
-                res = audit_cls.evaluate(answers)
-                results.append(res)
+            # Optional LLM review (LLM_PROVIDER); checklist results stand if it fails
+            try:
+                llm_provider = get_provider()
+            except ValueError as e:
+                logger.warning("LLM scoring disabled", error=str(e))
+                llm_provider = None
+
+            # LLM review runs inside evaluate(); its time goes to its own histogram, not AUDIT_SECONDS
+            review_seconds = 0.0
+
+            def llm_review(fresh):
+                nonlocal review_seconds
+                start = time.perf_counter()
+                try:
+                    outcome = enhance_results_sync(fresh, st.session_state.env, llm_provider, cache=get_llm_cache())
+                finally:
+                    review_seconds = time.perf_counter() - start
+                    LLM_REVIEW_SECONDS.labels(provider=llm_provider.name).observe(review_seconds)
+                logger.info(
+                    "LLM scoring completed",
+                    provider=llm_provider.name,
+                    calls=outcome.calls,
+                    cached_categories=outcome.cached,
+                    seconds=round(outcome.seconds, 2),
+                    failed_categories=list(outcome.errors),
+                )
+                return outcome.categories, outcome.errors
+
+            # Only sections whose answers changed since an earlier run are re-evaluated
+            AUDITS_IN_PROGRESS.inc()
+            start = time.perf_counter()
+            try:
+                evaluated = st.session_state.section_memo.evaluate(
+                    st.session_state.answers,
+                    enhance=llm_review if llm_provider is not None else None,
+                    context=(st.session_state.env.model_dump_json(), llm_provider.name if llm_provider else None),
+                )
+            finally:
+                AUDIT_SECONDS.observe(time.perf_counter() - start - review_seconds)
+                AUDITS_IN_PROGRESS.dec()
+            results = evaluated.categories
 
             # Build report
             report = AuditReport(
@@ -321,14 +362,30 @@ if run:
                 }
             )
 
+            # Link findings to the local threat intel index; built once per process
+            threat_index = get_threat_index()
+            if threat_index is not None:
+                threat_index.enrich(report)
+
             st.session_state.results = report
+            st.session_state.results_key = export_cache.report_key(report)
             st.session_state.audit_count += 1
 
+            # Audit history (AUDIT_HISTORY_PATH); a failed write does not fail the audit
+            history = get_history()
+            if history is not None:
+                try:
+                    history.add(app_id.strip() or "default", report)
+                    history.flush()
+                except Exception as e:
+                    logger.warning("Failed to record audit history", error=str(e))
+
             logger.info(
                 "Audit completed",
                 overall_score=report.overall_score(),
                 overall_risk=report.overall_risk(),
-                categories=len(results)
+                categories=len(results),
+                recomputed=len(evaluated.recomputed)
             )
 
             # Display results
@@ -347,6 +404,7 @@ if run:
 
             # Detailed results table
             st.markdown("### 📈 Detailed Results")
+            import pandas as pd  # loaded on first results render, not at startup
             df = pd.DataFrame([{
                 "Category": r.category,
                 "Score": f"{r.score}/10",
@@ -377,6 +435,20 @@ if run:
                                 f"{severity_emoji.get(finding.severity, '⚪')} "
                                 f"**{finding.severity}:** {finding.text}"
                             )
+                            if threat_index is not None and finding.threats:
+                                refs = ", ".join(
+                                    f"[{t.source_id}]({t.references[0][1]})" if t.references else t.source_id
+                                    for t in threat_index.resolve(finding.threats)
+                                )
+                                st.caption(f"Related threats: {refs}")
+
+                        if threat_index is not None:
+                            linked = threat_index.resolve(dict.fromkeys(
+                                source_id for finding in result.findings for source_id in finding.threats))
+                            if linked:
+                                st.markdown("**Threat Mitigations:**")
+                                for threat in linked:
+                                    st.markdown(f"🛡️ **{threat.source_id} {threat.title}:** {threat.mitigation}")
 
                     if result.recommendations:
                         st.markdown("**Recommendations:**")
@@ -390,10 +462,7 @@ if export_json:
         st.error("⚠️ Run the audit first.")
     else:
         def export_json_report():
-            payload = st.session_state.results.model_dump()
-            payload["summary"]["overall_score"] = st.session_state.results.overall_score()
-            payload["summary"]["overall_risk"] = st.session_state.results.overall_risk()
-            js = json.dumps(payload, indent=2)
+            js = export_cache.export_json(st.session_state.results, key=st.session_state.results_key)
 
             st.download_button(
                 "📥 Download JSON Report",
@@ -412,23 +481,19 @@ if export_pdf:
         st.error("⚠️ Run the audit first.")
     else:
         def export_pdf_report():
-            payload = st.session_state.results
-            payload.summary["overall_score"] = str(payload.overall_score())
-            payload.summary["overall_risk"] = payload.overall_risk()
-
-            path = f"reports/audit_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
-            pdf_path = generate_pdf(payload, path)
-
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    "📥 Download PDF Report",
-                    f,
-                    file_name=os.path.basename(pdf_path),
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+            file_name = f"audit_{datetime.datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.pdf"
+            copy_to = os.path.join(pdf_archive_dir, file_name) if pdf_archive_dir else None
+            pdf_bytes = export_cache.export_pdf(st.session_state.results, key=st.session_state.results_key, copy_to=copy_to)
+
+            st.download_button(
+                "📥 Download PDF Report",
+                pdf_bytes,
+                file_name=file_name,
+                mime="application/pdf",
+                use_container_width=True
+            )
 
-            logger.info("PDF report exported", path=pdf_path)
+            logger.info("PDF report exported", size_bytes=len(pdf_bytes), archived_to=copy_to)
 
         safe_execute(export_pdf_report, "Failed to export PDF")
 
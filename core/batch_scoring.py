@@ -0,0 +1,211 @@
+"""
+Vectorized scoring for fleets of audits
+
+Answers for N applications over the M template questions are encoded once
+into an int8 matrix; re-scoring the whole fleet (e.g. after a weighting
+change) is then a handful of NumPy operations. Results match the scalar
+path (``RuleEngine.evaluate`` / ``AuditReport.overall_score``), including
+Python's rounding of values that sit on a rounding tie.
+"""
+from typing import Dict, List, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .rules import RuleEngine, get_rule_engine
+from .scoring import normalize_answer
+
+# Answer codes used in the answer matrix
+ANSWER_MISSING = -1
+ANSWER_NO = 0
+ANSWER_YES = 1
+ANSWER_UNKNOWN = 2
+
+_ANSWER_CODES = {"No": ANSWER_NO, "Yes": ANSWER_YES, "Unknown": ANSWER_UNKNOWN}
+
+# Indexed by answer code; ANSWER_MISSING (-1) picks the last entry
+_VALUE_LUT = np.array([0.0, 1.0, 0.5, 0.0])
+
+# Risk labels indexed by the number of thresholds a score clears
+_CATEGORY_RISK = np.array(["High", "Medium", "Low"])
+_OVERALL_RISK = np.array(["High", "Moderate", "Low"])
+
+
+class QuestionLayout:
+    """Column layout of the answer matrix: question order, sections and weights"""
+
+    def __init__(self, sections: Dict[str, Tuple[str, ...]], weights: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Args:
+            sections: Section name -> question texts, in column order
+            weights: Section name -> {question text: weight}; missing weights are 1
+        """
+        self.sections: Tuple[str, ...] = tuple(sections)
+        self.columns: List[Tuple[str, str]] = [(s, q) for s in self.sections for q in sections[s]]
+        self.column_index: Dict[Tuple[str, str], int] = {key: i for i, key in enumerate(self.columns)}
+
+        self.section_columns: List[np.ndarray] = [
+            np.array([i for i, (s, _) in enumerate(self.columns) if s == section], dtype=np.intp)
+            for section in self.sections
+        ]
+        section_of = np.array([self.sections.index(s) for s, _ in self.columns], dtype=np.intp)
+        self.membership = np.zeros((len(self.columns), len(self.sections)))
+        self.membership[np.arange(len(self.columns)), section_of] = 1.0
+
+        weights = weights or {}
+        self.weights = np.array([weights.get(s, {}).get(q, 1.0) for s, q in self.columns])
+
+    @classmethod
+    def from_engine(cls, engine: Optional[RuleEngine] = None) -> "QuestionLayout":
+        """Build the layout (and rule weights) from a rule engine"""
+        engine = engine or get_rule_engine()
+        return cls(
+            {s: engine.questions(s) for s in engine.sections},
+            {s: engine.weights(s) for s in engine.sections},
+        )
+
+    def with_questions(self, answer_sets: Iterable[Dict[str, Dict[str, str]]]) -> "QuestionLayout":
+        """
+        Layout extended with the questions answered outside it
+
+        The scalar path scores a question without a rule with weight 1, so
+        each one becomes an extra column of its section with weight 1.
+
+        Args:
+            answer_sets: One {section: {question: answer}} dict per application
+
+        Returns:
+            This layout if nothing is missing, else an extended copy
+
+        Raises:
+            ValueError: If a section is not in the layout
+        """
+        sections: Dict[str, List[str]] = {s: [] for s in self.sections}
+        weights: Dict[str, Dict[str, float]] = {s: {} for s in self.sections}
+        for (section, question), weight in zip(self.columns, self.weights):
+            sections[section].append(question)
+            weights[section][question] = float(weight)
+        known = set(self.column_index)
+        for answers in answer_sets:
+            for section, section_answers in answers.items():
+                if section not in sections:
+                    raise ValueError(f"Unknown audit section: {section}")
+                for question in section_answers:
+                    if (section, question) not in known:
+                        known.add((section, question))
+                        sections[section].append(question)
+        if len(known) == len(self.columns):
+            return self
+        return QuestionLayout({s: tuple(q) for s, q in sections.items()}, weights)
+
+    def encode(self, answer_sets: Iterable[Dict[str, Dict[str, str]]]) -> np.ndarray:
+        """
+        Encode answer sets into an (N, M) int8 matrix
+
+        Unanswered questions are ANSWER_MISSING and excluded from scoring,
+        like in the scalar path.
+
+        Args:
+            answer_sets: One {section: {question: answer}} dict per application
+
+        Returns:
+            int8 answer matrix
+
+        Raises:
+            ValueError: If a question is not in the layout (see ``with_questions``)
+        """
+        rows = []
+        index = self.column_index
+        for answers in answer_sets:
+            row = np.full(len(self.columns), ANSWER_MISSING, dtype=np.int8)
+            for section, section_answers in answers.items():
+                for question, raw in section_answers.items():
+                    col = index.get((section, question))
+                    if col is None:
+                        raise ValueError(f"Question not in the layout: {section}: {question}")
+                    row[col] = _ANSWER_CODES[normalize_answer(raw)]
+            rows.append(row)
+        if not rows:
+            return np.empty((0, len(self.columns)), dtype=np.int8)
+        return np.vstack(rows)
+
+
+def _round2(values: np.ndarray, exact) -> np.ndarray:
+    """
+    Round to 2 decimals like Python's ``round``
+
+    ``np.round`` scales by 100 first, so it can land on the other side of a
+    tie than ``round`` does; values that close to a tie are recomputed in
+    the scalar path's summation order by ``exact(index)`` and rounded in Python.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_tie)):
+        rounded[index] = round(float(exact(index)), 2)
+    return rounded
+
+
+class BatchScores(NamedTuple):
+    """Scores for N applications over C categories"""
+    sections: Tuple[str, ...]
+    category_scores: np.ndarray  # (N, C) float64
+    category_risk: np.ndarray  # (N, C) str: Low/Medium/High
+    overall_score: np.ndarray  # (N,) float64
+    overall_risk: np.ndarray  # (N,) str: Low/Moderate/High
+
+
+def score_matrix(answers: np.ndarray, layout: QuestionLayout, weights: Optional[np.ndarray] = None) -> BatchScores:
+    """
+    Score an encoded answer matrix
+
+    Args:
+        answers: (N, M) int8 matrix from ``QuestionLayout.encode``
+        layout: Column layout the matrix was encoded with
+        weights: Optional (M,) weight vector overriding the layout's weights
+
+    Returns:
+        Per-category and overall scores and risk levels
+    """
+    w = layout.weights if weights is None else np.asarray(weights, dtype=np.float64)
+    if answers.ndim != 2 or answers.shape[1] != len(layout.columns):
+        raise ValueError(f"Expected an (N, {len(layout.columns)}) answer matrix, got {answers.shape}")
+
+    # Weighted one-hot membership: column m contributes w[m] to its category
+    weighted_membership = w[:, None] * layout.membership
+    codes = answers.astype(np.intp, copy=False)
+    numerator = _VALUE_LUT[codes] @ weighted_membership
+    denominator = (answers >= 0).astype(np.float64) @ weighted_membership
+
+    def exact_score(index: Tuple[int, int]) -> float:
+        # Accumulated question by question like RuleEngine.evaluate
+        row, section = index
+        total = 0.0
+        weight_sum = 0.0
+        for col in layout.section_columns[section]:
+            code = answers[row, col]
+            if code >= 0:
+                total += _VALUE_LUT[code] * w[col]
+                weight_sum += w[col]
+        return (total / weight_sum) * 10.0 if weight_sum else 5.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = np.where(denominator > 0, (numerator / denominator) * 10.0, 5.0)
+    scores = _round2(scores, exact_score)
+    category_risk = _CATEGORY_RISK[(scores >= 6.5).astype(np.intp) + (scores >= 8.5)]
+
+    if scores.shape[1]:
+        overall = _round2(scores.sum(axis=1) / scores.shape[1],
+                          lambda index: sum(scores[index[0]].tolist()) / scores.shape[1])
+    else:
+        overall = np.zeros(scores.shape[0])
+    overall_risk = _OVERALL_RISK[(overall >= 6.5).astype(np.intp) + (overall >= 8.5)]
+
+    return BatchScores(layout.sections, scores, category_risk, overall, overall_risk)
+
+
+def score_answer_sets(answer_sets: Iterable[Dict[str, Dict[str, str]]],
+                      layout: Optional[QuestionLayout] = None) -> BatchScores:
+    """Encode and score answer sets in one call; questions outside the layout are scored with weight 1"""
+    answer_sets = list(answer_sets)
+    layout = (layout or QuestionLayout.from_engine()).with_questions(answer_sets)
+    return score_matrix(layout.encode(answer_sets), layout)
@@ -0,0 +1,200 @@
+"""
+Headless bulk audit runner for AI Shield Auditor
+
+Reads answer sets from JSONL (one application per line), evaluates every
+audit category in a process pool, links the findings to threat intel
+(``core.threat_index``) and streams the reports back out as JSONL.
+
+Input line format::
+
+    {"app_id": "billing-bot",
+     "user_environment": {"platform": "OpenAI", "agent_mode": false, "connectors": []},
+     "answers": {"Identity & Access": {"<question text>": "Yes", ...}, ...}}
+
+Usage:
+    python -m core.bulk_audit answers.jsonl -o reports.jsonl --workers 8
+"""
+import argparse
+import datetime
+import json
+import sys
+import time
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+from .compact import CompactCategory, CompactReport
+from .registry import DEFAULT_QUESTIONS_PATH, get_registry
+from .schema import AuditReport, UserEnvironment
+from .threat_index import ThreatIndex, get_threat_index
+from .utils import bounded_process_map, numbered_chunks
+
+DEFAULT_CHUNK_SIZE = 64
+
+# Per-process audit instances and threat index, populated by _init_worker
+_AUDITS: Optional[Dict[str, Any]] = None
+_THREATS: Optional[ThreatIndex] = None
+
+
+def load_audits(questions_path: str = DEFAULT_QUESTIONS_PATH) -> Dict[str, Any]:
+    """
+    Resolve and instantiate the audit class for every template section
+
+    Args:
+        questions_path: Path to the questions template
+
+    Returns:
+        Ordered mapping of section name -> audit instance
+    """
+    return get_registry(questions_path).audits()
+
+
+def build_report(user_environment: UserEnvironment, answers: Dict[str, Dict[str, str]],
+                 audits: Dict[str, Any]) -> AuditReport:
+    """
+    Evaluate all categories for one application
+
+    Args:
+        user_environment: Locked environment for the application
+        answers: Section name -> {question: answer}
+        audits: Output of ``load_audits``
+
+    Returns:
+        Completed audit report
+    """
+    results = [audit.evaluate(answers.get(section, {})) for section, audit in audits.items()]
+    return AuditReport(
+        user_environment=user_environment,
+        audit_categories=results,
+        summary={
+            "overall_score": "auto",
+            "overall_risk": "auto",
+            "report_generated": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+    )
+
+
+def build_compact_report(user_environment: UserEnvironment, answers: Dict[str, Dict[str, str]],
+                         audits: Dict[str, Any]) -> CompactReport:
+    """Same as ``build_report`` without constructing the pydantic result models"""
+    results = []
+    for section, audit in audits.items():
+        section_answers = answers.get(section, {})
+        evaluate_compact = getattr(audit, "evaluate_compact", None)
+        if evaluate_compact is not None:
+            results.append(evaluate_compact(section_answers))
+        else:
+            results.append(CompactCategory.from_model(audit.evaluate(section_answers)))
+    return CompactReport(user_environment, results, {
+        "overall_score": "auto",
+        "overall_risk": "auto",
+        "report_generated": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    })
+
+
+def report_payload(report: AuditReport) -> Dict[str, Any]:
+    """Serialize a report the same way the JSON export does"""
+    return report.export_payload()
+
+
+def audit_record(record: Dict[str, Any], audits: Dict[str, Any]) -> AuditReport:
+    """Build a report from one parsed input record"""
+    env = UserEnvironment(**record["user_environment"])
+    return build_report(env, record.get("answers") or {}, audits)
+
+
+def _init_worker(questions_path: str) -> None:
+    global _AUDITS, _THREATS
+    _AUDITS = load_audits(questions_path)
+    _THREATS = get_threat_index()
+
+
+def _evaluate_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[bool, str]]:
+    """Evaluate a chunk of numbered JSONL lines and return (ok, output line) pairs"""
+    out = []
+    for line_no, line in chunk:
+        app_id = None
+        try:
+            record = json.loads(line)
+            app_id = record.get("app_id")
+            env = UserEnvironment(**record["user_environment"])
+            report = build_compact_report(env, record.get("answers") or {}, _AUDITS)
+            if _THREATS is not None:
+                _THREATS.enrich(report)
+            out.append((True, json.dumps({"app_id": app_id, "report": report.export_payload()})))
+        except Exception as e:
+            out.append((False, json.dumps({"app_id": app_id, "line": line_no, "error": f"{type(e).__name__}: {e}"})))
+    return out
+
+
+def _run(lines: Iterable[str], workers: Optional[int], chunk_size: int,
+         questions_path: str) -> Iterator[Tuple[bool, str]]:
+    for out in bounded_process_map(_evaluate_chunk, numbered_chunks(lines, chunk_size), workers,
+                                   _init_worker, (questions_path,)):
+        yield from out
+
+
+def run_bulk_audit(lines: Iterable[str], workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   questions_path: str = DEFAULT_QUESTIONS_PATH) -> Iterator[str]:
+    """
+    Audit a stream of JSONL answer sets
+
+    Output order matches input order. At most ``2 * workers`` chunks are in
+    flight at once, so memory stays flat regardless of input size.
+
+    Args:
+        lines: Iterable of JSONL input lines
+        workers: Worker processes (default: CPU count); 0 evaluates in-process
+        chunk_size: Lines submitted to a worker per task
+        questions_path: Path to the questions template
+
+    Returns:
+        Iterator of JSONL output lines (without trailing newlines); records
+        that fail to evaluate produce ``{"app_id", "line", "error"}`` objects
+    """
+    for _, line in _run(lines, workers, chunk_size, questions_path):
+        yield line
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run AI Shield audits over a JSONL file of answer sets")
+    parser.add_argument("input", help="JSONL answer sets ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL reports destination ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Records per worker task")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS_PATH, help="Questions template path")
+    parser.add_argument("--history", default=None, help="Also record the reports in this audit history database")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    history = None
+    if args.history:
+        from .history import AuditHistory
+        from .serialization import payload_to_report
+        history = AuditHistory(args.history)
+    start = time.perf_counter()
+    count = errors = 0
+    try:
+        for ok, line in _run(src, args.workers, args.chunk_size, args.questions):
+            dst.write(line + "\n")
+            count += 1
+            errors += not ok
+            if ok and history is not None:
+                record = json.loads(line)
+                history.add(str(record.get("app_id") or "unnamed"), payload_to_report(record["report"]))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+        if history is not None:
+            history.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Audited {count} applications ({errors} errors) in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
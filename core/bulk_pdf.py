@@ -0,0 +1,202 @@
+"""
+Bulk PDF export for AI Shield Auditor
+
+Renders one PDF per audit report across a pool of worker processes that
+load ReportLab, the standard fonts and the wrapper's glyph caches once at
+start-up, and streams the PDFs into a ZIP archive in input order.
+
+Input is JSONL, one report per line: either a bare ``AuditReport`` JSON
+object or the output of ``core.bulk_audit`` (``{"app_id", "report"}``), so
+the two commands chain:
+
+    python -m core.bulk_audit answers.jsonl | python -m core.bulk_pdf - -o reports.zip
+"""
+import argparse
+import io
+import json
+import re
+import sys
+import time
+import zipfile
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .report import BODY_FONT, BODY_SIZE, wrap_text, write_pdf
+from .schema import AuditReport, CategoryResult, Finding, Recommendation, UserEnvironment
+from .utils import bounded_process_map, numbered_chunks
+
+DEFAULT_CHUNK_SIZE = 8
+
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Errors are collected in this archive member
+ERRORS_MEMBER = "errors.jsonl"
+
+
+class RenderedReport(NamedTuple):
+    """Outcome of rendering one input line"""
+    line: int
+    app_id: Optional[str]
+    pdf: Optional[bytes]
+    pages: int
+    error: Optional[str]
+
+
+class ExportStats(NamedTuple):
+    """Totals for one bulk export"""
+    reports: int
+    pages: int
+    errors: int
+    seconds: float
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+
+def parse_report(record: Dict[str, Any]) -> Tuple[Optional[str], AuditReport]:
+    """
+    Build a report from a parsed input record
+
+    Args:
+        record: Bare AuditReport payload or a ``core.bulk_audit`` output line
+
+    Returns:
+        (app_id or None, report)
+
+    Raises:
+        ValueError: If the record is a bulk audit error line
+    """
+    app_id = record.get("app_id")
+    if "error" in record and "report" not in record:
+        raise ValueError(f"Upstream audit failed: {record['error']}")
+    payload = dict(record.get("report", record))
+    # JSON exports carry the numeric overall score; the model stores strings
+    payload["summary"] = {k: str(v) for k, v in (payload.get("summary") or {}).items()}
+    return app_id, AuditReport.model_validate(payload)
+
+
+def _init_worker() -> None:
+    """Load fonts and fill the glyph-width cache so the first real render is not slower"""
+    sample = AuditReport(
+        user_environment=UserEnvironment(platform="warm-up", agent_mode=False, connectors=[]),
+        audit_categories=[CategoryResult(
+            category="Warm-up", score=5.0, risk_level="Medium", questions=[], answers={},
+            findings=[Finding(text="warm-up")], recommendations=[Recommendation(text="warm-up")],
+        )],
+        summary={},
+    )
+    write_pdf(sample, io.BytesIO())
+    wrap_text("".join(chr(c) for c in range(32, 256)), 500, BODY_FONT, BODY_SIZE)
+
+
+def _render_chunk(chunk: List[Tuple[int, str]]) -> List[RenderedReport]:
+    """Render a chunk of numbered JSONL lines"""
+    out = []
+    for line_no, line in chunk:
+        app_id = None
+        try:
+            app_id, report = parse_report(json.loads(line))
+            buffer = io.BytesIO()
+            pages = write_pdf(report, buffer)
+            out.append(RenderedReport(line_no, app_id, buffer.getvalue(), pages, None))
+        except Exception as e:
+            out.append(RenderedReport(line_no, app_id, None, 0, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def render_reports(lines: Iterable[str], workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[RenderedReport]:
+    """
+    Render a stream of JSONL reports to PDF
+
+    Output order matches input order. At most ``2 * workers`` chunks are in
+    flight at once, so memory stays flat regardless of input size.
+
+    Args:
+        lines: Iterable of JSONL input lines
+        workers: Worker processes (default: CPU count); 0 renders in-process
+        chunk_size: Reports submitted to a worker per task
+
+    Returns:
+        Iterator of RenderedReport
+    """
+    for out in bounded_process_map(_render_chunk, numbered_chunks(lines, chunk_size), workers, _init_worker):
+        yield from out
+
+
+def _member_name(name: str, used: Set[str]) -> str:
+    base = _UNSAFE_NAME_CHARS.sub("_", name).strip("._") or "report"
+    member = f"{base}.pdf"
+    n = 1
+    while member in used:
+        n += 1
+        member = f"{base}-{n}.pdf"
+    used.add(member)
+    return member
+
+
+def export_pdfs(lines: Iterable[str], archive: Union[str, BinaryIO], workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, compression: int = zipfile.ZIP_STORED) -> ExportStats:
+    """
+    Render reports and stream them into a ZIP archive
+
+    Members are named after ``app_id`` (``report-<line>`` when missing).
+    ReportLab already compresses page content, so they are stored by
+    default. Reports that fail to render are listed in ``errors.jsonl``
+    inside the archive.
+
+    Args:
+        lines: Iterable of JSONL input lines
+        archive: Path or writable binary stream (need not be seekable)
+        workers: Worker processes (default: CPU count); 0 renders in-process
+        chunk_size: Reports submitted to a worker per task
+        compression: zipfile compression method for the PDFs
+
+    Returns:
+        Export statistics
+    """
+    start = time.perf_counter()
+    reports = pages = 0
+    errors: List[Dict[str, Any]] = []
+    used: Set[str] = set()
+    with zipfile.ZipFile(archive, "w", compression=compression) as zf:
+        for rendered in render_reports(lines, workers, chunk_size):
+            if rendered.error is not None:
+                errors.append({"app_id": rendered.app_id, "line": rendered.line, "error": rendered.error})
+                continue
+            name = _member_name(rendered.app_id or f"report-{rendered.line}", used)
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = compression
+            zf.writestr(info, rendered.pdf)
+            reports += 1
+            pages += rendered.pages
+        if errors:
+            zf.writestr(ERRORS_MEMBER, "".join(json.dumps(e) + "\n" for e in errors))
+    return ExportStats(reports, pages, len(errors), time.perf_counter() - start)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render AI Shield audit reports to PDFs in a ZIP archive")
+    parser.add_argument("input", help="JSONL audit reports ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, help="ZIP archive destination ('-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Reports per worker task")
+    parser.add_argument("--deflate", action="store_true", help="Deflate PDFs in the archive")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    dst = sys.stdout.buffer if args.output == "-" else args.output
+    compression = zipfile.ZIP_DEFLATED if args.deflate else zipfile.ZIP_STORED
+    try:
+        stats = export_pdfs(src, dst, args.workers, args.chunk_size, compression)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    print(f"Rendered {stats.reports} reports / {stats.pages} pages ({stats.errors} errors) in "
+          f"{stats.seconds:.2f}s ({stats.pages_per_second:,.0f} pages/s)", file=sys.stderr)
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Columnar analytics export for AI Shield Auditor
+
+Flattens audit reports into three typed tables for BI tools:
+
+- ``categories``: one row per category result
+- ``findings``: one row per finding
+- ``answers``: one row per answered question
+
+Rows carry a report id, so the tables join. Category, risk level,
+severity, question text and the other columns with few distinct values
+are dictionary-encoded. ``ParquetExporter`` buffers rows as reports
+stream in and writes one Parquet row group per ``row_group_size`` rows,
+so memory stays flat for any portfolio size.
+
+pyarrow is optional and only needed for the Arrow/Parquet output;
+``flatten`` works without it.
+
+Usage:
+    python -m core.columnar reports.jsonl -o analytics/
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .compact import CompactReport
+from .schema import AuditReport
+
+Report = Union[AuditReport, CompactReport]
+
+TABLES = ("categories", "findings", "answers")
+
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# column -> type name; "dict" columns are dictionary-encoded strings, "string_list" holds threat ids
+COLUMNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "categories": (
+        ("report_id", "int64"), ("app_id", "dict"), ("generated_at", "timestamp"), ("platform", "dict"),
+        ("category", "dict"), ("score", "float64"), ("risk_level", "dict"), ("overall_score", "float64"),
+        ("overall_risk", "dict"), ("findings", "int32"), ("recommendations", "int32"),
+    ),
+    "findings": (
+        ("report_id", "int64"), ("app_id", "dict"), ("category", "dict"), ("severity", "dict"),
+        ("text", "dict"), ("evidence", "string"), ("threats", "string_list"),
+    ),
+    "answers": (
+        ("report_id", "int64"), ("app_id", "dict"), ("category", "dict"), ("question", "dict"), ("answer", "dict"),
+    ),
+}
+
+
+def _compact(report: Report) -> CompactReport:
+    return report if isinstance(report, CompactReport) else CompactReport.from_model(report)
+
+
+def _generated_at(summary: Dict[str, str]) -> Optional[datetime.datetime]:
+    value = summary.get("report_generated")
+    if not value:
+        return None
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return None
+
+
+class ColumnBuffer:
+    """Column lists for the three tables, filled one report at a time"""
+
+    def __init__(self):
+        self.columns: Dict[str, Dict[str, List[Any]]] = {
+            table: {name: [] for name, _ in columns} for table, columns in COLUMNS.items()
+        }
+
+    def rows(self, table: str) -> int:
+        return len(self.columns[table]["report_id"])
+
+    def add(self, report_id: int, app_id: Optional[str], report: Report) -> None:
+        """Append the rows of one report"""
+        report = _compact(report)
+        generated = _generated_at(report.summary)
+        platform = report.user_environment.platform
+        overall_score, overall_risk = report.overall_score(), report.overall_risk()
+
+        cats, finds, answers = (self.columns[t] for t in TABLES)
+        for c in report.categories:
+            n_findings = len(c.finding_texts)
+            for name, value in (("report_id", report_id), ("app_id", app_id), ("generated_at", generated),
+                                ("platform", platform), ("category", c.category), ("score", c.score),
+                                ("risk_level", c.risk_level), ("overall_score", overall_score),
+                                ("overall_risk", overall_risk), ("findings", n_findings),
+                                ("recommendations", len(c.rec_texts))):
+                cats[name].append(value)
+
+            finds["report_id"].extend([report_id] * n_findings)
+            finds["app_id"].extend([app_id] * n_findings)
+            finds["category"].extend([c.category] * n_findings)
+            for text, severity, evidence in c.findings():
+                finds["severity"].append(severity)
+                finds["text"].append(text)
+                finds["evidence"].append(evidence)
+            finds["threats"].extend(c.threats())
+
+            n_answers = len(c.answers)
+            answers["report_id"].extend([report_id] * n_answers)
+            answers["app_id"].extend([app_id] * n_answers)
+            answers["category"].extend([c.category] * n_answers)
+            answers["question"].extend(c.answers.keys())
+            answers["answer"].extend(c.answers.values())
+
+    def take(self, table: str) -> Dict[str, List[Any]]:
+        """Remove and return one table's columns"""
+        columns = self.columns[table]
+        self.columns[table] = {name: [] for name in columns}
+        return columns
+
+
+def flatten(reports: Iterable[Tuple[Optional[str], Report]]) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Flatten (app_id, report) pairs into column lists
+
+    Returns:
+        Table name -> column name -> values; report ids count from 0
+    """
+    buffer = ColumnBuffer()
+    for report_id, (app_id, report) in enumerate(reports):
+        buffer.add(report_id, app_id, report)
+    return buffer.columns
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ValueError("pyarrow is required for Arrow/Parquet export (pip install pyarrow)") from e
+    return pyarrow
+
+
+def arrow_schema(table: str):
+    """pyarrow schema of one table"""
+    pa = _pyarrow()
+    types = {
+        "int64": pa.int64(),
+        "int32": pa.int32(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "string_list": pa.list_(pa.string()),
+        "dict": pa.dictionary(pa.int32(), pa.string()),
+        "timestamp": pa.timestamp("s", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNS[table]])
+
+
+def to_arrow(table: str, columns: Dict[str, List[Any]]):
+    """Build a pyarrow Table from one table's column lists"""
+    pa = _pyarrow()
+    schema = arrow_schema(table)
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def export_arrow(reports: Iterable[Tuple[Optional[str], Report]]) -> Dict[str, Any]:
+    """
+    Flatten (app_id, report) pairs into in-memory pyarrow Tables
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    return {table: to_arrow(table, columns) for table, columns in flatten(reports).items()}
+
+
+class ParquetExporter:
+    """Streams reports into one Parquet file per table, a row group at a time"""
+
+    def __init__(self, directory: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 compression: str = "zstd"):
+        """
+        Args:
+            directory: Output directory; receives categories.parquet,
+                findings.parquet and answers.parquet
+            row_group_size: Rows buffered per table before a row group is written
+            compression: Parquet compression codec
+
+        Raises:
+            ValueError: If pyarrow is missing or row_group_size is not positive
+        """
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be positive")
+        pq = _pyarrow().parquet
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.reports = 0
+        self.rows = dict.fromkeys(TABLES, 0)
+        self._buffer = ColumnBuffer()
+        self._writers = {
+            table: pq.ParquetWriter(os.path.join(directory, f"{table}.parquet"), arrow_schema(table),
+                                    compression=compression)
+            for table in TABLES
+        }
+
+    def add(self, report: Report, app_id: Optional[str] = None) -> int:
+        """
+        Append one report; full row groups are written out
+
+        Returns:
+            The report id assigned to it
+        """
+        report_id = self.reports
+        self._buffer.add(report_id, app_id, report)
+        self.reports += 1
+        for table in TABLES:
+            if self._buffer.rows(table) >= self.row_group_size:
+                self._write(table)
+        return report_id
+
+    def _write(self, table: str) -> None:
+        columns = self._buffer.take(table)
+        if columns["report_id"]:
+            self._writers[table].write_table(to_arrow(table, columns), row_group_size=self.row_group_size)
+            self.rows[table] += len(columns["report_id"])
+
+    def close(self) -> None:
+        """Write the remaining rows and finish the files"""
+        for table in TABLES:
+            self._write(table)
+            self._writers[table].close()
+
+    def __enter__(self) -> "ParquetExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _read_reports(path: str) -> Iterable[Tuple[Optional[str], Report]]:
+    """(app_id, report) pairs from a JSONL file (bulk audit output or bare reports) or a binary archive"""
+    from .serialization import is_binary, payload_to_report, read_binary
+
+    if is_binary(path):
+        with open(path, "rb") as f:
+            for report in read_binary(f, compact=True):
+                yield None, report
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "error" in record and "report" not in record:
+                continue  # failed bulk audit line
+            yield record.get("app_id"), payload_to_report(record.get("report", record))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export audit reports as Parquet tables for analytics")
+    parser.add_argument("input", help="JSONL reports (core.bulk_audit output) or a binary report archive")
+    parser.add_argument("-o", "--output", required=True, help="Output directory")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE, help="Rows per row group")
+    args = parser.parse_args(argv)
+
+    try:
+        _pyarrow()
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    with ParquetExporter(args.output, row_group_size=args.row_group_size) as exporter:
+        for app_id, report in _read_reports(args.input):
+            exporter.add(report, app_id)
+    elapsed = time.perf_counter() - start
+    rows = ", ".join(f"{exporter.rows[t]:,} {t}" for t in TABLES)
+    print(f"Exported {exporter.reports:,} reports ({rows}) to {args.output} in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Compact report representation for bulk paths
+
+``CompactCategory`` and ``CompactReport`` hold the same data as the
+pydantic ``CategoryResult`` / ``AuditReport`` models, but without
+validation. Findings and recommendations are stored column-wise: a list of
+texts plus an array of level codes, instead of one model object each.
+Finding evidence and linked threat ids are optional columns, ``None`` when
+no finding in the category carries any.
+Derived aggregates (overall score and risk) are computed once.
+
+They convert losslessly to and from the pydantic models. ``to_model``
+uses ``model_construct``, so nothing is re-validated at the boundary.
+"""
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .schema import AuditReport, CategoryResult, Finding, Recommendation, UserEnvironment, overall_risk_for
+
+# Level strings interned as small codes; unseen values are appended, so any string round-trips
+_LEVELS: List[str] = ["Low", "Medium", "High"]
+_LEVEL_CODES: Dict[str, int] = {level: i for i, level in enumerate(_LEVELS)}
+_levels_lock = threading.Lock()
+
+
+def _code(level: str) -> int:
+    code = _LEVEL_CODES.get(level)
+    if code is None:
+        with _levels_lock:
+            code = _LEVEL_CODES.get(level)
+            if code is None:
+                _LEVELS.append(level)
+                code = _LEVEL_CODES[level] = len(_LEVELS) - 1
+    return code
+
+
+class CompactCategory:
+    """One category result, findings and recommendations stored as columns"""
+    __slots__ = ("category", "score", "risk_level", "answers",
+                 "finding_texts", "finding_levels", "finding_evidence", "finding_threats",
+                 "rec_texts", "rec_levels", "_questions")
+
+    def __init__(self, category: str, score: float, risk_level: str, answers: Dict[str, str],
+                 finding_texts: List[str], finding_levels: array, finding_evidence: Optional[List[Optional[str]]],
+                 rec_texts: List[str], rec_levels: array,
+                 finding_threats: Optional[List[List[str]]] = None):
+        self.category = category
+        self.score = score
+        self.risk_level = risk_level
+        self.answers = answers
+        self.finding_texts = finding_texts
+        self.finding_levels = finding_levels
+        # None when no finding carries evidence (the common case)
+        self.finding_evidence = finding_evidence
+        # Threat-intel source ids per finding, None when no finding is linked to any
+        self.finding_threats = finding_threats
+        self.rec_texts = rec_texts
+        self.rec_levels = rec_levels
+        # Only kept when the question list differs from the answer keys
+        self._questions: Optional[List[str]] = None
+
+    @classmethod
+    def build(cls, category: str, score: float, risk_level: str, answers: Dict[str, str],
+              findings: Iterable[Tuple[str, str, Optional[str]]],
+              recommendations: Iterable[Tuple[str, str]],
+              finding_threats: Optional[Iterable[Sequence[str]]] = None) -> "CompactCategory":
+        """
+        Build from (text, severity, evidence) and (text, effort) tuples
+
+        ``answers`` is copied, so later changes to the caller's dict do not
+        leak into the result. ``finding_threats`` holds one sequence of
+        threat ids per finding, in the same order.
+        """
+        f_texts, f_levels, evidence = [], array("H"), []
+        for text, severity, ev in findings:
+            f_texts.append(text)
+            f_levels.append(_code(severity))
+            evidence.append(ev)
+        r_texts, r_levels = [], array("H")
+        for text, effort in recommendations:
+            r_texts.append(text)
+            r_levels.append(_code(effort))
+        threats = None
+        if finding_threats is not None:
+            threats = [list(ids) for ids in finding_threats]
+            if len(threats) != len(f_texts):
+                raise ValueError(f"Got threat ids for {len(threats)} findings, expected {len(f_texts)}")
+            if not any(threats):
+                threats = None
+        return cls(category, score, risk_level, dict(answers), f_texts, f_levels,
+                   evidence if any(e is not None for e in evidence) else None, r_texts, r_levels, threats)
+
+    @classmethod
+    def from_model(cls, result: CategoryResult) -> "CompactCategory":
+        compact = cls.build(
+            result.category, result.score, result.risk_level, result.answers,
+            ((f.text, f.severity, f.evidence) for f in result.findings),
+            ((r.text, r.effort) for r in result.recommendations),
+            [f.threats for f in result.findings],
+        )
+        if list(result.questions) != list(result.answers):
+            compact._questions = list(result.questions)
+        return compact
+
+    @property
+    def questions(self) -> List[str]:
+        return list(self._questions if self._questions is not None else self.answers)
+
+    def findings(self) -> Iterable[Tuple[str, str, Optional[str]]]:
+        evidence = self.finding_evidence or (None,) * len(self.finding_texts)
+        return zip(self.finding_texts, (_LEVELS[c] for c in self.finding_levels), evidence)
+
+    def threats(self) -> Iterable[List[str]]:
+        """Threat ids per finding, in finding order"""
+        if self.finding_threats is None:
+            return ([] for _ in self.finding_texts)
+        return (list(ids) for ids in self.finding_threats)
+
+    def recommendations(self) -> Iterable[Tuple[str, str]]:
+        return zip(self.rec_texts, (_LEVELS[c] for c in self.rec_levels))
+
+    def to_model(self) -> CategoryResult:
+        """Equivalent CategoryResult, constructed without validation"""
+        return CategoryResult.model_construct(
+            category=self.category,
+            score=self.score,
+            risk_level=self.risk_level,
+            questions=self.questions,
+            answers=dict(self.answers),
+            findings=[Finding.model_construct(text=t, severity=s, evidence=e, threats=ids)
+                      for (t, s, e), ids in zip(self.findings(), self.threats())],
+            recommendations=[Recommendation.model_construct(text=t, effort=e) for t, e in self.recommendations()],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same structure and key order as ``CategoryResult.model_dump()``"""
+        return {
+            "category": self.category,
+            "score": self.score,
+            "risk_level": self.risk_level,
+            "questions": self.questions,
+            "answers": dict(self.answers),
+            "findings": [{"text": t, "severity": s, "evidence": e, "threats": ids}
+                         for (t, s, e), ids in zip(self.findings(), self.threats())],
+            "recommendations": [{"text": t, "effort": e} for t, e in self.recommendations()],
+        }
+
+
+class CompactReport:
+    """Audit report over CompactCategory results, with cached aggregates"""
+    __slots__ = ("user_environment", "categories", "summary", "_score")
+
+    def __init__(self, user_environment: UserEnvironment, categories: Sequence[CompactCategory],
+                 summary: Dict[str, str]):
+        self.user_environment = user_environment
+        self.categories = list(categories)
+        self.summary = dict(summary)
+        self._score: Optional[float] = None
+
+    @classmethod
+    def from_model(cls, report: AuditReport) -> "CompactReport":
+        return cls(report.user_environment, [CompactCategory.from_model(c) for c in report.audit_categories],
+                   report.summary)
+
+    def overall_score(self) -> float:
+        if self._score is None:
+            cats = self.categories
+            self._score = round(sum(c.score for c in cats) / len(cats), 2) if cats else 0.0
+        return self._score
+
+    def overall_risk(self) -> str:
+        return overall_risk_for(self.overall_score())
+
+    def meta(self) -> Dict[str, str]:
+        return {
+            "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "overall_score": str(self.overall_score()),
+            "overall_risk": self.overall_risk(),
+        }
+
+    def finding_count(self) -> int:
+        return sum(len(c.finding_texts) for c in self.categories)
+
+    def to_model(self) -> AuditReport:
+        """Equivalent AuditReport, constructed without validation"""
+        return AuditReport.model_construct(
+            user_environment=self.user_environment,
+            audit_categories=[c.to_model() for c in self.categories],
+            summary=dict(self.summary),
+        )
+
+    def export_payload(self) -> Dict[str, Any]:
+        """Same as ``AuditReport.export_payload()`` without building the models"""
+        summary = dict(self.summary)
+        summary["overall_score"] = self.overall_score()
+        summary["overall_risk"] = self.overall_risk()
+        return {
+            "user_environment": self.user_environment.model_dump(),
+            "audit_categories": [c.to_dict() for c in self.categories],
+            "summary": summary,
+        }
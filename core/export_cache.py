@@ -0,0 +1,256 @@
+"""
+Content-addressed cache for rendered report exports (JSON / PDF)
+
+Exports are keyed by a hash of the report contents, so re-downloads and
+Streamlit reruns of an unchanged report reuse the rendered bytes. Entries
+live in a byte-bounded LRU; evicted entries can spill to a directory and
+are promoted back to memory on the next hit. Disk writes happen outside
+the cache lock, so a slow spill directory does not stall hits. Concurrent
+requests for the same missing export render it once.
+"""
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .metrics import EXPORT_SECONDS
+from .schema import AuditReport
+from .security import SecurityValidator
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def report_key(report: AuditReport) -> str:
+    """Stable content hash of a report (canonical JSON, SHA-256)"""
+    canonical = json.dumps(report.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return SecurityValidator.hash_sensitive_data(canonical)
+
+
+class ExportCache:
+    """Thread-safe, byte-bounded LRU of rendered exports with optional disk spill"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: Optional[str] = None,
+                 max_spill_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Most bytes held in memory
+            spill_dir: Directory evicted entries are written to (None disables spill)
+            max_spill_bytes: Most bytes kept in spill_dir; oldest files are
+                removed beyond it (None = unbounded)
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+        self._spilling: Dict[str, bytes] = {}  # evicted, spill file not written yet
+        self.hits = self.misses = self.spill_hits = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, key.replace(":", "-") + ".bin")
+
+    def _spill(self, key: str, data: bytes) -> None:
+        path = self._spill_path(key)
+        if os.path.exists(path):
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.spill_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _prune_spill(self) -> None:
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if entry.name.endswith(".bin"):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_spill_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _store(self, key: str, data: bytes) -> List[Tuple[str, bytes]]:
+        """
+        Insert into memory and evict down to max_bytes; caller holds _lock
+
+        Returns:
+            Evicted entries; the caller passes them to ``_spill_evicted``
+            once it has released the lock
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        if len(data) > self.max_bytes:
+            evicted = [(key, data)]
+        else:
+            self._entries[key] = data
+            self._size += len(data)
+            evicted = []
+            while self._size > self.max_bytes:
+                old_key, old_data = self._entries.popitem(last=False)
+                self._size -= len(old_data)
+                evicted.append((old_key, old_data))
+        if self.spill_dir:
+            # Still served from here until their files are written
+            self._spilling.update(evicted)
+        return evicted
+
+    def _spill_evicted(self, evicted: List[Tuple[str, bytes]]) -> None:
+        """Write evicted entries to spill_dir; called without _lock held"""
+        if not self.spill_dir or not evicted:
+            return
+        try:
+            for key, data in evicted:
+                self._spill(key, data)
+            if self.max_spill_bytes is not None:
+                self._prune_spill()
+        finally:
+            with self._lock:
+                for key, data in evicted:
+                    if self._spilling.get(key) is data:
+                        del self._spilling[key]
+
+    def _find(self, key: str) -> Optional[bytes]:
+        """Bytes for key from memory or spill, promoting spilled entries; counts hits only"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self._spilling.get(key)
+        if data is None and self.spill_dir:
+            try:
+                with open(self._spill_path(key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                pass
+        if data is None:
+            return None
+        with self._lock:
+            self.spill_hits += 1
+            evicted = self._store(key, data)
+        self._spill_evicted(evicted)
+        return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None"""
+        data = self._find(key)
+        if data is None:
+            with self._lock:
+                self.misses += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Cache bytes under key"""
+        with self._lock:
+            evicted = self._store(key, data)
+        self._spill_evicted(evicted)
+
+    def get_or_create(self, key: str, factory: Callable[[], bytes]) -> bytes:
+        """
+        Return cached bytes for key, rendering them with factory on a miss
+
+        Concurrent callers missing the same key wait for a single render.
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                # Rendered by the caller we waited for, possibly spilled since
+                data = self._find(key)
+                if data is None:
+                    data = factory()
+                    self.put(key, data)
+                return data
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "spill_hits": self.spill_hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@lru_cache(maxsize=1)
+def get_export_cache() -> ExportCache:
+    """
+    Process-wide export cache
+
+    Configured from EXPORT_CACHE_MB (memory bound, default 64) and
+    EXPORT_CACHE_DIR (spill directory, disabled when unset).
+    """
+    max_mb = float(os.getenv("EXPORT_CACHE_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+    return ExportCache(int(max_mb * 1024 * 1024), spill_dir=os.getenv("EXPORT_CACHE_DIR") or None)
+
+
+def export_json(report: AuditReport, cache: Optional[ExportCache] = None, key: Optional[str] = None) -> bytes:
+    """
+    JSON export of a report, rendered once per distinct report
+
+    Args:
+        report: Report to export (not modified)
+        cache: Cache to use (default: the process-wide cache)
+        key: Precomputed ``report_key(report)``
+
+    Returns:
+        UTF-8 encoded, indented JSON
+    """
+    with EXPORT_SECONDS.labels(format="json").time():
+        cache = cache if cache is not None else get_export_cache()
+        key = f"json:{key or report_key(report)}"
+        return cache.get_or_create(key, lambda: json.dumps(report.export_payload(), indent=2).encode("utf-8"))
+
+
+def export_pdf(report: AuditReport, cache: Optional[ExportCache] = None, key: Optional[str] = None,
+               copy_to: Optional[str] = None) -> bytes:
+    """
+    PDF export of a report, rendered once per distinct report
+
+    Args:
+        report: Report to export (not modified)
+        cache: Cache to use (default: the process-wide cache)
+        key: Precomputed ``report_key(report)``
+        copy_to: Optional path to also save the PDF to
+
+    Returns:
+        PDF bytes
+    """
+    from .report import render_pdf, save_copy  # ReportLab loads on the first PDF export
+
+    with EXPORT_SECONDS.labels(format="pdf").time():
+        cache = cache if cache is not None else get_export_cache()
+        key = f"pdf:{key or report_key(report)}"
+        data = cache.get_or_create(key, lambda: render_pdf(report))
+        if copy_to:
+            save_copy(data, copy_to)
+    return data
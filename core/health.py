@@ -1,9 +1,15 @@
 """
 Health check and monitoring utilities
 """
+import importlib.util
 import os
+import shutil
 import sys
-from typing import Dict, Any
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, NamedTuple, Optional, Tuple
 from datetime import datetime
 import platform
 
@@ -39,12 +45,9 @@ def check_dependencies() -> Dict[str, bool]:
         "reportlab": False,
     }
 
+    # find_spec locates the package without importing it
     for dep in dependencies:
-        try:
-            __import__(dep)
-            dependencies[dep] = True
-        except ImportError:
-            dependencies[dep] = False
+        dependencies[dep] = importlib.util.find_spec(dep) is not None
 
     return dependencies
 
@@ -63,24 +66,212 @@ def check_llm_providers() -> Dict[str, bool]:
     }
 
 
+class MetricsSample(NamedTuple):
+    """One system metrics reading; fields are None when unavailable"""
+    timestamp: float
+    cpu_percent: Optional[float]
+    memory_percent: Optional[float]
+    disk_percent: Optional[float]
+    rss_bytes: Optional[int]
+
+
+SAMPLE_FIELDS = ("cpu_percent", "memory_percent", "disk_percent", "rss_bytes")
+
+
+def _proc_cpu_times() -> Optional[Tuple[int, int]]:
+    """(busy, total) jiffies from /proc/stat, or None off Linux"""
+    try:
+        with open("/proc/stat") as f:
+            values = [int(v) for v in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+    total = sum(values[:8])
+    return total - idle, total
+
+
+def _proc_memory_percent() -> Optional[float]:
+    try:
+        info = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                info[name] = int(value.split()[0])
+        return round(100.0 * (1 - info["MemAvailable"] / info["MemTotal"]), 1)
+    except (OSError, KeyError, ValueError, ZeroDivisionError):
+        return None
+
+
+def _proc_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SystemSampler:
+    """
+    Background sampler of CPU / memory / disk / process RSS
+
+    A daemon thread takes one reading every ``interval`` seconds into a
+    fixed-size ring buffer, so readers never block on a measurement. CPU
+    usage is the average since the previous sample (non-blocking
+    ``psutil.cpu_percent(interval=None)``, or /proc/stat deltas when psutil
+    is not installed).
+    """
+
+    def __init__(self, interval: float = 5.0, capacity: int = 720, disk_path: str = "/"):
+        """
+        Args:
+            interval: Seconds between samples
+            capacity: Samples kept (the default covers an hour at 5s)
+            disk_path: Filesystem whose usage is reported
+
+        Raises:
+            ValueError: If interval or capacity is not positive
+        """
+        if interval <= 0 or capacity <= 0:
+            raise ValueError("interval and capacity must be positive")
+        self.interval = interval
+        self.disk_path = disk_path
+        self._buffer: Deque[MetricsSample] = deque(maxlen=capacity)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._buffer_lock = threading.Lock()
+        try:
+            import psutil
+            self._psutil = psutil
+            self._process = psutil.Process()
+            psutil.cpu_percent(interval=None)  # prime: the first call has no baseline
+        except ImportError:
+            self._psutil = None
+            self._process = None
+        self._last_cpu = _proc_cpu_times() if self._psutil is None else None
+
+    def _cpu_percent(self) -> Optional[float]:
+        if self._psutil is not None:
+            return self._psutil.cpu_percent(interval=None)
+        now = _proc_cpu_times()
+        last, self._last_cpu = self._last_cpu, now
+        if now is None or last is None or now[1] == last[1]:
+            return None
+        return round(100.0 * (now[0] - last[0]) / (now[1] - last[1]), 1)
+
+    def sample(self) -> MetricsSample:
+        """Take one reading now and append it to the buffer"""
+        try:
+            usage = shutil.disk_usage(self.disk_path)
+            disk = round(100.0 * usage.used / usage.total, 1) if usage.total else None
+        except OSError:
+            disk = None
+        if self._psutil is not None:
+            memory = self._psutil.virtual_memory().percent
+            rss = self._process.memory_info().rss
+        else:
+            memory = _proc_memory_percent()
+            rss = _proc_rss_bytes()
+        reading = MetricsSample(time.time(), self._cpu_percent(), memory, disk, rss)
+        with self._buffer_lock:
+            self._buffer.append(reading)
+        return reading
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                pass  # a failed reading must not kill the sampler
+
+    def start(self) -> "SystemSampler":
+        """Take an initial reading and start the background thread (idempotent)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.sample()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="system-sampler", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1)
+
+    def latest(self) -> Optional[MetricsSample]:
+        """Most recent sample, or None before the first reading"""
+        try:
+            return self._buffer[-1]
+        except IndexError:
+            return None
+
+    def window(self, seconds: float) -> Dict[str, Dict[str, float]]:
+        """
+        min / avg / max of each metric over the last ``seconds``
+
+        Returns:
+            Field name -> {"min", "avg", "max", "samples"}; fields with no
+            readings in the window are omitted
+        """
+        cutoff = time.time() - seconds
+        with self._buffer_lock:
+            recent = list(self._buffer)
+        # Samples are in time order: drop the ones before the window
+        start = len(recent)
+        while start and recent[start - 1].timestamp >= cutoff:
+            start -= 1
+        recent = recent[start:]
+        stats = {}
+        for field in SAMPLE_FIELDS:
+            values = [v for v in (getattr(s, field) for s in recent) if v is not None]
+            if values:
+                stats[field] = {
+                    "min": min(values),
+                    "avg": round(sum(values) / len(values), 2),
+                    "max": max(values),
+                    "samples": len(values),
+                }
+        return stats
+
+    def snapshot(self, windows: Iterable[float] = (60, 300, 900)) -> Dict[str, Any]:
+        """Latest sample plus window statistics, for health panels and probes"""
+        latest = self.latest()
+        return {
+            "latest": latest._asdict() if latest else None,
+            "age_seconds": round(time.time() - latest.timestamp, 3) if latest else None,
+            "windows": {f"{int(w)}s": self.window(w) for w in windows},
+        }
+
+
+@lru_cache(maxsize=1)
+def get_sampler() -> SystemSampler:
+    """
+    Process-wide, started sampler
+
+    Interval and buffer size come from METRICS_SAMPLE_INTERVAL (seconds,
+    default 5) and METRICS_SAMPLE_CAPACITY (default 720).
+    """
+    return SystemSampler(
+        interval=float(os.getenv("METRICS_SAMPLE_INTERVAL", "5")),
+        capacity=int(os.getenv("METRICS_SAMPLE_CAPACITY", "720")),
+    ).start()
+
+
 def get_system_metrics() -> Dict[str, Any]:
     """
-    Get system metrics (basic version without psutil)
+    Get the latest system metrics from the background sampler
+
+    Does not block: values are from the most recent sample, taken at most
+    METRICS_SAMPLE_INTERVAL seconds ago.
 
     Returns:
         Dictionary containing basic system information
     """
-    try:
-        import psutil
-        return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": psutil.disk_usage('/').percent,
-        }
-    except ImportError:
-        # Fallback if psutil not available
-        return {
-            "cpu_percent": "N/A (psutil not installed)",
-            "memory_percent": "N/A (psutil not installed)",
-            "disk_percent": "N/A (psutil not installed)",
-        }
+    latest = get_sampler().latest()
+    metrics: Dict[str, Any] = {}
+    for field in SAMPLE_FIELDS:
+        value = getattr(latest, field) if latest else None
+        metrics[field] = "N/A" if value is None else value
+    return metrics
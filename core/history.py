@@ -0,0 +1,487 @@
+"""
+Audit history store for AI Shield Auditor
+
+Keeps every audit in an embedded SQLite database with normalized tables:
+audits, their categories, findings and recommendations. Finding and
+recommendation texts and answer sets repeat across audits, so they are
+stored once in a ``strings`` table and referenced by id. The tables are
+indexed on app id, category and timestamp. Two small rollup tables are
+maintained on write so the trend queries stay fast on large histories:
+
+- ``category_daily``: score sum and count per category per UTC day, for
+  "score per category over time"
+- ``apps``: each app's latest and previous audit, for "apps whose risk
+  regressed"
+
+The database runs in WAL mode with one connection per thread. Writes are
+buffered and committed in batches, one transaction per batch.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import ChainMap
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .compact import CompactCategory, CompactReport
+from .schema import AuditReport, UserEnvironment
+
+Report = Union[AuditReport, CompactReport]
+
+DAY = 86400
+
+# Report-level risk, worst last
+RISK_RANK = {"Low": 0, "Moderate": 1, "High": 2}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY,
+    value TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY,
+    app_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    overall_score REAL NOT NULL,
+    overall_risk TEXT NOT NULL,
+    user_environment TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audits_app_created ON audits(app_id, created);
+CREATE INDEX IF NOT EXISTS idx_audits_created ON audits(created);
+
+CREATE TABLE IF NOT EXISTS categories (
+    audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    app_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    category TEXT NOT NULL,
+    score REAL NOT NULL,
+    risk_level TEXT NOT NULL,
+    answers_id INTEGER NOT NULL REFERENCES strings(id),
+    questions TEXT,
+    PRIMARY KEY (audit_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_categories_category_created ON categories(category, created);
+CREATE INDEX IF NOT EXISTS idx_categories_app_category_created ON categories(app_id, category, created);
+
+CREATE TABLE IF NOT EXISTS findings (
+    audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    text_id INTEGER NOT NULL REFERENCES strings(id),
+    severity TEXT NOT NULL,
+    evidence TEXT,
+    threats TEXT,
+    PRIMARY KEY (audit_id, position, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    audit_id INTEGER NOT NULL REFERENCES audits(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    text_id INTEGER NOT NULL REFERENCES strings(id),
+    effort TEXT NOT NULL,
+    PRIMARY KEY (audit_id, position, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS category_daily (
+    category TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    audits INTEGER NOT NULL,
+    PRIMARY KEY (category, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS apps (
+    app_id TEXT PRIMARY KEY,
+    latest_id INTEGER NOT NULL,
+    latest_created REAL NOT NULL,
+    latest_score REAL NOT NULL,
+    latest_risk TEXT NOT NULL,
+    previous_id INTEGER,
+    previous_created REAL,
+    previous_score REAL,
+    previous_risk TEXT
+) WITHOUT ROWID;
+"""
+
+
+class AuditSummary(NamedTuple):
+    """One stored audit without its categories"""
+    id: int
+    app_id: str
+    created: float
+    overall_score: float
+    overall_risk: str
+
+
+class TrendPoint(NamedTuple):
+    """Average category score over one time bucket"""
+    start: float
+    average: float
+    audits: int
+
+
+class Regression(NamedTuple):
+    """An app whose latest audit scored worse than the one before"""
+    app_id: str
+    previous_score: float
+    latest_score: float
+    previous_risk: str
+    latest_risk: str
+    previous_created: float
+    latest_created: float
+
+    @property
+    def drop(self) -> float:
+        return round(self.previous_score - self.latest_score, 2)
+
+
+def _compact(report: Report) -> CompactReport:
+    return report if isinstance(report, CompactReport) else CompactReport.from_model(report)
+
+
+class AuditHistory:
+    """SQLite audit history with batched writes and trend queries"""
+
+    MAX_CACHED_STRINGS = 100_000
+    # A batch whose write failed is queued again unless that would leave
+    # more than this many batches' worth of audits waiting; then it is dropped
+    MAX_PENDING_BATCHES = 4
+
+    def __init__(self, path: str, batch_size: int = 500, timeout: float = 5.0):
+        """
+        Args:
+            path: Database file
+            batch_size: Buffered audits that trigger a write
+            timeout: Seconds to wait for the write lock
+
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.path = path
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, float, CompactReport]] = []
+        self._string_ids: Dict[str, int] = {}  # committed ids only; they never change
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(findings)")}
+        if "threats" not in columns:
+            conn.execute("ALTER TABLE findings ADD COLUMN threats TEXT")
+
+    # --- Writes ---
+
+    def add(self, app_id: str, report: Report, created: Optional[float] = None) -> None:
+        """
+        Queue an audit for writing; writes the batch once it is full
+
+        Args:
+            app_id: Application the audit belongs to
+            report: Audit report
+            created: Unix timestamp of the audit (default: now)
+        """
+        entry = (app_id, time.time() if created is None else created, _compact(report))
+        with self._lock:
+            self._pending.append(entry)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def add_many(self, audits: Iterable[Tuple[str, Report, Optional[float]]]) -> int:
+        """
+        Write (app_id, report, created) triples in batches
+
+        Returns:
+            Number of audits written
+        """
+        count = 0
+        for app_id, report, created in audits:
+            self.add(app_id, report, created)
+            count += 1
+        self.flush()
+        return count
+
+    def flush(self) -> int:
+        """
+        Write all queued audits in one transaction
+
+        If the write fails the batch is queued again, up to
+        MAX_PENDING_BATCHES batches, and the error is raised.
+
+        Returns:
+            Number of audits written
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return 0
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            new_ids = self._write(conn, batch)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            with self._lock:
+                if len(self._pending) + len(batch) <= self.batch_size * self.MAX_PENDING_BATCHES:
+                    self._pending[:0] = batch
+            raise
+        # Only now are the ids of strings inserted by this batch permanent
+        if len(self._string_ids) + len(new_ids) > self.MAX_CACHED_STRINGS:
+            self._string_ids.clear()
+        self._string_ids.update(new_ids)
+        return len(batch)
+
+    def _intern(self, conn: sqlite3.Connection, values: Iterable[str]) -> Tuple[Mapping[str, int], Dict[str, int]]:
+        """
+        String ids for values, inserting the new ones; caller holds the write lock
+
+        Returns:
+            (ids of all values, ids not in the cache yet); the latter are
+            only valid once the transaction commits
+        """
+        cached = self._string_ids
+        missing = list({v for v in values if v not in cached})
+        new_ids: Dict[str, int] = {}
+        if missing:
+            conn.executemany("INSERT OR IGNORE INTO strings (value) VALUES (?)", ((v,) for v in missing))
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                new_ids.update(conn.execute(
+                    f"SELECT value, id FROM strings WHERE value IN ({','.join('?' * len(chunk))})", chunk))
+        return ChainMap(new_ids, cached), new_ids
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Tuple[str, float, CompactReport]]) -> Dict[str, int]:
+        """Insert a batch inside the caller's transaction; returns the newly interned string ids"""
+        next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM audits").fetchone()[0]
+        audits, categories, findings, recs = [], [], [], []
+        daily: Dict[Tuple[str, int], List[float]] = {}
+        apps: Dict[str, List[Tuple[float, int, float, str]]] = {}
+        for audit_id, (app_id, created, report) in enumerate(batch, next_id):
+            score, risk = report.overall_score(), report.overall_risk()
+            audits.append((audit_id, app_id, created, score, risk,
+                           report.user_environment.model_dump_json(), json.dumps(report.summary)))
+            apps.setdefault(app_id, []).append((created, audit_id, score, risk))
+            day = int(created // DAY)
+            for position, c in enumerate(report.categories):
+                categories.append((audit_id, position, app_id, created, c.category, c.score, c.risk_level,
+                                   json.dumps(c.answers), None if c._questions is None else json.dumps(c._questions)))
+                findings.extend((audit_id, position, seq, t, s, e, json.dumps(ids) if ids else None)
+                                for seq, ((t, s, e), ids) in enumerate(zip(c.findings(), c.threats())))
+                recs.extend((audit_id, position, seq, t, e) for seq, (t, e) in enumerate(c.recommendations()))
+                cell = daily.setdefault((c.category, day), [0.0, 0])
+                cell[0] += c.score
+                cell[1] += 1
+
+        ids, new_ids = self._intern(conn, [row[7] for row in categories] + [row[3] for row in findings]
+                           + [row[3] for row in recs])
+        conn.executemany("INSERT INTO audits VALUES (?, ?, ?, ?, ?, ?, ?)", audits)
+        conn.executemany("INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (row[:7] + (ids[row[7]], row[8]) for row in categories))
+        conn.executemany("INSERT INTO findings (audit_id, position, seq, text_id, severity, evidence, threats) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (row[:3] + (ids[row[3]],) + row[4:] for row in findings))
+        conn.executemany("INSERT INTO recommendations VALUES (?, ?, ?, ?, ?)",
+                         (row[:3] + (ids[row[3]], row[4]) for row in recs))
+        conn.executemany(
+            "INSERT INTO category_daily VALUES (?, ?, ?, ?) ON CONFLICT (category, day) DO UPDATE SET "
+            "score_sum = score_sum + excluded.score_sum, audits = audits + excluded.audits",
+            [(category, day, total, n) for (category, day), (total, n) in daily.items()],
+        )
+        self._update_apps(conn, apps)
+        return new_ids
+
+    @staticmethod
+    def _update_apps(conn: sqlite3.Connection, apps: Dict[str, List[Tuple[float, int, float, str]]]) -> None:
+        """Fold new audits into each app's latest/previous pair; audits may arrive out of order"""
+        rows = []
+        for app_id, new in apps.items():
+            row = conn.execute(
+                "SELECT latest_created, latest_id, latest_score, latest_risk, "
+                "previous_created, previous_id, previous_score, previous_risk FROM apps WHERE app_id = ?",
+                (app_id,),
+            ).fetchone()
+            known = [] if row is None else [row[:4]] + ([row[4:]] if row[4] is not None else [])
+            # Newest two by (created, id)
+            latest, *rest = sorted(known + new, reverse=True)[:2]
+            previous = rest[0] if rest else (None, None, None, None)
+            rows.append((app_id, latest[1], latest[0], latest[2], latest[3],
+                         previous[1], previous[0], previous[2], previous[3]))
+        conn.executemany("INSERT OR REPLACE INTO apps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    # --- Queries ---
+
+    def category_trend(self, category: str, since: Optional[float] = None, until: Optional[float] = None,
+                       bucket_days: int = 1) -> List[TrendPoint]:
+        """
+        Average score of one category over time, across all apps
+
+        Args:
+            category: Category name
+            since: Earliest timestamp (inclusive, rounded down to its day)
+            until: Latest timestamp (inclusive, rounded down to its day)
+            bucket_days: Days per point
+
+        Returns:
+            TrendPoints in time order
+
+        Raises:
+            ValueError: If bucket_days is not positive
+        """
+        if bucket_days < 1:
+            raise ValueError("bucket_days must be positive")
+        first = int(since // DAY) if since is not None else -(1 << 62)
+        last = int(until // DAY) if until is not None else 1 << 62
+        rows = self._connection().execute(
+            "SELECT (day / ?) * ? AS bucket, SUM(score_sum), SUM(audits) FROM category_daily "
+            "WHERE category = ? AND day BETWEEN ? AND ? GROUP BY bucket ORDER BY bucket",
+            (bucket_days, bucket_days, category, first, last),
+        ).fetchall()
+        return [TrendPoint(float(bucket * DAY), round(total / n, 2), n) for bucket, total, n in rows]
+
+    def app_category_scores(self, app_id: str, category: Optional[str] = None,
+                            since: Optional[float] = None) -> List[Tuple[float, str, float]]:
+        """
+        One app's category scores over time
+
+        Returns:
+            (created, category, score) rows in time order
+        """
+        sql = "SELECT created, category, score FROM categories WHERE app_id = ?"
+        params: List[Any] = [app_id]
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        if since is not None:
+            sql += " AND created >= ?"
+            params.append(since)
+        return self._connection().execute(sql + " ORDER BY created, position", params).fetchall()
+
+    def app_history(self, app_id: str, limit: int = 50) -> List[AuditSummary]:
+        """Most recent audits of one app, newest first"""
+        rows = self._connection().execute(
+            "SELECT id, app_id, created, overall_score, overall_risk FROM audits "
+            "WHERE app_id = ? ORDER BY created DESC, id DESC LIMIT ?",
+            (app_id, limit),
+        ).fetchall()
+        return [AuditSummary(*row) for row in rows]
+
+    def regressed_apps(self, min_drop: float = 0.0, risk_only: bool = False,
+                       since: Optional[float] = None, limit: Optional[int] = None) -> List[Regression]:
+        """
+        Apps whose latest audit scored worse than the previous one
+
+        Args:
+            min_drop: Score drop that counts as a regression (exclusive)
+            risk_only: Only report apps whose overall risk level got worse
+            since: Only apps whose latest audit is at or after this timestamp
+            limit: Most apps returned
+
+        Returns:
+            Regressions, largest drop first
+        """
+        rows = self._connection().execute(
+            "SELECT app_id, previous_score, latest_score, previous_risk, latest_risk, previous_created, "
+            "latest_created FROM apps WHERE previous_id IS NOT NULL AND previous_score - latest_score > ? "
+            "AND latest_created >= ? ORDER BY previous_score - latest_score DESC",
+            (min_drop, since if since is not None else float("-inf")),
+        ).fetchall()
+        out = [Regression(*row) for row in rows]
+        if risk_only:
+            out = [r for r in out if RISK_RANK.get(r.latest_risk, 0) > RISK_RANK.get(r.previous_risk, 0)]
+        return out if limit is None else out[:limit]
+
+    def load_report(self, audit_id: int) -> AuditReport:
+        """
+        Rebuild a stored audit as an AuditReport
+
+        Raises:
+            ValueError: If no audit has that id
+        """
+        conn = self._connection()
+        row = conn.execute("SELECT user_environment, summary FROM audits WHERE id = ?", (audit_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"No audit with id {audit_id}")
+        findings: Dict[int, List[Tuple[str, str, Optional[str]]]] = {}
+        threats: Dict[int, List[List[str]]] = {}
+        for position, text, severity, evidence, ids in conn.execute(
+                "SELECT position, value, severity, evidence, threats FROM findings "
+                "JOIN strings ON strings.id = text_id WHERE audit_id = ? ORDER BY position, seq",
+                (audit_id,)):
+            findings.setdefault(position, []).append((text, severity, evidence))
+            threats.setdefault(position, []).append(json.loads(ids) if ids else [])
+        recs: Dict[int, List[Tuple[str, str]]] = {}
+        for position, text, effort in conn.execute(
+                "SELECT position, value, effort FROM recommendations JOIN strings ON strings.id = text_id "
+                "WHERE audit_id = ? ORDER BY position, seq",
+                (audit_id,)):
+            recs.setdefault(position, []).append((text, effort))
+        categories = []
+        for position, category, score, risk, answers, questions in conn.execute(
+                "SELECT position, category, score, risk_level, value, questions FROM categories "
+                "JOIN strings ON strings.id = answers_id WHERE audit_id = ? ORDER BY position", (audit_id,)):
+            compact = CompactCategory.build(category, score, risk, json.loads(answers),
+                                            findings.get(position, ()), recs.get(position, ()),
+                                            threats.get(position, []))
+            if questions is not None:
+                compact._questions = json.loads(questions)
+            categories.append(compact)
+        env = UserEnvironment.model_validate_json(row[0])
+        return CompactReport(env, categories, json.loads(row[1])).to_model()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM audits").fetchone()[0]
+
+    def close(self) -> None:
+        """Write queued audits and close this thread's connection"""
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self) -> "AuditHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=1)
+def get_history() -> Optional[AuditHistory]:
+    """
+    Process-wide audit history
+
+    Configured from AUDIT_HISTORY_PATH (default
+    reports/audit_history.sqlite3, "none" disables).
+    """
+    path = os.getenv("AUDIT_HISTORY_PATH", os.path.join("reports", "audit_history.sqlite3"))
+    if path.strip().lower() in ("", "none"):
+        return None
+    return AuditHistory(path)
@@ -0,0 +1,119 @@
+"""
+Incremental audit evaluation for AI Shield Auditor
+
+Memoizes each section's CategoryResult by a fingerprint of its answers,
+so re-running an audit after one answer changed re-evaluates only that
+section. Anything applied after evaluation (e.g. the LLM review) runs on
+the re-evaluated sections only. The overall score and summary are cheap
+and are always recomputed from the category results. Editing rules.yml
+or questions.yml drops every memoized result.
+"""
+from collections import OrderedDict
+from typing import Callable, Collection, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from .registry import AuditRegistry, get_registry
+from .rules import rules_signature
+from .schema import CategoryResult
+
+Fingerprint = Tuple[Tuple[str, str], ...]
+
+# enhance(results) -> (results, names of categories not to memoize, e.g. failed LLM calls)
+Enhancer = Callable[[List[CategoryResult]], Tuple[List[CategoryResult], Collection[str]]]
+
+
+def fingerprint(answers: Dict[str, str]) -> Fingerprint:
+    """
+    Exact, hashable identity of a section's answers
+
+    Order-sensitive, because CategoryResult.questions keeps answer order.
+    """
+    return tuple(answers.items())
+
+
+class IncrementalResult(NamedTuple):
+    """Category results in registry order and the sections that were re-evaluated"""
+    categories: List[CategoryResult]
+    recomputed: List[str]
+
+
+class SectionMemo:
+    """Per-section memo of CategoryResults keyed by answer fingerprint"""
+
+    def __init__(self, registry: Optional[AuditRegistry] = None, per_section: int = 8):
+        """
+        Args:
+            registry: Audit registry (default: the shared one)
+            per_section: Answer sets remembered per section, so toggling an
+                answer back reuses the earlier result
+
+        Raises:
+            ValueError: If per_section is not positive
+        """
+        if per_section < 1:
+            raise ValueError("per_section must be positive")
+        self._registry = registry
+        self.per_section = per_section
+        self._memo: Dict[str, "OrderedDict[Fingerprint, CategoryResult]"] = {}
+        self._context: Hashable = None
+        self.hits = self.misses = 0
+
+    @property
+    def registry(self) -> AuditRegistry:
+        return self._registry if self._registry is not None else get_registry()
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    @staticmethod
+    def _key(context: Hashable) -> Hashable:
+        # Results also depend on the templates they were evaluated with
+        return context, rules_signature()
+
+    def evaluate(self, answers: Dict[str, Dict[str, str]], enhance: Optional[Enhancer] = None,
+                 context: Hashable = None) -> IncrementalResult:
+        """
+        Evaluate every section, reusing memoized results for unchanged answers
+
+        Args:
+            answers: Section name -> {question: answer}
+            enhance: Optional post-processing applied to re-evaluated results
+            context: Anything else the results depend on (environment, LLM
+                provider); a different context drops all memoized results
+
+        Returns:
+            IncrementalResult in registry order
+        """
+        key = self._key(context)
+        if key != self._context:
+            self._memo.clear()
+            self._context = key
+
+        registry = self.registry
+        found: Dict[str, CategoryResult] = {}
+        stale: List[Tuple[str, Fingerprint]] = []
+        for section in registry.sections:
+            fp = fingerprint(answers.get(section, {}))
+            memo = self._memo.get(section)
+            if memo is not None and fp in memo:
+                memo.move_to_end(fp)
+                found[section] = memo[fp]
+                self.hits += 1
+            else:
+                stale.append((section, fp))
+                self.misses += 1
+
+        fresh = [registry.audit(section).evaluate(dict(answers.get(section, {}))) for section, _ in stale]
+        skip: Collection[str] = ()
+        if enhance is not None and fresh:
+            fresh, skip = enhance(fresh)
+
+        for (section, fp), result in zip(stale, fresh):
+            found[section] = result
+            if section in skip:
+                continue
+            memo = self._memo.setdefault(section, OrderedDict())
+            memo[fp] = result
+            while len(memo) > self.per_section:
+                memo.popitem(last=False)
+
+        return IncrementalResult([found[s] for s in registry.sections], [s for s, _ in stale])
@@ -0,0 +1,225 @@
+"""
+Persistent LLM response cache for AI Shield Auditor
+
+Responses are stored in SQLite, keyed by a hash of the prompt template
+version, the model and the normalized request, so audits with the same
+answers reuse the earlier response without a provider call. Entries
+expire after a TTL and the least recently used ones are evicted when the
+cache grows past its entry or byte limit.
+
+The database runs in WAL mode with one connection per thread, so
+Streamlit threads and separate processes read concurrently. Reads only
+write back their access time once per ``touch_interval``.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from .scoring import normalize_answer
+from .security import SecurityValidator
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def make_key(prompt_version: str, model: str, request: Dict[str, Any]) -> str:
+    """
+    Cache key for one request
+
+    Answers are normalized (Yes/No/Unknown) and question text stripped, so
+    spelling variants of the same answer set share an entry.
+
+    Args:
+        prompt_version: Hash of the system prompt (see ``prompt_version``)
+        model: Provider and model identifier
+        request: Request payload; an ``answers`` mapping is normalized
+
+    Returns:
+        SHA-256 hex digest
+    """
+    normalized = dict(request)
+    if isinstance(normalized.get("answers"), dict):
+        normalized["answers"] = {str(q).strip(): normalize_answer(a) for q, a in normalized["answers"].items()}
+    canonical = json.dumps({"prompt": prompt_version, "model": model, "request": normalized},
+                           sort_keys=True, separators=(",", ":"))
+    return SecurityValidator.hash_sensitive_data(canonical)
+
+
+def prompt_version(system_prompt: str) -> str:
+    """Short hash identifying a prompt template; editing the prompt invalidates the cache"""
+    return SecurityValidator.hash_sensitive_data(system_prompt)[:16]
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL expiry and LRU eviction"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES, timeout: float = 5.0,
+                 touch_interval: float = 60.0):
+        """
+        Args:
+            path: Database file
+            ttl: Seconds an entry stays valid after it is written
+            max_entries: Most entries kept (None = unbounded)
+            max_bytes: Most response bytes kept (None = unbounded)
+            timeout: Seconds to wait for the write lock
+            touch_interval: Least seconds between access-time updates of an entry
+
+        Raises:
+            ValueError: If ttl or a limit is not positive
+        """
+        if ttl <= 0 or (max_entries is not None and max_entries <= 0) or (max_bytes is not None and max_bytes <= 0):
+            raise ValueError("ttl, max_entries and max_bytes must be positive")
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.clock = time.time  # must be comparable across processes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = self.misses = self.expired = self.evictions = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses(accessed)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None when missing or expired"""
+        conn = self._connection()
+        row = conn.execute("SELECT response, created, accessed FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        now = self.clock()
+        if row is None:
+            self._count("misses")
+            return None
+        response, created, accessed = row
+        if now - created > self.ttl:
+            self._count("expired")
+            self._count("misses")
+            return None
+        if now - accessed > self.touch_interval:
+            try:
+                conn.execute("UPDATE llm_responses SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.OperationalError:
+                pass  # busy writer: the LRU position is only advisory
+        self._count("hits")
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response, then prune expired and over-limit entries periodically"""
+        conn = self._connection()
+        now = self.clock()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, response, len(response.encode("utf-8")), now, now),
+            )
+            with self._lock:
+                self._writes += 1
+                prune = (self._writes - 1) % self.PRUNE_EVERY == 0
+            if prune:
+                self._prune(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """Delete expired entries, then least recently used ones over the limits; caller holds the write lock"""
+        removed = conn.execute("DELETE FROM llm_responses WHERE created < ?", (now - self.ttl,)).rowcount
+        if self.max_entries is not None:
+            removed += conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if self.max_bytes is not None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+            if total > self.max_bytes:
+                victims = []
+                for key, size in conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed"):
+                    victims.append((key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+                conn.executemany("DELETE FROM llm_responses WHERE key = ?", victims)
+                removed += len(victims)
+        if removed:
+            with self._lock:
+                self.evictions += removed
+
+    def prune(self) -> None:
+        """Run expiry and eviction now"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._prune(conn, self.clock())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this instance plus the stored entry count and size"""
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide response cache
+
+    Configured from LLM_CACHE_PATH (default .cache/llm_responses.sqlite3,
+    "none" disables), LLM_CACHE_TTL_HOURS (default 168) and
+    LLM_CACHE_MAX_MB (default 256).
+    """
+    path = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3"))
+    if path.strip().lower() in ("", "none"):
+        return None
+    return LLMResponseCache(
+        path,
+        ttl=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600,
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+    )
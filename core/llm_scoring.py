@@ -0,0 +1,403 @@
+"""
+LLM-enhanced scoring for AI Shield Auditor
+
+Sends the answers of each audit category to the configured LLM provider
+and merges the findings and recommendations it returns into the checklist
+results. Calls run concurrently on asyncio behind a bounded semaphore,
+with a per-call timeout and retries with jittered exponential backoff.
+Several categories are batched into one call while the prompt stays under
+``max_prompt_chars``.
+
+With a response cache (core.llm_cache), each category is looked up first
+and only the misses are sent; successful responses are stored per
+category, so repeated answer sets cost no provider call. Cache reads and
+writes run in a worker thread so SQLite does not block the event loop,
+and a failing cache only costs the hits: reads count as misses and
+writes are skipped.
+
+Providers: "openai" and "anthropic" use the official async clients when
+those packages are installed; "fake" is an in-process stand-in for
+offline runs and tests. Select one with LLM_PROVIDER.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .llm_cache import LLMResponseCache, make_key, prompt_version
+from .logging_config import get_logger
+from .metrics import LLM_CALL_SECONDS
+from .schema import CategoryResult, Finding, Recommendation, UserEnvironment
+from .utils import TEMPLATES_DIR
+
+PROMPTS_DIR = TEMPLATES_DIR.parent / "prompts"
+SCORE_PROMPT_PATH = PROMPTS_DIR / "score_prompt.md"
+
+LEVELS = ("Low", "Medium", "High")
+TOP_N = 3
+
+# Appended to score_prompt.md so one call can cover several categories
+_FORMAT_INSTRUCTIONS = """
+The input is a JSON object with the environment and a list of categories,
+each with its checklist answers. Respond with a single JSON object only:
+{"categories": {"<category>": {"findings": [{"text": "...", "severity": "Low|Medium|High"}],
+"recommendations": [{"text": "...", "effort": "Low|Medium|High"}]}}}
+Include every input category.
+"""
+
+_JSON_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+logger = get_logger(__name__)
+
+
+class LLMError(Exception):
+    """A provider call or its response was unusable"""
+
+
+class LLMOutcome(NamedTuple):
+    """Result of an enhancement run"""
+    categories: List[CategoryResult]
+    errors: Dict[str, str]
+    calls: int  # provider calls made, retries included
+    seconds: float
+    cached: int = 0
+
+
+def load_system_prompt(path=SCORE_PROMPT_PATH) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip() + "\n" + _FORMAT_INSTRUCTIONS
+
+
+class OpenAIProvider:
+    name = "openai"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        try:
+            from openai import AsyncOpenAI
+        except ImportError as e:
+            raise ValueError("LLM_PROVIDER=openai requires the openai package") from e
+        self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("LLM_PROVIDER=openai requires OPENAI_API_KEY")
+        self._client = AsyncOpenAI(api_key=api_key, max_retries=0)
+
+    async def complete(self, system: str, user: str) -> str:
+        resp = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            response_format={"type": "json_object"},
+            temperature=0,
+        )
+        return resp.choices[0].message.content or ""
+
+
+class AnthropicProvider:
+    name = "anthropic"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        try:
+            from anthropic import AsyncAnthropic
+        except ImportError as e:
+            raise ValueError("LLM_PROVIDER=anthropic requires the anthropic package") from e
+        self.model = model or os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307")
+        api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("LLM_PROVIDER=anthropic requires ANTHROPIC_API_KEY")
+        self._client = AsyncAnthropic(api_key=api_key, max_retries=0)
+
+    async def complete(self, system: str, user: str) -> str:
+        resp = await self._client.messages.create(
+            model=self.model,
+            max_tokens=2048,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+            temperature=0,
+        )
+        return "".join(block.text for block in resp.content if getattr(block, "type", "") == "text")
+
+
+class FakeProvider:
+    """
+    Deterministic in-process provider
+
+    Answers like a model would: a finding and a recommendation for each
+    "No" / "Unknown" answer, in the requested JSON shape. Latency and
+    failures can be injected to exercise timeouts and retries.
+    """
+    name = "fake"
+    model = "fake"
+
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def complete(self, system: str, user: str) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self._rng.random() < self.fail_rate:
+                raise LLMError("fake provider: injected failure")
+            request = json.loads(user)
+            out = {}
+            for cat in request["categories"]:
+                findings, recs = [], []
+                for question, answer in cat["answers"].items():
+                    q = question.replace(" (Yes/No/Unknown)", "").rstrip("?")
+                    if answer == "No":
+                        findings.append({"text": f"Control missing: {q}", "severity": "High"})
+                        recs.append({"text": f"Put in place: {q}", "effort": "Medium"})
+                    elif answer == "Unknown":
+                        findings.append({"text": f"Unverified control: {q}", "severity": "Medium"})
+                        recs.append({"text": f"Confirm and document: {q}", "effort": "Low"})
+                out[cat["category"]] = {"findings": findings, "recommendations": recs}
+            return "```json\n" + json.dumps({"categories": out}) + "\n```"
+        finally:
+            self.in_flight -= 1
+
+
+PROVIDERS = {"openai": OpenAIProvider, "anthropic": AnthropicProvider, "fake": FakeProvider}
+
+
+def get_provider(name: Optional[str] = None):
+    """
+    Provider selected by name or LLM_PROVIDER
+
+    Returns:
+        Provider instance, or None when LLM scoring is disabled ("none")
+
+    Raises:
+        ValueError: If the provider is unknown, or its client package or API key is missing
+    """
+    name = (name or os.getenv("LLM_PROVIDER", "none")).strip().lower()
+    if name in ("", "none"):
+        return None
+    factory = PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    return factory()
+
+
+def _level(value: Any) -> str:
+    value = str(value or "").strip().capitalize()
+    return value if value in LEVELS else "Medium"
+
+
+def parse_response(text: str, categories: Sequence[str]) -> Dict[str, Tuple[List[Finding], List[Recommendation]]]:
+    """
+    Parse a provider response into findings and recommendations per category
+
+    Args:
+        text: Raw model output (a JSON object, optionally in a code fence)
+        categories: Categories the request covered
+
+    Returns:
+        Category -> (findings, recommendations), top three of each
+
+    Raises:
+        LLMError: If the output is not the expected JSON or misses a category
+    """
+    try:
+        data = json.loads(_JSON_FENCE.sub("", text.strip()))
+        by_category = data["categories"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise LLMError(f"Malformed LLM response: {e}") from e
+    parsed = {}
+    for category in categories:
+        entry = by_category.get(category)
+        if not isinstance(entry, dict):
+            raise LLMError(f"LLM response is missing category {category!r}")
+        findings = [Finding(text=str(f["text"]), severity=_level(f.get("severity")), evidence="LLM review")
+                    for f in entry.get("findings") or [] if isinstance(f, dict) and f.get("text")]
+        recs = [Recommendation(text=str(r["text"]), effort=_level(r.get("effort")))
+                for r in entry.get("recommendations") or [] if isinstance(r, dict) and r.get("text")]
+        parsed[category] = (findings[:TOP_N], recs[:TOP_N])
+    return parsed
+
+
+def _batches(results: Sequence[CategoryResult], batch_size: int, max_chars: int) -> List[List[CategoryResult]]:
+    batches: List[List[CategoryResult]] = []
+    size = 0
+    for result in results:
+        cost = len(json.dumps(result.answers))
+        if batches and len(batches[-1]) < batch_size and size + cost <= max_chars:
+            batches[-1].append(result)
+            size += cost
+        else:
+            batches.append([result])
+            size = cost
+    return batches
+
+
+def _merge(result: CategoryResult, findings: List[Finding], recs: List[Recommendation]) -> CategoryResult:
+    seen_f = {f.text.lower() for f in result.findings}
+    seen_r = {r.text.lower() for r in result.recommendations}
+    return result.model_copy(update={
+        "findings": result.findings + [f for f in findings if f.text.lower() not in seen_f],
+        "recommendations": result.recommendations + [r for r in recs if r.text.lower() not in seen_r],
+    })
+
+
+def _cache_lookup(cache: LLMResponseCache, keys: Sequence[str]) -> List[Optional[str]]:
+    """Cached responses for keys; None for misses and unreadable entries"""
+    hits: List[Optional[str]] = []
+    for key in keys:
+        try:
+            hits.append(cache.get(key))
+        except sqlite3.Error as e:
+            logger.warning("LLM cache read failed, treating as a miss", error=str(e))
+            hits.append(None)
+    return hits
+
+
+def _cache_store(cache: LLMResponseCache, entries: Sequence[Tuple[str, str]]) -> None:
+    for key, response in entries:
+        try:
+            cache.put(key, response)
+        except sqlite3.Error as e:
+            logger.warning("LLM cache write failed", error=str(e))
+
+
+async def _call_with_retries(provider, system: str, user: str, categories: List[str],
+                             semaphore: asyncio.Semaphore, timeout: float, retries: int,
+                             backoff: float, max_backoff: float, attempts: List[int]):
+    """
+    One batch: every attempt holds a semaphore slot; backoff sleeps do not
+
+    attempts[0] is incremented for every provider call made, retries included.
+    """
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        attempts[0] += 1
+        try:
+            async with semaphore:
+                text = await asyncio.wait_for(provider.complete(system, user), timeout)
+            parsed = parse_response(text, categories)
+            LLM_CALL_SECONDS.labels(provider=provider.name, outcome="ok").observe(time.perf_counter() - start)
+            return parsed
+        except Exception as e:
+            outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+            LLM_CALL_SECONDS.labels(provider=provider.name, outcome=outcome).observe(time.perf_counter() - start)
+            if attempt >= retries:
+                if isinstance(e, asyncio.TimeoutError):
+                    raise LLMError(f"timed out after {timeout}s ({attempt + 1} attempts)") from e
+                raise
+            # Full jitter: spreads retries from concurrent batches apart
+            await asyncio.sleep(random.uniform(0, min(max_backoff, backoff * (2 ** attempt))))
+            attempt += 1
+
+
+async def enhance_results(results: Sequence[CategoryResult], user_environment: UserEnvironment, provider,
+                          concurrency: int = 4, timeout: float = 30.0, retries: int = 2,
+                          batch_size: int = 3, max_prompt_chars: int = 6000,
+                          backoff: float = 0.5, max_backoff: float = 8.0,
+                          cache: Optional[LLMResponseCache] = None) -> LLMOutcome:
+    """
+    Add LLM findings and recommendations to checklist results
+
+    Categories whose call still fails after the retries keep their
+    checklist results and are reported in ``errors``.
+
+    Args:
+        results: Checklist results, one per category
+        user_environment: Locked environment, sent as context
+        provider: Object with ``name`` and ``async complete(system, user) -> str``
+        concurrency: Most calls in flight at once
+        timeout: Seconds allowed per call attempt
+        retries: Extra attempts per batch after a failure
+        batch_size: Most categories per call
+        max_prompt_chars: Answer payload size above which batches are split
+        backoff: Base delay in seconds for the first retry
+        max_backoff: Cap on the retry delay
+        cache: Response cache consulted per category before any call
+
+    Returns:
+        LLMOutcome with results in input order
+    """
+    if concurrency < 1 or batch_size < 1 or retries < 0:
+        raise ValueError("concurrency and batch_size must be positive and retries non-negative")
+    start = time.perf_counter()
+    system = load_system_prompt()
+    env = user_environment.model_dump(mode="json")
+    semaphore = asyncio.BoundedSemaphore(concurrency)
+    attempts = [0]
+
+    merged: Dict[str, CategoryResult] = {}
+    errors: Dict[str, str] = {}
+    keys: Dict[str, str] = {}
+    pending = []
+    if cache is not None:
+        version = prompt_version(system)
+        model = f"{provider.name}:{getattr(provider, 'model', provider.name)}"
+        for result in results:
+            keys[result.category] = make_key(
+                version, model, {"environment": env, "category": result.category, "answers": result.answers})
+        hits = await asyncio.to_thread(_cache_lookup, cache, [keys[r.category] for r in results])
+        for result, hit in zip(results, hits):
+            if hit is None:
+                pending.append(result)
+            else:
+                try:
+                    entry = json.loads(hit)
+                    findings = [Finding(**f) for f in entry["findings"]]
+                    recs = [Recommendation(**r) for r in entry["recommendations"]]
+                except (ValueError, KeyError, TypeError) as e:
+                    # Corrupt or outdated entry (pydantic's ValidationError is a
+                    # ValueError): call the model again, which overwrites the row
+                    logger.warning("Unreadable LLM cache entry, treating as a miss",
+                                   category=result.category, error=str(e))
+                    pending.append(result)
+                    continue
+                merged[result.category] = _merge(result, findings, recs)
+    else:
+        pending = list(results)
+
+    batches = _batches(pending, batch_size, max_prompt_chars)
+    tasks = []
+    for batch in batches:
+        names = [r.category for r in batch]
+        user = json.dumps({
+            "environment": env,
+            "categories": [{"category": r.category, "answers": r.answers} for r in batch],
+        })
+        tasks.append(_call_with_retries(provider, system, user, names, semaphore,
+                                        timeout, retries, backoff, max_backoff, attempts))
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+    fresh: List[Tuple[str, str]] = []
+    for batch, outcome in zip(batches, outcomes):
+        for result in batch:
+            if isinstance(outcome, BaseException):
+                errors[result.category] = f"{type(outcome).__name__}: {outcome}"
+                merged[result.category] = result
+                continue
+            findings, recs = outcome[result.category]
+            merged[result.category] = _merge(result, findings, recs)
+            if cache is not None:
+                fresh.append((keys[result.category], json.dumps({
+                    "findings": [f.model_dump() for f in findings],
+                    "recommendations": [r.model_dump() for r in recs],
+                })))
+    if fresh:
+        await asyncio.to_thread(_cache_store, cache, fresh)
+
+    return LLMOutcome([merged[r.category] for r in results], errors, attempts[0], time.perf_counter() - start,
+                      len(results) - len(pending))
+
+
+def enhance_results_sync(results: Sequence[CategoryResult], user_environment: UserEnvironment,
+                         provider, **kwargs) -> LLMOutcome:
+    """Blocking wrapper around ``enhance_results`` for callers without an event loop"""
+    return asyncio.run(enhance_results(results, user_environment, provider, **kwargs))
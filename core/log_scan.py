@@ -0,0 +1,551 @@
+"""
+Parallel secret and PII scanner for log files
+
+Scans log files and directories of rotated (``app.log.1``) and gzip
+(``app.log.2.gz``) logs for the redaction patterns in ``core.redaction``
+and the credential-exposure regex indicators in ``seed.sql``, and reports
+counts per file and pattern plus a few sample locations for each.
+
+Plain files are memory-mapped and split into line-aligned chunks that a
+pool of worker processes scans independently; a gzip file cannot be
+split, so each one is streamed by a single worker. Every worker holds one
+chunk at a time and at most ``2 * workers`` tasks are in flight, so
+memory stays flat for any amount of input.
+
+Inside a chunk each pattern runs the cheapest way it can:
+
+- ip_address, credit_card and ssn start with a digit, and log lines are
+  full of digits (timestamps, ids). They are searched as one expression
+  over a copy of the chunk with every digit folded to ``0``, which lets
+  the regex engine skip straight to digit runs.
+- Every other pattern needs some literal (``@`` for email, ``sk-`` or
+  ``api`` for API keys, ``password``, ``bearer``...). The literals are
+  counted in a lowercased copy of the chunk: if one is missing the pattern
+  is skipped, otherwise it only runs on the lines that contain the rarest
+  one.
+
+Patterns are counted independently, so text matching two of them (an
+``sk-`` key is both ``api_key`` and a credential indicator) counts for
+both. A match spanning lines may be missed. Sample excerpts show the text before the
+match with the match itself, and anything sensitive, redacted.
+
+Usage:
+    python -m core.log_scan /var/log/app/ --workers 8
+    python -m core.log_scan app.log app.log.1.gz --json > scan.json
+"""
+import argparse
+import gzip
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .redaction import REDACTION_PATTERNS, REPLACEMENTS, redact
+from .threat_intel import DEFAULT_SEED_PATH, load_threat_intel
+from .threat_matcher import required_literals
+from .utils import bounded_process_map
+
+DEFAULT_CHUNK_SIZE = 8 << 20
+DEFAULT_SAMPLES = 5
+
+# Threat type whose regex indicators are scanned for
+CREDENTIAL_THREAT_TYPE = "credential_exposure"
+
+CREDENTIAL_REPLACEMENT = "[REDACTED_CREDENTIAL]"
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+_DIGIT_PATTERNS = ("ip_address", "credit_card", "ssn")
+
+_FOLD_DIGITS = bytes.maketrans(b"0123456789", b"0" * 10)
+
+
+# A leading run of digits on the digit-folded buffer: 0, 0{n} or 0{m,n}
+_LEADING_ZEROS = re.compile(r"0(?:\{(\d+)(?:,(\d+))?\})?")
+_LEADING_GROUP = re.compile(r"\(\?:([^()]*)\)\{(\d+)\}")
+
+
+def _after_first_digit(pattern: str) -> str:
+    """
+    What is left of a digit-folded pattern once its first digit is matched
+
+    Handles patterns starting with 0, 0{n}, 0{m,n} (m >= 1) or a repeated
+    non-capturing group starting with one of those.
+
+    Raises:
+        ValueError: If the pattern does not start that way
+    """
+    m = _LEADING_ZEROS.match(pattern)
+    if m and (m.group(1) is None or int(m.group(1)) >= 1):
+        low = int(m.group(1) or 1)
+        high = int(m.group(2) or low)
+        return f"0{{{low - 1},{high - 1}}}" + pattern[m.end():]
+    m = _LEADING_GROUP.match(pattern)
+    if m and int(m.group(2)) >= 1:
+        body = m.group(1)
+        return _after_first_digit(body) + f"(?:{body}){{{int(m.group(2)) - 1}}}" + pattern[m.end():]
+    raise ValueError(f"digit pattern must start with a digit: {pattern!r}")
+
+
+def _digit_scanner() -> "re.Pattern[bytes]":
+    """
+    ip_address, credit_card and ssn combined for the digit-folded buffer
+
+    The patterns only match digits through \\d, and folding keeps digits and
+    word boundaries where they were, so with \\d read as 0 each finds exactly
+    the matches it finds in the original text. Each starts with \\b and a
+    digit, i.e. a 0 not preceded by a word character; that 0 is taken out
+    in front of the alternation so the engine can skip straight to it.
+    """
+    alternatives = []
+    for name in _DIGIT_PATTERNS:
+        pattern = REDACTION_PATTERNS[name].replace(r"\d", "0")
+        if not pattern.startswith(r"\b"):
+            raise ValueError(f"digit pattern must start with \\b: {pattern!r}")
+        alternatives.append(f"(?P<{name}>{_after_first_digit(pattern[2:])})")
+    return re.compile(("0(?<![A-Za-z0-9_]0)(?:" + "|".join(alternatives) + ")").encode())
+
+
+_DIGIT_SCANNER = _digit_scanner()
+
+# API keys are either sk- or api...key prefixed; the two halves are gated
+# on their own literals ("api" alone is in every URL path)
+_SPLIT_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "api_key": (r"sk-[a-zA-Z0-9]{20,}", r"api[_-]?key[_-]?[a-zA-Z0-9]{20,}"),
+}
+
+# Required literals of patterns the atom extraction cannot see (too short)
+_EXTRA_ATOMS: Dict[str, List[FrozenSet[bytes]]] = {"email": [frozenset([b"@"])]}
+
+# Past one occurrence of the rarest literal per this many bytes, scanning
+# the whole chunk beats scanning line by line
+_DENSE_SPACING = 512
+
+# Bytes of text before a match shown in sample excerpts
+_EXCERPT_CONTEXT = 48
+
+
+class Sample(NamedTuple):
+    """Where one match was found"""
+    path: str
+    line: int
+    offset: int  # byte offset in the file (decompressed, for gzip)
+    excerpt: str
+
+
+class _Detector(NamedTuple):
+    name: str
+    regex: "re.Pattern[bytes]"
+    atoms: List[FrozenSet[bytes]]  # lowercase; one of each set must be present
+    replacement: str
+
+
+class _ChunkResult(NamedTuple):
+    path: str
+    index: int
+    size: int
+    newlines: int
+    counts: Dict[str, int]
+    samples: Dict[str, List[Tuple[int, int, str]]]  # (offset, line in chunk, excerpt)
+
+
+def _atoms(pattern: str) -> List[FrozenSet[bytes]]:
+    return [frozenset(literal.encode() for literal in atom) for atom in required_literals(pattern)]
+
+
+def credential_patterns(seed_path: str = str(DEFAULT_SEED_PATH)) -> Dict[str, str]:
+    """
+    Credential-exposure regex indicators from the threat intel seed
+
+    Returns:
+        Pattern name ("<source id> <regex>") -> regex, matched case-insensitively
+    """
+    patterns: Dict[str, str] = {}
+    for threat in load_threat_intel(seed_path):
+        if threat.get("threat_type") != CREDENTIAL_THREAT_TYPE:
+            continue
+        for pattern in (threat.get("indicators") or {}).get("patterns", []):
+            patterns.setdefault(f"{threat.get('source_id')} {pattern}", pattern)
+    return patterns
+
+
+@lru_cache(maxsize=None)
+def _detectors(seed_path: str) -> Tuple[_Detector, ...]:
+    """Literal-gated detectors: api_key, email and the credential indicators"""
+    detectors = []
+    for name, pattern in REDACTION_PATTERNS.items():
+        if name in _DIGIT_PATTERNS:
+            continue
+        for part in _SPLIT_PATTERNS.get(name, (pattern,)):
+            atoms = _EXTRA_ATOMS.get(name) or _atoms(part)
+            detectors.append(_Detector(name, re.compile(part.encode()), atoms, REPLACEMENTS[name]))
+    for name, pattern in credential_patterns(seed_path).items():
+        detectors.append(_Detector(name, re.compile(pattern.encode(), re.IGNORECASE), _atoms(pattern),
+                                   CREDENTIAL_REPLACEMENT))
+    return tuple(detectors)
+
+
+def pattern_names(seed_path: str = str(DEFAULT_SEED_PATH)) -> List[str]:
+    """Every pattern the scanner reports, in report order"""
+    return list(REDACTION_PATTERNS) + list(credential_patterns(seed_path))
+
+
+class _ChunkScanner:
+    """Collects counts and samples for one chunk of log text"""
+
+    def __init__(self, data: bytes, base: int, max_samples: int):
+        self.data = data
+        self.base = base
+        self.max_samples = max_samples
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._lower = b""
+        self._counts: Dict[bytes, int] = {}  # literal -> occurrences in the chunk
+        self._lines: Dict[bytes, List[int]] = {}  # literal -> starts of lines containing it
+
+    def sample(self, name: str, replacement: str, start: int) -> None:
+        # Line numbers are filled in by _number_lines once the chunk is done
+        self.samples.setdefault(name, []).append((start, 0, self._excerpt(start, replacement)))
+
+    def _number_lines(self) -> None:
+        """Turn sample starts into (file offset, line in chunk) in one pass over the chunk"""
+        data, line_of, pos, line = self.data, {}, 0, 0
+        for start in sorted({start for found in self.samples.values() for start, _, _ in found}):
+            line += data.count(b"\n", pos, start)
+            line_of[start], pos = line, start
+        for found in self.samples.values():
+            found[:] = [(self.base + start, line_of[start], excerpt) for start, _, excerpt in found]
+
+    def _excerpt(self, start: int, replacement: str) -> str:
+        data = self.data
+        line_start = data.rfind(b"\n", 0, start) + 1
+        lo = max(line_start, start - _EXCERPT_CONTEXT)
+        if lo > line_start:
+            # Begin at a word so a cut-off secret is not left unredacted
+            lo = data.find(b" ", lo, start) + 1 or start
+        return redact(data[lo:start].decode("utf-8", "replace")) + replacement
+
+    def scan(self, detectors: Iterable[_Detector]) -> None:
+        data = self.data
+        if not data:
+            return
+        counts, limit = self.counts, self.max_samples
+        for m in _DIGIT_SCANNER.finditer(data.translate(_FOLD_DIGITS)):
+            name = m.lastgroup
+            n = counts[name] = counts.get(name, 0) + 1
+            if n <= limit:
+                self.sample(name, REPLACEMENTS[name], m.start())
+
+        self._lower = data.lower()
+        for detector in detectors:
+            for start in self._gated(detector):
+                n = counts[detector.name] = counts.get(detector.name, 0) + 1
+                if n <= limit:
+                    self.sample(detector.name, detector.replacement, start)
+        self._number_lines()
+
+    def _count(self, literal: bytes) -> int:
+        n = self._counts.get(literal)
+        if n is None:
+            n = self._counts[literal] = self._lower.count(literal)
+        return n
+
+    def _line_starts(self, literal: bytes) -> List[int]:
+        """Start offsets of the lines containing a literal (case-insensitively)"""
+        starts = self._lines.get(literal)
+        if starts is None:
+            data, lower = self.data, self._lower
+            starts = []
+            pos = lower.find(literal)
+            while pos >= 0:
+                line_start = data.rfind(b"\n", 0, pos) + 1
+                line_end = data.find(b"\n", pos)
+                starts.append(line_start)
+                if line_end < 0:
+                    break
+                pos = lower.find(literal, line_end)
+            self._lines[literal] = starts
+        return starts
+
+    def _gated(self, detector: _Detector) -> Iterator[int]:
+        """Start offsets of a detector's matches, searching only lines with its rarest literal"""
+        data, regex = self.data, detector.regex
+        rarest, fewest = None, None
+        for atom in detector.atoms:
+            n = sum(self._count(literal) for literal in atom)
+            if not n:
+                return
+            if fewest is None or n < fewest:
+                rarest, fewest = atom, n
+        if rarest is None or fewest * _DENSE_SPACING > len(data):
+            for m in regex.finditer(data):
+                yield m.start()
+            return
+
+        line_starts = set()
+        for literal in rarest:
+            line_starts.update(self._line_starts(literal))
+        for line_start in sorted(line_starts):
+            line_end = data.find(b"\n", line_start)
+            for m in regex.finditer(data, line_start, len(data) if line_end < 0 else line_end):
+                yield m.start()
+
+
+# --- Worker side -----------------------------------------------------------
+
+_SEED_PATH = str(DEFAULT_SEED_PATH)
+
+
+def _init_worker(seed_path: str) -> None:
+    global _SEED_PATH
+    _SEED_PATH = seed_path
+    _detectors(seed_path)
+
+
+def _scan_range(path: str, index: int, start: int, end: int, max_samples: int) -> _ChunkResult:
+    """Scan bytes [start, end) of a plain file"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    scanner = _ChunkScanner(data, start, max_samples)
+    scanner.scan(_detectors(_SEED_PATH))
+    return _ChunkResult(path, index, len(data), data.count(b"\n"), scanner.counts, scanner.samples)
+
+
+def _scan_gzip(path: str, chunk_size: int, max_samples: int) -> _ChunkResult:
+    """Stream a whole gzip file through the scanner, one line-aligned chunk at a time"""
+    detectors = _detectors(_SEED_PATH)
+    counts: Dict[str, int] = {}
+    samples: Dict[str, List[Tuple[int, int, str]]] = {}
+    offset = lines = 0
+    carry = b""
+    with gzip.open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            data = carry + block
+            if not data:
+                break
+            cut = data.rfind(b"\n") + 1 if block else len(data)
+            if not cut:
+                cut = len(data) if len(data) >= chunk_size else 0
+            if not cut:
+                carry = data
+                continue
+            data, carry = data[:cut], data[cut:]
+            scanner = _ChunkScanner(data, offset, max_samples)
+            scanner.scan(detectors)
+            for name, n in scanner.counts.items():
+                counts[name] = counts.get(name, 0) + n
+            for name, found in scanner.samples.items():
+                kept = samples.setdefault(name, [])
+                kept.extend((off, lines + line, excerpt) for off, line, excerpt in found[:max_samples - len(kept)])
+            offset += len(data)
+            lines += data.count(b"\n")
+    return _ChunkResult(path, 0, offset, lines, counts, samples)
+
+
+def _run_task(task: Tuple) -> _ChunkResult:
+    kind, args = task
+    return _scan_gzip(*args) if kind == "gzip" else _scan_range(*args)
+
+
+# --- Planning and aggregation ----------------------------------------------
+
+def is_gzip(path: str) -> bool:
+    """True if the file starts with the gzip magic number"""
+    with open(path, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+def iter_log_files(paths: Iterable[str]) -> Iterator[str]:
+    """Files named by paths, walking directories in sorted order"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                yield os.path.join(root, name)
+
+
+def line_chunks(path: str, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) byte ranges of a plain file, each ending after a newline or at EOF"""
+    size = os.path.getsize(path)
+    if not size:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = mm.find(b"\n", end)
+                end = size if newline < 0 else newline + 1
+            yield start, end
+            start = end
+
+
+def _tasks(files: Iterable[str], chunk_size: int, max_samples: int) -> Iterator[Tuple]:
+    for path in files:
+        if is_gzip(path):
+            yield "gzip", (path, chunk_size, max_samples)
+            continue
+        for index, (start, end) in enumerate(line_chunks(path, chunk_size)):
+            yield "range", (path, index, start, end, max_samples)
+
+
+class ScanReport:
+    """Counts and sample locations across every scanned file"""
+
+    def __init__(self, max_samples: int = DEFAULT_SAMPLES):
+        self.max_samples = max_samples
+        self.files: Dict[str, Dict[str, int]] = {}
+        self.bytes = 0
+        self.seconds = 0.0
+        self._newlines: Dict[str, Dict[int, int]] = {}
+        self._samples: Dict[str, Dict[str, List[Tuple[int, int, int, str]]]] = {}
+
+    def add_file(self, path: str) -> None:
+        self.files.setdefault(path, {})
+
+    def add(self, result: _ChunkResult) -> None:
+        """Merge the result of one chunk"""
+        counts = self.files.setdefault(result.path, {})
+        for name, n in result.counts.items():
+            counts[name] = counts.get(name, 0) + n
+        self.bytes += result.size
+        self._newlines.setdefault(result.path, {})[result.index] = result.newlines
+        file_samples = self._samples.setdefault(result.path, {})
+        for name, found in result.samples.items():
+            kept = file_samples.setdefault(name, [])
+            kept.extend((result.index, offset, line, excerpt) for offset, line, excerpt in found)
+            if len(kept) > self.max_samples:
+                kept.sort()
+                del kept[self.max_samples:]
+
+    def totals(self) -> Dict[str, int]:
+        """Pattern -> matches across all files"""
+        totals: Dict[str, int] = {}
+        for counts in self.files.values():
+            for name, n in counts.items():
+                totals[name] = totals.get(name, 0) + n
+        return totals
+
+    def samples(self, path: str) -> Dict[str, List[Sample]]:
+        """Pattern -> first sample locations in one file, with 1-based line numbers"""
+        newlines = self._newlines.get(path, {})
+        first_line, line = {}, 1
+        for index in sorted(newlines):
+            first_line[index] = line
+            line += newlines[index]
+        return {
+            name: [Sample(path, first_line[index] + local, offset, excerpt)
+                   for index, offset, local, excerpt in sorted(found)]
+            for name, found in self._samples.get(path, {}).items()
+        }
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "totals": self.totals(),
+            "files": [
+                {"path": path, "counts": counts,
+                 "samples": {name: [s._asdict() for s in found] for name, found in self.samples(path).items()}}
+                for path, counts in self.files.items()
+            ],
+        }
+
+
+def scan_logs(paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              max_samples: int = DEFAULT_SAMPLES, seed_path: str = str(DEFAULT_SEED_PATH)) -> ScanReport:
+    """
+    Scan log files and directories for secrets and PII
+
+    Args:
+        paths: Files or directories (walked recursively); gzip files are
+            recognised by content, whatever their name
+        workers: Worker processes (default: CPU count); 0 scans in-process
+        chunk_size: Bytes per chunk of a plain file, and per read of a
+            gzip file
+        max_samples: Sample locations kept per file and pattern
+        seed_path: Seed script with the credential-exposure indicators
+
+    Returns:
+        ScanReport
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    report = ScanReport(max_samples)
+    start = time.perf_counter()
+
+    def files() -> Iterator[str]:
+        for path in iter_log_files(paths):
+            report.add_file(path)
+            yield path
+
+    tasks = _tasks(files(), chunk_size, max_samples)
+    for result in bounded_process_map(_run_task, tasks, workers, _init_worker, (seed_path,)):
+        report.add(result)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def format_report(report: ScanReport) -> str:
+    """Plain-text summary: totals, then counts and samples per file"""
+    out = []
+    totals = report.totals()
+    width = max((len(name) for name in totals), default=0)
+    out.append("Totals:" if totals else "No matches")
+    for name, n in sorted(totals.items(), key=lambda item: -item[1]):
+        out.append(f"  {name:<{width}}  {n:,}")
+    for path, counts in report.files.items():
+        if not counts:
+            continue
+        out.append("")
+        out.append(path)
+        samples = report.samples(path)
+        for name, n in sorted(counts.items(), key=lambda item: -item[1]):
+            out.append(f"  {name:<{width}}  {n:,}")
+            for s in samples.get(name, []):
+                out.append(f"      line {s.line}: {s.excerpt}")
+    return "\n".join(out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scan log files for secrets and PII",
+                                     epilog="Exits with status 1 if anything is found.")
+    parser.add_argument("paths", nargs="+", help="Log files or directories (plain or gzip)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Bytes per worker task")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Sample locations per file and pattern")
+    parser.add_argument("--seed", default=str(DEFAULT_SEED_PATH), help="Seed script with the threat indicators")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"no such file or directory: {path}")
+    report = scan_logs(args.paths, args.workers, args.chunk_size, args.samples, args.seed)
+    if args.json:
+        json.dump(report.to_dict(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(format_report(report))
+    print(f"Scanned {len(report.files)} files / {report.bytes / 1e6:,.1f}MB in {report.seconds:.2f}s "
+          f"({report.mb_per_second:,.0f}MB/s)", file=sys.stderr)
+    return 1 if report.totals() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
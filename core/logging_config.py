@@ -1,56 +1,420 @@
 """
 Centralized logging configuration for AI Shield Auditor
+
+Two modes:
+
+- synchronous (default): structlog renders each event and the handlers
+  write it in the calling thread
+- asynchronous (``LOG_ASYNC=true``): the calling thread only runs the
+  cheap structlog processors and puts the event on a bounded queue. A
+  background listener renders events and writes them in batches. When the
+  queue is full, new events are dropped and counted instead of blocking
+  the caller.
+
+Both modes can rotate the log file by size and/or age, and can sample
+high-volume events (e.g. ``LOG_SAMPLE="Rate limit exceeded=0.1"`` keeps
+about one in ten).
 """
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
 import structlog
 from pathlib import Path
 
-def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> None:
+from .metrics import LOG_EVENTS_DROPPED
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 256
+
+_DROPPED_FULL = LOG_EVENTS_DROPPED.labels(reason="queue_full")
+_DROPPED_SAMPLED = LOG_EVENTS_DROPPED.labels(reason="sampled")
+
+# Active async pipeline, replaced when setup_logging is called with different settings
+_active: Optional["LogListener"] = None
+_active_handler: Optional["DroppingQueueHandler"] = None
+_active_config: Optional[tuple] = None
+_setup_lock = threading.Lock()
+
+
+def parse_sample_rates(spec: Optional[str]) -> Dict[str, float]:
+    """
+    Parse ``"event=rate,event=rate"`` into a mapping
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is outside 0..1
+    """
+    rates = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        event, sep, rate = item.rpartition("=")
+        if not sep or not event.strip():
+            raise ValueError(f"Invalid log sample entry: {item!r} (expected event=rate)")
+        value = float(rate)
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"Log sample rate must be between 0 and 1: {item!r}")
+        rates[event.strip()] = value
+    return rates
+
+
+class EventSampler:
+    """structlog processor that keeps only a fraction of selected events"""
+
+    def __init__(self, rates: Dict[str, float], seed: Optional[int] = None):
+        """
+        Args:
+            rates: Event name -> fraction kept (0 drops all, 1 keeps all)
+            seed: Random seed, for reproducible sampling
+        """
+        self.rates = dict(rates)
+        self._random = random.Random(seed)
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is not None and self._random.random() >= rate:
+            _DROPPED_SAMPLED.inc()
+            raise structlog.DropEvent
+        return event_dict
+
+
+def _capture_exc_info(logger, method_name: str, event_dict: dict) -> dict:
+    """Resolve ``exc_info=True`` in the calling thread, where the exception is current"""
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records that do not fit are dropped and counted"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # structlog events are rendered by the listener; only merge %-args of plain stdlib records
+        if not isinstance(record.msg, dict) and record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            _DROPPED_FULL.inc()
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """StreamHandler that writes a batch of records with one write and one flush"""
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        with self.lock:
+            try:
+                self.stream.write("".join(lines))
+                self.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+
+class RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler that rotates when the file reaches max_bytes or is older than interval seconds
+
+    Rotated files are renamed ``<name>.1`` .. ``<name>.<backup_count>`` like
+    the standard RotatingFileHandler.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, interval: float = 0, backup_count: int = 5,
+                 encoding: Optional[str] = "utf-8"):
+        """
+        Args:
+            filename: Log file path
+            max_bytes: Rotate before the file grows past this size (0 = never)
+            interval: Rotate when the current file is this many seconds old (0 = never)
+            backup_count: Rotated files kept
+            encoding: File encoding
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.interval = interval
+        self.rollover_at = self._next_rollover(time.time())
+
+    def _next_rollover(self, now: float) -> float:
+        return now + self.interval if self.interval > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = self._next_rollover(time.time())
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        """Write a batch, checking for rollover once per batch"""
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        with self.lock:
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                if time.time() >= self.rollover_at:
+                    self.doRollover()
+                # Write in runs that fit the current file, rolling over between runs
+                size, run = self.stream.tell(), []
+                for line in lines:
+                    length = len(line.encode(self.encoding or "utf-8"))
+                    if self.maxBytes > 0 and size and size + length > self.maxBytes:
+                        self.stream.write("".join(run))
+                        self.doRollover()
+                        size, run = 0, []
+                    run.append(line)
+                    size += length
+                self.stream.write("".join(run))
+                self.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+
+class LogListener:
+    """Background thread that drains the log queue and hands batches to the handlers"""
+
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler],
+                 batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = 0.2):
+        """
+        Args:
+            log_queue: Queue filled by DroppingQueueHandler
+            handlers: Handlers that render and write; ``emit_batch`` is used when available
+            batch_size: Most records taken from the queue per batch
+            flush_interval: Longest a record waits for its batch to fill, in seconds
+        """
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far, then stop"""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)  # blocking put: the sentinel must not be dropped
+        self._thread.join(timeout)
+        self._thread = None
+        for handler in self.handlers:
+            handler.close()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+            stop = batch[-1] is self._STOP
+            records = batch[:-1] if stop else batch
+            if records:
+                self._emit(records)
+            if stop:
+                return
+
+    def _emit(self, records: List[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            kept = [r for r in records if r.levelno >= handler.level]
+            if not kept:
+                continue
+            emit_batch = getattr(handler, "emit_batch", None)
+            if emit_batch is not None:
+                emit_batch(kept)
+            else:
+                for record in kept:
+                    handler.handle(record)
+
+
+def _stop_active() -> None:
+    global _active, _active_handler, _active_config
+    if _active_handler is not None:
+        logging.getLogger().removeHandler(_active_handler)
+    if _active is not None:
+        _active.stop()
+    _active = _active_handler = _active_config = None
+
+
+atexit.register(_stop_active)
+
+
+def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None, async_mode: Optional[bool] = None,
+                  queue_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                  max_bytes: Optional[int] = None, rotate_interval: Optional[float] = None,
+                  backup_count: int = 5, sample_rates: Optional[Dict[str, float]] = None) -> None:
     """
     Configure structured logging for the application
 
+    Safe to call repeatedly (Streamlit reruns the script on every
+    interaction): the async pipeline is only rebuilt when a setting changes.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        log_file: Optional path to log file
+        log_file: Optional path to log file (default: LOG_FILE)
+        async_mode: Render and write on a background thread (default: LOG_ASYNC)
+        queue_size: Events buffered in async mode before new ones are dropped
+        batch_size: Most events written per batch in async mode
+        max_bytes: Rotate the log file at this size (default: LOG_MAX_MB; 0 = never)
+        rotate_interval: Rotate the log file after this many seconds
+            (default: LOG_ROTATE_HOURS; 0 = never)
+        backup_count: Rotated log files kept
+        sample_rates: Event name -> fraction kept (default: LOG_SAMPLE)
+
+    Raises:
+        ValueError: If LOG_SAMPLE is malformed
     """
+    global _active, _active_handler, _active_config
 
     # Convert string level to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
+    log_file = log_file or os.getenv("LOG_FILE") or None
+    if async_mode is None:
+        async_mode = os.getenv("LOG_ASYNC", "false").strip().lower() in ("1", "true", "yes")
+    if max_bytes is None:
+        max_bytes = int(float(os.getenv("LOG_MAX_MB", "0")) * 1024 * 1024)
+    if rotate_interval is None:
+        rotate_interval = float(os.getenv("LOG_ROTATE_HOURS", "0")) * 3600
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("LOG_SAMPLE"))
+
+    config = (numeric_level, log_file, async_mode, queue_size, batch_size, max_bytes, rotate_interval,
+              backup_count, tuple(sorted(sample_rates.items())))
+    with _setup_lock:
+        if async_mode and config == _active_config:
+            return
+        _stop_active()
+
+        renderer = structlog.processors.JSONRenderer() if log_file else structlog.dev.ConsoleRenderer()
+        sampler = [EventSampler(sample_rates)] if sample_rates else []
+
+        def make_handlers() -> List[logging.Handler]:
+            handlers: List[logging.Handler] = [BatchStreamHandler(sys.stdout)]
+            if log_file:
+                # Ensure log directory exists
+                log_path = Path(log_file)
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                handlers.append(RotatingFileHandler(log_file, max_bytes=max_bytes, interval=rotate_interval,
+                                                    backup_count=backup_count))
+            return handlers
+
+        if not async_mode:
+            # Configure structlog
+            structlog.configure(
+                processors=[
+                    structlog.stdlib.filter_by_level,
+                    *sampler,
+                    structlog.stdlib.add_logger_name,
+                    structlog.stdlib.add_log_level,
+                    structlog.stdlib.PositionalArgumentsFormatter(),
+                    structlog.processors.TimeStamper(fmt="iso"),
+                    structlog.processors.StackInfoRenderer(),
+                    structlog.processors.format_exc_info,
+                    structlog.processors.UnicodeDecoder(),
+                    renderer,
+                ],
+                context_class=dict,
+                logger_factory=structlog.stdlib.LoggerFactory(),
+                cache_logger_on_first_use=True,
+            )
+            # Configure standard logging; a no-op once the root logger has handlers, like basicConfig
+            root = logging.getLogger()
+            if not root.handlers:
+                logging.basicConfig(
+                    format="%(message)s",
+                    level=numeric_level,
+                    handlers=make_handlers(),
+                )
+            return
+
+        # Async: cheap processors here, rendering in the listener thread
+        structlog.configure(
+            processors=[
+                structlog.stdlib.filter_by_level,
+                *sampler,
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.processors.StackInfoRenderer(),
+                _capture_exc_info,
+                structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            cache_logger_on_first_use=True,
+        )
+        formatter = structlog.stdlib.ProcessorFormatter(
+            processors=[
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.format_exc_info,
+                structlog.processors.UnicodeDecoder(),
+                renderer,
+            ],
+            foreign_pre_chain=[
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.processors.TimeStamper(fmt="iso"),
+            ],
+        )
+        handlers = make_handlers()
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        _active_handler = DroppingQueueHandler(log_queue)
+        root.addHandler(_active_handler)
+        root.setLevel(numeric_level)
+
+        _active = LogListener(log_queue, handlers, batch_size=batch_size)
+        _active.start()
+        _active_config = config
 
-    # Configure structlog
-    structlog.configure(
-        processors=[
-            structlog.stdlib.filter_by_level,
-            structlog.stdlib.add_logger_name,
-            structlog.stdlib.add_log_level,
-            structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if log_file else structlog.dev.ConsoleRenderer(),
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
-
-    # Configure standard logging
-    handlers = [logging.StreamHandler(sys.stdout)]
-
-    if log_file:
-        # Ensure log directory exists
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        handlers.append(logging.FileHandler(log_file))
-
-    logging.basicConfig(
-        format="%(message)s",
-        level=numeric_level,
-        handlers=handlers,
-    )
 
 def get_logger(name: str) -> structlog.BoundLogger:
     """
@@ -0,0 +1,468 @@
+"""
+Lightweight in-process metrics for AI Shield Auditor
+
+Counters, gauges and fixed-bucket histograms rendered in the Prometheus
+text exposition format. Counters and histograms accumulate into per-thread
+shards, so recording takes no lock; shards are summed when the registry is
+rendered. Metrics are exposed through a small local HTTP endpoint or dumped
+to a file for the node_exporter textfile collector.
+
+Usage::
+
+    with CATEGORY_SECONDS.labels(category="Identity & Access").time():
+        ...
+
+Set METRICS_PORT and/or METRICS_FILE to export from the app process.
+"""
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Standard library logger: core.logging_config imports this module
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-millisecond rule evaluation up to slow PDF renders
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _ThreadSentinel:
+    """Lives in a thread's locals; collected when the thread exits"""
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """
+    Per-thread accumulation cells, created on a thread's first write
+
+    When a thread exits, its cells are folded into a base row and dropped,
+    so short-lived threads do not leave shards behind.
+    """
+
+    def __init__(self, width: int):
+        self._width = width
+        self._local = threading.local()
+        self._base = [0.0] * width
+        self._shards: Dict[int, List[float]] = {}
+        # Reentrant: a thread's sentinel may be finalized by a collection
+        # that runs while this thread holds the lock
+        self._lock = threading.RLock()
+
+    def shard(self) -> List[float]:
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = [0.0] * self._width
+            with self._lock:
+                self._shards[id(cells)] = cells
+            self._local.cells = cells
+            self._local.sentinel = sentinel = _ThreadSentinel()
+            weakref.finalize(sentinel, self._retire, cells)
+            return cells
+
+    def _retire(self, cells: List[float]) -> None:
+        with self._lock:
+            if self._shards.pop(id(cells), None) is not None:
+                for i, v in enumerate(cells):
+                    self._base[i] += v
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            totals = list(self._base)
+            shards = list(self._shards.values())
+        for cells in shards:
+            for i, v in enumerate(cells):
+                totals[i] += v
+        return totals
+
+
+class CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Sharded(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._cells.shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class GaugeChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # one cell per bucket (+Inf last), then sum, then count
+        self._cells = _Sharded(len(bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cells = self._cells.shard()
+        cells[bisect_left(self._bounds, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """(cumulative bucket counts including +Inf, sum, count)"""
+        totals = self._cells.totals()
+        cumulative = []
+        running = 0.0
+        for c in totals[:-2]:
+            running += c
+            cumulative.append(running)
+        return cumulative, totals[-2], totals[-1]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation within its bucket
+
+        Same estimate as PromQL ``histogram_quantile``; None when empty.
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be between 0 and 1")
+        cumulative, _, count = self.snapshot()
+        if not count:
+            return None
+        rank = q * count
+        i = bisect_left(cumulative, rank)
+        if i >= len(self._bounds):
+            return self._bounds[-1]
+        lower = self._bounds[i - 1] if i else 0.0
+        below = cumulative[i - 1] if i else 0.0
+        in_bucket = cumulative[i] - below
+        return lower + (self._bounds[i] - lower) * ((rank - below) / in_bucket if in_bucket else 0.0)
+
+
+class _Metric(ABC):
+    TYPE = ""
+    SUFFIX = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._unlabelled = self.labels()
+
+    @abstractmethod
+    def _new_child(self):
+        """A child holding the values of one label combination"""
+
+    def labels(self, **labels: str):
+        """
+        Child metric for one combination of label values
+
+        Raises:
+            ValueError: If the label names do not match the metric's
+        """
+        try:
+            key = tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError:
+            key = None
+        if key is None or len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Exposition lines for every child"""
+
+    def render(self) -> str:
+        name = self.name + self.SUFFIX
+        lines = [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.TYPE}"]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._children.items())
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+    SUFFIX = "_total"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled.inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}_total{_format_labels(self.labelnames, k)} {_format_value(c.value)}"
+                for k, c in self._items()]
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._unlabelled.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._unlabelled.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._unlabelled.dec(amount)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(c.value)}"
+                for k, c in self._items()]
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        if not bounds:
+            raise ValueError("Histogram needs at least one finite bucket")
+        self.buckets = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._unlabelled.observe(value)
+
+    def time(self):
+        return self._unlabelled.time()
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in self._items():
+            cumulative, total, count = child.snapshot()
+            for bound, c in zip(self.buckets + (math.inf,), cumulative):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(c)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Add a metric
+
+        Raises:
+            ValueError: If a metric with the same name is already registered
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(m.render() for m in metrics)
+
+    def dump(self, path: str) -> None:
+        """Atomically write the rendered metrics to path"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = MetricsRegistry()
+
+AUDIT_SECONDS = REGISTRY.histogram(
+    "ai_shield_audit_duration_seconds", "Time to evaluate every category of one audit, LLM review excluded")
+CATEGORY_SECONDS = REGISTRY.histogram(
+    "ai_shield_category_evaluation_seconds", "Time to evaluate one audit category", ["category"])
+EXPORT_SECONDS = REGISTRY.histogram(
+    "ai_shield_export_duration_seconds", "Time to produce a report export, cache hits included", ["format"])
+PDF_RENDER_SECONDS = REGISTRY.histogram(
+    "ai_shield_pdf_render_duration_seconds", "Time to render one PDF report")
+RATE_LIMIT_CHECKS = REGISTRY.counter(
+    "ai_shield_rate_limit_checks", "Rate limiter decisions", ["result"])
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "ai_shield_llm_call_duration_seconds", "Time per LLM scoring call attempt", ["provider", "outcome"])
+LLM_REVIEW_SECONDS = REGISTRY.histogram(
+    "ai_shield_llm_review_duration_seconds", "Time for the LLM review of one audit's re-evaluated categories",
+    ["provider"])
+AUDITS_IN_PROGRESS = REGISTRY.gauge(
+    "ai_shield_audits_in_progress", "Audits currently being evaluated")
+LOG_EVENTS_DROPPED = REGISTRY.counter(
+    "ai_shield_log_events_dropped", "Log events not written: sampled out or async queue full", ["reason"])
+
+
+def start_http_server(port: int, addr: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+    """
+    Serve ``/metrics`` from a daemon thread
+
+    Args:
+        port: TCP port (0 picks a free one; see ``server.server_address``)
+        addr: Bind address; loopback by default
+        registry: Registry to expose
+
+    Returns:
+        The running ThreadingHTTPServer
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((addr, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_file_dump(path: str, interval: float = 15.0, registry: MetricsRegistry = REGISTRY) -> threading.Thread:
+    """Rewrite path with the rendered metrics every interval seconds from a daemon thread"""
+    def run():
+        while True:
+            try:
+                registry.dump(path)
+            except OSError:
+                pass
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+@lru_cache(maxsize=1)
+def start_exporters_from_env() -> Dict[str, str]:
+    """
+    Start the exporters configured in the environment, once per process
+
+    METRICS_PORT serves /metrics (bound to METRICS_ADDR, default 127.0.0.1);
+    METRICS_FILE is rewritten every METRICS_DUMP_INTERVAL seconds (default 15).
+
+    An exporter that fails to start (e.g. the port is in use) is logged and
+    reported as disabled; the result is cached either way, so reruns do not
+    retry it.
+
+    Returns:
+        Description of the exporters started
+    """
+    started = {}
+    port = os.getenv("METRICS_PORT")
+    if port:
+        try:
+            server = start_http_server(int(port), os.getenv("METRICS_ADDR", "127.0.0.1"))
+            started["http"] = "%s:%d" % server.server_address[:2]
+        except OSError as e:
+            logger.error("Metrics endpoint disabled, could not listen on port %s: %s", port, e)
+            started["http"] = "disabled"
+    path = os.getenv("METRICS_FILE")
+    if path:
+        start_file_dump(path, float(os.getenv("METRICS_DUMP_INTERVAL", "15")))
+        started["file"] = path
+    return started
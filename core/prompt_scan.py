@@ -0,0 +1,438 @@
+"""
+Incremental system-prompt scanner for AI Shield Auditor
+
+Walks directories of system prompts (``.md``, ``.txt`` and YAML/JSON
+prompt configs) and scans each file against the threat intelligence
+indicators with ``ThreatMatcher``, across a pool of worker processes.
+Each file gets a 0-10 score on the audit scale, so ``risk_from_score``
+applies. Each threat matched takes off a deduction for its severity.
+
+Three tiers choose the indicators:
+
+- ``quick``: prompt injection, credential exposure and prompt leakage
+- ``deep``: every threat type in the seed
+- ``enterprise``: deep plus custom rules from a JSON/YAML file
+
+Results are kept in a SQLite index keyed by content hash and ruleset
+version. A re-run only scans files whose content changed, or every file
+when the indicators or tier change. The index also remembers the size,
+mtime and hash of each path, so unchanged files are not even re-read.
+A fresh CI checkout has new mtimes: it rehashes every file but still
+reuses the results, so restoring the index file from the CI cache is
+enough.
+
+Usage:
+    python -m core.prompt_scan prompts/ --tier deep --fail-under 6.5
+    python -m core.prompt_scan prompts/ --tier enterprise --rules custom_rules.yml --json > scan.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .scoring import risk_from_score
+from .threat_intel import DEFAULT_SEED_PATH, load_threat_intel
+from .threat_matcher import ThreatMatch, ThreatMatcher
+from .utils import bounded_process_map, load_yaml
+
+# Bump when scanning or scoring changes, to invalidate every indexed result
+SCANNER_VERSION = 1
+
+TIERS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "quick": ("prompt_injection", "credential_exposure", "prompt_leakage"),
+    "deep": None,  # every threat type
+    "enterprise": None,  # every threat type plus custom rules
+}
+
+# Score deducted per matched threat, by threat-intel severity
+SEVERITY_DEDUCTIONS = {"critical": 4.0, "high": 2.5, "medium": 1.0, "low": 0.5}
+
+DEFAULT_EXTENSIONS = (".md", ".txt", ".yml", ".yaml", ".json")
+DEFAULT_INDEX_PATH = os.path.join(".cache", "prompt_scan.sqlite3")
+DEFAULT_CHUNK_SIZE = 64
+
+# Files modified this recently may change again within the same mtime tick,
+# so their stat fingerprint is not trusted and they are rehashed next run
+_RACY_SECONDS = 2.0
+
+
+class FileResult(NamedTuple):
+    """Scan result of one prompt file"""
+    path: str
+    content_hash: str
+    score: float
+    risk: str
+    findings: List[Dict[str, Any]]
+    cached: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+# --- Rule sets -------------------------------------------------------------
+
+def load_custom_rules(path: str) -> List[Dict[str, Any]]:
+    """
+    Load custom threat rules from a JSON or YAML file
+
+    The file holds a list of rows shaped like ``threat_intel`` rows (or a
+    mapping with a ``threats`` list): ``source_id``, ``title``,
+    ``severity``, ``threat_type`` and ``indicators`` with ``patterns``
+    and/or ``keywords``.
+
+    Raises:
+        ValueError: If the file does not contain valid rules
+    """
+    if path.endswith((".yml", ".yaml")):
+        data = load_yaml(path)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    rules = data.get("threats") if isinstance(data, dict) else data
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a list of rules")
+    for i, rule in enumerate(rules):
+        indicators = rule.get("indicators") if isinstance(rule, dict) else None
+        if not isinstance(indicators, dict) or not (indicators.get("patterns") or indicators.get("keywords")):
+            raise ValueError(f"{path}: rule {i} has no indicator patterns or keywords")
+        if not rule.get("source_id"):
+            raise ValueError(f"{path}: rule {i} has no source_id")
+    return [dict(rule, threat_type=rule.get("threat_type") or "custom") for rule in rules]
+
+
+def ruleset(tier: str = "deep", seed_path: str = str(DEFAULT_SEED_PATH),
+            custom_rules: Optional[Sequence[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Threat rows scanned for by a tier
+
+    Raises:
+        ValueError: If the tier is unknown, or custom rules are given for
+            a tier other than enterprise
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Unknown tier {tier!r}; expected one of {', '.join(TIERS)}")
+    if custom_rules and tier != "enterprise":
+        raise ValueError("Custom rules are only used by the enterprise tier")
+    threat_types = TIERS[tier]
+    threats = [t for t in load_threat_intel(seed_path)
+               if threat_types is None or t.get("threat_type") in threat_types]
+    return threats + list(custom_rules or [])
+
+
+def ruleset_version(threats: Iterable[Dict[str, Any]]) -> str:
+    """Short hash of everything in a rule set that affects scan results"""
+    canonical = json.dumps(
+        [SCANNER_VERSION] + [
+            [t.get("source_id"), t.get("title"), t.get("severity"), t.get("threat_type"),
+             t.get("indicators", {}).get("patterns", []), t.get("indicators", {}).get("keywords", [])]
+            for t in threats
+        ],
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+# --- Scanning --------------------------------------------------------------
+
+def score_matches(text: str, matches: Iterable[ThreatMatch]) -> Dict[str, Any]:
+    """
+    Summarize indicator hits as per-threat findings and a 0-10 score
+
+    Returns:
+        {"score", "risk", "findings"}; each finding carries the threat's
+        source id, title, type, severity, matched indicators and the line
+        of its first hit
+    """
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for m in matches:
+        finding = grouped.get(m.source_id)
+        if finding is None:
+            finding = grouped[m.source_id] = {
+                "source_id": m.source_id, "title": m.title, "threat_type": m.threat_type,
+                "severity": m.severity.lower(), "indicators": [], "line": text.count("\n", 0, m.start) + 1,
+            }
+        if m.indicator not in finding["indicators"]:
+            finding["indicators"].append(m.indicator)
+    findings = list(grouped.values())
+    deduction = sum(SEVERITY_DEDUCTIONS.get(f["severity"], SEVERITY_DEDUCTIONS["medium"]) for f in findings)
+    score = round(max(0.0, 10.0 - deduction), 1)
+    return {"score": score, "risk": risk_from_score(score), "findings": findings}
+
+
+def read_prompt(path: str) -> Tuple[str, bytes]:
+    """(sha256 hex digest, raw bytes) of a prompt file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    return hashlib.sha256(data).hexdigest(), data
+
+
+def scan_text(matcher: ThreatMatcher, data: bytes) -> Dict[str, Any]:
+    """Scan one prompt's raw bytes; YAML/JSON configs are scanned as text"""
+    text = data.decode("utf-8", "replace")
+    return score_matches(text, matcher.scan(text))
+
+
+_MATCHER: Optional[ThreatMatcher] = None
+
+
+def _init_worker(threats: List[Dict[str, Any]]) -> None:
+    global _MATCHER
+    _MATCHER = ThreatMatcher(threats)
+
+
+def _scan_chunk(chunk: List[Tuple[str, str, bytes]]) -> List[Tuple[str, str, Dict[str, Any]]]:
+    return [(path, content_hash, scan_text(_MATCHER, data)) for path, content_hash, data in chunk]
+
+
+def iter_prompt_files(paths: Iterable[str], extensions: Sequence[str] = DEFAULT_EXTENSIONS) -> Iterator[str]:
+    """Prompt files named by paths, walking directories in sorted order and skipping hidden ones"""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.lower().endswith(tuple(extensions)):
+                    yield os.path.join(root, name)
+
+
+# --- Result index ----------------------------------------------------------
+
+class PromptScanIndex:
+    """SQLite index of scan results by content hash and ruleset version"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, timeout: float = 30.0):
+        """
+        Args:
+            path: Database file; its directory is created if missing
+            timeout: Seconds to wait for the write lock (parallel CI jobs)
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, content_hash TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "content_hash TEXT NOT NULL, ruleset TEXT NOT NULL, result TEXT NOT NULL, scanned REAL NOT NULL, "
+            "PRIMARY KEY (content_hash, ruleset)) WITHOUT ROWID"
+        )
+
+    def content_hash(self, path: str, size: int, mtime_ns: int) -> Optional[str]:
+        """Hash recorded for a path, if its size and mtime are unchanged"""
+        row = self._conn.execute("SELECT size, mtime_ns, content_hash FROM files WHERE path = ?",
+                                 (path,)).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        return row[2]
+
+    def get(self, content_hash: str, version: str) -> Optional[Dict[str, Any]]:
+        """Indexed result for some content under a ruleset version"""
+        row = self._conn.execute("SELECT result FROM results WHERE content_hash = ? AND ruleset = ?",
+                                 (content_hash, version)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put_many(self, files: Iterable[Tuple[str, int, int, str]],
+                 results: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        """
+        Record stat fingerprints and results in one transaction
+
+        Args:
+            files: (path, size, mtime_ns, content hash) rows
+            results: (content hash, ruleset version, result) rows
+        """
+        now = time.time()
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                             files)
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (content_hash, ruleset, result, scanned) VALUES (?, ?, ?, ?)",
+                ((h, v, json.dumps(r, separators=(",", ":")), now) for h, v, r in results),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, keep_versions: Iterable[str]) -> int:
+        """Delete results of every other ruleset version; returns the rows removed"""
+        keep = list(keep_versions)
+        marks = ",".join("?" * len(keep)) or "''"
+        return self._conn.execute(f"DELETE FROM results WHERE ruleset NOT IN ({marks})", keep).rowcount
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "PromptScanIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# --- Driver ----------------------------------------------------------------
+
+def _plan(paths: Iterable[str], extensions: Sequence[str], index: Optional[PromptScanIndex], version: str,
+          stats: Dict[str, Tuple[int, int]], batch: int) -> Iterator[Any]:
+    """Indexed FileResults, and (path, content hash, data) for files that need scanning"""
+    refreshed: List[Tuple[str, int, int, str]] = []
+    cutoff = (time.time() - _RACY_SECONDS) * 1e9
+    for path in iter_prompt_files(paths, extensions):
+        st = os.stat(path)
+        stats[path] = (st.st_size, st.st_mtime_ns)
+        content_hash = data = result = None
+        if index is not None:
+            content_hash = index.content_hash(path, st.st_size, st.st_mtime_ns)
+        if content_hash is None:
+            content_hash, data = read_prompt(path)
+        if index is not None:
+            result = index.get(content_hash, version)
+        if result is None:
+            yield path, content_hash, data if data is not None else read_prompt(path)[1]
+            continue
+        if data is not None and st.st_mtime_ns < cutoff:
+            refreshed.append((path, st.st_size, st.st_mtime_ns, content_hash))
+            if len(refreshed) >= batch:
+                index.put_many(refreshed, [])
+                refreshed.clear()
+        yield FileResult(path, content_hash, result["score"], result["risk"], result["findings"], True)
+    if refreshed:
+        index.put_many(refreshed, [])
+
+
+def _batched(plan: Iterator[Any], size: int) -> Iterator[Any]:
+    """Pass FileResults through and group the files to scan into lists of size"""
+    chunk = []
+    for item in plan:
+        if isinstance(item, FileResult):
+            yield item
+            continue
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def scan_prompts(paths: Iterable[str], threats: List[Dict[str, Any]], index: Optional[PromptScanIndex] = None,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 extensions: Sequence[str] = DEFAULT_EXTENSIONS) -> Iterator[FileResult]:
+    """
+    Scan prompt files, reusing indexed results for unchanged content
+
+    Indexed results are yielded straight away and the others as worker
+    chunks finish, so output is not in path order. At most ``2 * workers``
+    chunks are in flight. New results are written to the index as each
+    chunk completes.
+
+    Args:
+        paths: Files or directories of prompts
+        threats: Rule set, see ``ruleset``
+        index: Result index (None scans every file)
+        workers: Worker processes (default: CPU count); 0 scans in-process
+        chunk_size: Files per worker task
+        extensions: File name suffixes picked up in directories
+
+    Returns:
+        Iterator of FileResult
+    """
+    version = ruleset_version(threats)
+    stats: Dict[str, Tuple[int, int]] = {}
+
+    def finish(done: List[Tuple[str, str, Dict[str, Any]]]) -> Iterator[FileResult]:
+        if index is not None:
+            cutoff = (time.time() - _RACY_SECONDS) * 1e9
+            index.put_many([(p, *stats[p], h) for p, h, _ in done if stats[p][1] < cutoff],
+                           [(h, version, r) for _, h, r in done])
+        for path, content_hash, result in done:
+            yield FileResult(path, content_hash, result["score"], result["risk"], result["findings"], False)
+
+    # Results already in the index skip the pool; they are passed on as
+    # soon as the pool hands back its next chunk
+    cached: List[FileResult] = []
+
+    def chunks() -> Iterator[List[Tuple[str, str, bytes]]]:
+        for item in _batched(_plan(paths, extensions, index, version, stats, chunk_size), chunk_size):
+            if isinstance(item, FileResult):
+                cached.append(item)
+            else:
+                yield item
+
+    for done in bounded_process_map(_scan_chunk, chunks(), workers, _init_worker, (threats,)):
+        yield from cached
+        cached.clear()
+        yield from finish(done)
+    yield from cached
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scan system prompt files against the threat intel indicators")
+    parser.add_argument("paths", nargs="+", help="Prompt files or directories")
+    parser.add_argument("--tier", choices=list(TIERS), default="deep", help="Indicator set to scan for")
+    parser.add_argument("--rules", default=None, help="Custom rules (JSON/YAML) for the enterprise tier")
+    parser.add_argument("--seed", default=str(DEFAULT_SEED_PATH), help="Seed script with the threat intel")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="Result index database")
+    parser.add_argument("--no-index", action="store_true", help="Scan every file and keep no index")
+    parser.add_argument("--prune", action="store_true",
+                        help="Drop indexed results of other tiers and rule set versions")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Files per worker task")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per file")
+    parser.add_argument("--fail-under", type=float, default=None,
+                        help="Exit with status 1 if any file scores below this")
+    args = parser.parse_args(argv)
+
+    for path in args.paths + ([args.rules] if args.rules else []):
+        if not os.path.exists(path):
+            parser.error(f"no such file or directory: {path}")
+    try:
+        threats = ruleset(args.tier, args.seed, load_custom_rules(args.rules) if args.rules else None)
+    except ValueError as e:
+        parser.error(str(e))
+
+    index = None if args.no_index else PromptScanIndex(args.index)
+    start = time.perf_counter()
+    results = []
+    try:
+        for result in scan_prompts(args.paths, threats, index, args.workers, args.chunk_size):
+            results.append(result)
+        if args.prune and index is not None:
+            index.prune([ruleset_version(threats)])
+    finally:
+        if index is not None:
+            index.close()
+    elapsed = time.perf_counter() - start
+
+    results.sort(key=lambda r: r.path)
+    for r in results:
+        if args.json:
+            print(json.dumps(r.to_dict()))
+        elif r.findings:
+            threats_hit = ", ".join(f"{f['source_id']} (line {f['line']})" for f in r.findings)
+            print(f"{r.score:4.1f} {r.risk:<6} {r.path}: {threats_hit}")
+    cached = sum(r.cached for r in results)
+    flagged = sum(bool(r.findings) for r in results)
+    print(f"Scanned {len(results)} prompt files ({cached} from the index, {len(results) - cached} scanned) "
+          f"in {elapsed:.2f}s; {flagged} with findings", file=sys.stderr)
+    if args.fail_under is not None and any(r.score < args.fail_under for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Rate limiting algorithms and storage backends for AI Shield Auditor
+
+Each algorithm keeps a fixed-size state tuple per key and updates it in
+O(1). Backends own the clock and make the read-modify-write atomic:
+
+- InMemoryBackend: per-process, monotonic clock, striped locks
+- SQLiteBackend: shared file, wall clock, so several replicas (or processes
+  on a shared volume) enforce one quota
+"""
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+State = Tuple[float, float, float]
+
+# step(state or None, now) -> (allowed, new_state)
+Step = Callable[[Optional[State], float], Tuple[bool, State]]
+
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+ALGORITHMS = (SLIDING_WINDOW, TOKEN_BUCKET)
+
+
+def sliding_window_step(limit: int, window: float) -> Step:
+    """
+    Sliding-window counter: the previous window's count is weighted by how
+    much of it still overlaps the trailing window.
+
+    State: (current window start, previous window count, current window count)
+    """
+
+    def step(state: Optional[State], now: float) -> Tuple[bool, State]:
+        if state is None:
+            start, previous, current = now, 0.0, 0.0
+        else:
+            start, previous, current = state
+            elapsed_windows = int((now - start) // window)
+            if elapsed_windows >= 1:
+                previous = current if elapsed_windows == 1 else 0.0
+                current = 0.0
+                start += elapsed_windows * window
+        overlap = 1.0 - (now - start) / window
+        if previous * overlap + current + 1 > limit:
+            return False, (start, previous, current)
+        return True, (start, previous, current + 1)
+
+    return step
+
+
+def token_bucket_step(limit: int, window: float) -> Step:
+    """
+    Token bucket holding up to ``limit`` tokens, refilled at limit/window per second.
+
+    State: (tokens, last refill time, unused)
+    """
+    rate = limit / window
+
+    def step(state: Optional[State], now: float) -> Tuple[bool, State]:
+        if state is None:
+            tokens = float(limit)
+        else:
+            tokens, last, _ = state
+            tokens = min(float(limit), tokens + max(0.0, now - last) * rate)
+        if tokens < 1.0:
+            return False, (tokens, now, 0.0)
+        return True, (tokens - 1.0, now, 0.0)
+
+    return step
+
+
+class RateLimitBackend(ABC):
+    """Atomic per-key state storage for rate limit algorithms"""
+
+    @abstractmethod
+    def apply(self, key: str, step: Step, idle_ttl: float) -> bool:
+        """
+        Atomically run ``step`` against the state stored for ``key``
+
+        Args:
+            key: Rate limit key
+            step: Algorithm step function
+            idle_ttl: Seconds after which this key, if untouched, is equivalent
+                to a fresh one and may be dropped; other keys keep their own ttl
+
+        Returns:
+            Whether the request is allowed
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Process-local backend with striped locks and idle-key expiry"""
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        # Per stripe: idle_ttl -> {key: (state, expires)}, least recently touched
+        # first. Keys sharing a ttl expire in touch order, so each queue is
+        # pruned from its head without affecting keys of other limiters.
+        self._states = [{} for _ in range(stripes)]
+        self.clock = time.monotonic
+
+    def apply(self, key: str, step: Step, idle_ttl: float) -> bool:
+        stripe = zlib.crc32(key.encode()) % len(self._locks)
+        queues = self._states[stripe]
+        with self._locks[stripe]:
+            now = self.clock()
+            states = queues.get(idle_ttl)
+            if states is None:
+                states = queues[idle_ttl] = OrderedDict()
+            entry = states.get(key)
+            allowed, state = step(entry[0] if entry else None, now)
+            states[key] = (state, now + idle_ttl)
+            states.move_to_end(key)
+            # Drop keys idle long enough to be indistinguishable from new ones
+            for states in queues.values():
+                while states:
+                    oldest_key, (_, expires) = next(iter(states.items()))
+                    if expires >= now:
+                        break
+                    del states[oldest_key]
+        return allowed
+
+    def __len__(self) -> int:
+        return sum(len(states) for queues in self._states for states in queues.values())
+
+
+class SQLiteBackend(RateLimitBackend):
+    """Backend shared through a SQLite file (one quota across processes/replicas)"""
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Args:
+            path: Database file, e.g. on a volume shared by all replicas
+            timeout: Seconds to wait for the write lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self.clock = time.time  # must be comparable across processes
+        self._local = threading.local()
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, a REAL NOT NULL, b REAL NOT NULL, c REAL NOT NULL, expires REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits(expires)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def apply(self, key: str, step: Step, idle_ttl: float) -> bool:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            row = conn.execute("SELECT a, b, c FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            allowed, state = step(tuple(row) if row else None, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (key, a, b, c, expires) VALUES (?, ?, ?, ?, ?)",
+                (key, *state, now + idle_ttl),
+            )
+            with self._calls_lock:
+                self._calls += 1
+                prune = self._calls % self.PRUNE_EVERY == 0
+            if prune:
+                # Each row carries its own limiter's expiry
+                conn.execute("DELETE FROM rate_limits WHERE expires < ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed
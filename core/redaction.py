@@ -0,0 +1,330 @@
+"""
+Redaction of sensitive information for AI Shield Auditor
+
+All patterns are matched by one combined scanner in a single pass over the
+text, with the same output as one ``re.sub`` pass per pattern in
+precedence order (API keys first). Lower-precedence alternatives carry
+lookahead guards so they never take text an earlier pattern would have
+redacted, and their trailing boundaries see a key that starts right after
+them the way the five-pass version saw its "[REDACTED_API_KEY]".
+Every alternative starts with "s"/"a" (keys), "@" (emails; the local part
+is found by walking back to the first word boundary of the token) or a
+digit, so the regex engine skips other text in its fast path.
+``redact_stream`` applies the same scanner chunk by chunk so arbitrarily
+large logs can be redacted in constant memory, including matches that
+straddle chunk boundaries.
+
+Usage:
+    python -m core.redaction conversations.log -o conversations.redacted.log
+"""
+import argparse
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Pattern name -> regex, in precedence order: each pattern only applies to
+# the text left between the matches of the ones before it
+REDACTION_PATTERNS: Dict[str, str] = {
+    "api_key": r"(?:sk-|api[_-]?key[_-]?)[a-zA-Z0-9]{20,}",
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "ip_address": r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
+    "credit_card": r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+}
+
+REPLACEMENTS: Dict[str, str] = {name: f"[REDACTED_{name.upper()}]" for name in REDACTION_PATTERNS}
+
+_DIGIT = re.compile(r"\d")
+
+# Building blocks of the combined scanner; scripts/bench_redaction.py checks
+# it against REDACTION_PATTERNS applied one after another
+_KEY = r"(?:sk-|api[_-]?key[_-]?)[a-zA-Z0-9]{20}"
+_NOT_KEY = rf"(?!{_KEY})"
+# Trailing \b as seen once a key starting here has been replaced
+_END = rf"(?:(?={_KEY})(?<=\w)|{_NOT_KEY}\b)"
+_DOMAIN = rf"(?:{_NOT_KEY}[A-Za-z0-9.-])+\.(?:{_NOT_KEY}[A-Z|a-z]){{2,}}{_END}"
+_EMAIL = rf"(?=[A-Za-z0-9._%+-]*+@)(?:{_NOT_KEY}[A-Za-z0-9._%+-])+@{_DOMAIN}"
+# No email covers the run of email characters starting here
+_NO_EMAIL = rf"(?!\b{_EMAIL})"
+
+# ASCII digit matches: checking for an email where each run of email
+# characters starts is enough
+_IP = rf"(?:[0-9]{{1,3}}\.){{3}}[0-9]{{1,3}}{_END}"
+_SEP = rf"(?:-|\s{_NO_EMAIL})?"
+_CARD = rf"[0-9]{{4}}{_SEP}[0-9]{{4}}{_SEP}[0-9]{{4}}{_SEP}[0-9]{{4}}{_END}"
+# Other \d digits are not email characters and split the runs, so every
+# character is checked; only tried when such a digit is present
+_D = rf"(?:{_NO_EMAIL}\d)"
+_SEP_ANY = rf"(?:{_NO_EMAIL}[\s-])?"
+_IP_ANY = rf"(?:{_D}{{1,3}}{_NO_EMAIL}\.){{3}}{_D}{{1,3}}{_END}"
+_CARD_ANY = rf"{_D}{{4}}{_SEP_ANY}{_D}{{4}}{_SEP_ANY}{_D}{{4}}{_SEP_ANY}{_D}{{4}}{_END}"
+_NO_CARD = rf"(?!\b(?:{_CARD}|{_CARD_ANY}))"
+_SSN = rf"[0-9]{{3}}-[0-9]{{2}}-{_NO_CARD}[0-9]{{4}}{_END}"
+_DS = rf"(?:{_NO_EMAIL}{_NO_CARD}\d)"
+_SSN_ANY = rf"{_DS}{{3}}{_NO_EMAIL}{_NO_CARD}-{_DS}{{2}}{_NO_EMAIL}{_NO_CARD}-{_DS}{{4}}{_END}"
+_DIGITS = (
+    rf"{_NO_EMAIL}(?:(?P<ip_address>{_IP})|(?P<credit_card>{_CARD})|(?P<ssn>{_SSN}))"
+    rf"|(?=[0-9\s.-]*+(?![0-9])\d)"
+    rf"(?:(?P<ip_address_any>{_IP_ANY})|(?P<credit_card_any>{_CARD_ANY})|(?P<ssn_any>{_SSN_ANY}))"
+)
+
+# One pass over the text: keys, the "@" of emails, digit matches at a word
+# boundary. Digit matches are captured by a lookahead from their first digit.
+_SCANNER = re.compile(
+    rf"[sa@\d](?:"
+    rf"(?:(?<=s)k-|(?<=a)pi[_-]?key[_-]?)[a-zA-Z0-9]{{20,}}(?P<api_key>)"
+    rf"|(?<=@){_DOMAIN}(?P<email>)"
+    rf"|(?<=\d)(?<!\w\d)(?<=(?=(?:{_DIGITS})).))"
+)
+# Right after a key, whose replacement is a non-word neighbour
+_AFTER_KEY = re.compile(rf"(?=\w)(?:(?P<email>{_EMAIL})|(?=\d)(?:{_DIGITS}))")
+
+_GROUP_PATTERN = {group: group.replace("_any", "") for group in _SCANNER.groupindex}
+
+_EMAIL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+_EMAIL_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+
+# Characters the unbounded patterns (api_key, email) are built from
+_TOKEN_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+|@-")
+
+# Text held back before anything still undecided (the trailing token, the end
+# of the buffer). A bounded match (at most 19 characters plus its \b) next to
+# it may still change, and in turn a later pattern's match next to that one
+# (IP -> credit card -> SSN), so this covers the chain with margin.
+_BOUNDED_LOOKAHEAD = 64
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+DEFAULT_MAX_CARRY = 1 << 16
+
+
+def _has_key_prefix(text: str, start: int = 0) -> bool:
+    return text.find("sk-", start) >= 0 or text.find("api", start) >= 0
+
+
+def _has_digit(text: str, start: int = 0) -> bool:
+    return _DIGIT.search(text, start) is not None
+
+
+def might_contain_sensitive(text: str) -> bool:
+    """Cheap prefilter: False means no redaction pattern can match"""
+    return "@" in text or _has_key_prefix(text) or _has_digit(text)
+
+
+def _email_start(text: str, at: int, floor: int, key_end: int) -> int:
+    """
+    Start of the email whose "@" is at ``at``, or ``at`` if there is none
+
+    The local part starts at the first word boundary of the run of email
+    characters before the "@", not before ``floor``. A key ending at
+    ``key_end`` has been replaced by a non-word neighbour.
+    """
+    first = at
+    while first > floor and text[first - 1] in _EMAIL_CHARS:
+        first -= 1
+    for p in range(first, at):
+        word = text[p] in _EMAIL_WORD_CHARS
+        if p == key_end:
+            left = False
+        else:
+            left = p > 0 and (text[p - 1].isalnum() or text[p - 1] == "_")
+        if word != left:
+            return p
+    return at
+
+
+def _spans(text: str, pos: int = 0, after: Optional[str] = None) -> List[Tuple[int, int, str]]:
+    """
+    (start, end, pattern name) of every redaction in text[pos:], in order
+
+    Same result as one ``re.sub`` pass per pattern in precedence order.
+
+    Args:
+        text: Text to scan
+        pos: Where to start; text[pos - 1] is the left neighbour
+        after: Pattern name of a redaction that ends at pos, if any
+    """
+    spans: List[Tuple[int, int, str]] = []
+    search = _SCANNER.search
+    key_end = pos if after == "api_key" else -1
+    floor = pos
+    while True:
+        m = _AFTER_KEY.match(text, pos) if pos == key_end else None
+        if m is not None:
+            name = m.lastgroup
+            start, end = m.span()
+        else:
+            m = search(text, pos)
+            if m is None:
+                return spans
+            name = m.lastgroup
+            start, end = m.start(), m.end(name)
+            if name == "email":
+                at = start
+                start = _email_start(text, at, floor, key_end)
+                if start == at:
+                    pos = at + 1
+                    continue
+        name = _GROUP_PATTERN[name]
+        spans.append((start, end, name))
+        pos = floor = end
+        key_end = end if name == "api_key" else -1
+
+
+def redact(text: str) -> str:
+    """
+    Redact sensitive information
+
+    The output is the same as applying the patterns one after another with
+    ``re.sub``: an API key is always redacted first, so text glued to it
+    can never absorb it. The text is scanned once for all patterns.
+
+    Args:
+        text: Text that may contain sensitive info
+
+    Returns:
+        Text with sensitive info redacted
+    """
+    if not text or not might_contain_sensitive(text):
+        return text
+    out: List[str] = []
+    last = 0
+    for start, end, name in _spans(text):
+        out.append(text[last:start])
+        out.append(REPLACEMENTS[name])
+        last = end
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
+
+
+def _redact_until(buf: str, pos: int, cut: int, max_carry: int, counts: Optional[Dict[str, int]],
+                  after: Optional[str] = None) -> Tuple[str, int, Optional[str]]:
+    """
+    Redact buf[pos:cut], pulling cut back before any match that crosses it
+
+    Returns:
+        (output, final cut, pattern name of the span ending at the cut or None)
+    """
+    out: List[str] = []
+    last = pos
+    last_name = after
+    if might_contain_sensitive(buf[pos:]):
+        hold_from = len(buf) - max_carry
+        for start, end, name in _spans(buf, pos, after):
+            if start >= cut:
+                break
+            if end > cut:
+                if start >= hold_from:
+                    # The match may still grow with the next chunk
+                    cut = start
+                    break
+                cut = end
+            out.append(buf[last:start])
+            out.append(REPLACEMENTS[name])
+            last, last_name = end, name
+            if counts is not None:
+                counts[name] = counts.get(name, 0) + 1
+    out.append(buf[last:cut])
+    return "".join(out), cut, last_name if last == cut else None
+
+
+def redact_stream(chunks: Iterable[str], max_carry: int = DEFAULT_MAX_CARRY,
+                  counts: Optional[Dict[str, int]] = None) -> Iterator[str]:
+    """
+    Redact a stream of text chunks
+
+    The output is identical to ``redact`` on the concatenated input, except
+    that a single unbroken token longer than ``max_carry`` may be split.
+
+    Args:
+        chunks: Iterable of text chunks (e.g. a file object or a generator)
+        max_carry: Most characters held back across chunk boundaries
+        counts: Optional dict updated with pattern name -> redactions made
+
+    Returns:
+        Iterator of redacted chunks
+    """
+    # Last character already handled and the redaction ending right there, if
+    # any, so every pass sees the same left neighbour as in ``redact``
+    context, after = "", None
+    carry = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf = context + carry + chunk
+        base = len(context)
+        n = len(buf)
+
+        # Hold back the trailing token (api keys / emails may continue) and
+        # enough characters for the fixed-length patterns to complete
+        floor = max(base, n - max_carry)
+        token_start = n
+        while token_start > floor and buf[token_start - 1] in _TOKEN_CHARS:
+            token_start -= 1
+        cut = max(base, token_start - _BOUNDED_LOOKAHEAD)
+
+        out, cut, after = _redact_until(buf, base, cut, max_carry, counts, after)
+        if out:
+            yield out
+        if cut > 0:
+            context = buf[cut - 1]
+        carry = buf[cut:]
+
+    buf = context + carry
+    out, _, _ = _redact_until(buf, len(context), len(buf), 0, counts, after)
+    if out:
+        yield out
+
+
+def iter_chunks(src: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Read a text stream in fixed-size chunks"""
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def redact_file(src: TextIO, dst: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Redact one text stream into another in constant memory
+
+    Args:
+        src: Readable text stream
+        dst: Writable text stream
+        chunk_size: Characters read per chunk
+
+    Returns:
+        Pattern name -> number of redactions
+    """
+    counts: Dict[str, int] = {}
+    for out in redact_stream(iter_chunks(src, chunk_size), counts=counts):
+        dst.write(out)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Redact secrets and PII from text or log files")
+    parser.add_argument("input", help="File to redact ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Destination ('-' for stdout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Characters per chunk")
+    args = parser.parse_args(argv)
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8", errors="surrogateescape", newline="")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", errors="surrogateescape", newline="")
+    try:
+        counts = redact_file(src, dst, args.chunk_size)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    summary = ", ".join(f"{name}={n}" for name, n in sorted(counts.items())) or "nothing"
+    print(f"Redacted: {summary}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Audit registry for AI Shield Auditor
+
+Parses the YAML templates and resolves the audit class for every section
+once per process. Parsed templates are cached by path and invalidated when
+the file's mtime or size changes, so edits to ``templates/`` are picked up
+without a restart while unchanged templates cost a single ``stat`` call.
+
+Section names map to modules and classes by convention:
+"Identity & Access" -> ``audits.identity_access.IdentityAccessAudit``.
+"""
+import importlib
+import os
+import threading
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from .utils import TEMPLATES_DIR, load_yaml
+
+DEFAULT_QUESTIONS_PATH = str(TEMPLATES_DIR / "questions.yml")
+DEFAULT_PROVIDERS_PATH = str(TEMPLATES_DIR / "providers.yml")
+
+# path -> ((mtime_ns, size), parsed contents)
+_TEMPLATES: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# questions path -> ((mtime_ns, size), registry)
+_REGISTRIES: Dict[str, Tuple[Tuple[int, int], "AuditRegistry"]] = {}
+_lock = threading.Lock()
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def templates_signature(*paths: str) -> Tuple[Tuple[int, int], ...]:
+    """(mtime_ns, size) of each file; differs whenever one of them is edited"""
+    return tuple(_signature(str(path)) for path in paths)
+
+
+def load_template(path: str) -> Dict[str, Any]:
+    """
+    Parse a YAML template, reusing the previous parse while the file is unchanged
+
+    The returned mapping is shared between callers and must not be modified.
+
+    Args:
+        path: Template path
+
+    Returns:
+        Parsed template contents
+    """
+    path = os.path.abspath(path)
+    sig = _signature(path)
+    cached = _TEMPLATES.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    data = load_yaml(path)
+    with _lock:
+        _TEMPLATES[path] = (sig, data)
+    return data
+
+
+def module_name(section: str) -> str:
+    """Audit module name for a section ("Identity & Access" -> "identity_access")"""
+    return section.lower().replace(" & ", "_").replace(" ", "_")
+
+
+def class_name(section: str) -> str:
+    """Audit class name for a section ("Identity & Access" -> "IdentityAccessAudit")"""
+    return "".join(w.capitalize() for w in module_name(section).split("_")) + "Audit"
+
+
+class AuditEntry(NamedTuple):
+    """A template section bound to its audit instance"""
+    section: str
+    audit: Any
+    questions: Tuple[str, ...]
+
+
+class AuditRegistry:
+    """Template sections in order, each resolved to an audit instance and its questions"""
+
+    def __init__(self, questions: Dict[str, Any]):
+        """
+        Resolve every section of a parsed questions template
+
+        Args:
+            questions: Parsed questions.yml contents
+
+        Raises:
+            ValueError: If a section has no matching audit module or class
+        """
+        entries = {}
+        for section, spec in (questions.get("sections") or {}).items():
+            try:
+                mod = importlib.import_module(f"audits.{module_name(section)}")
+                audit_cls = getattr(mod, class_name(section))
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"No audit class for section {section!r}: {e}") from e
+            entries[section] = AuditEntry(section, audit_cls(), tuple((spec or {}).get("questions") or ()))
+        self._entries = entries
+        self.sections: Tuple[str, ...] = tuple(entries)
+        self.total_questions = sum(len(e.questions) for e in entries.values())
+
+    def __getitem__(self, section: str) -> AuditEntry:
+        return self._entries[section]
+
+    def __contains__(self, section: str) -> bool:
+        return section in self._entries
+
+    def __iter__(self) -> Iterator[AuditEntry]:
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def audit(self, section: str) -> Any:
+        """Audit instance for a section"""
+        return self._entries[section].audit
+
+    def questions(self, section: str) -> Tuple[str, ...]:
+        """Question texts for a section, in template order"""
+        return self._entries[section].questions
+
+    def audits(self) -> Dict[str, Any]:
+        """Ordered mapping of section name -> audit instance"""
+        return {section: entry.audit for section, entry in self._entries.items()}
+
+
+def get_registry(questions_path: Optional[str] = None) -> AuditRegistry:
+    """
+    Return the registry for a questions template, rebuilding it only when the file changes
+
+    Args:
+        questions_path: Path to the questions template (default: templates/questions.yml)
+
+    Returns:
+        Shared AuditRegistry
+    """
+    path = os.path.abspath(questions_path or DEFAULT_QUESTIONS_PATH)
+    sig = _signature(path)
+    cached = _REGISTRIES.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    registry = AuditRegistry(load_template(path))
+    with _lock:
+        _REGISTRIES[path] = (sig, registry)
+    return registry
+
+
+def get_providers(providers_path: Optional[str] = None) -> Dict[str, Any]:
+    """Parsed providers template (default: templates/providers.yml)"""
+    return load_template(providers_path or DEFAULT_PROVIDERS_PATH)
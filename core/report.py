@@ -1,13 +1,74 @@
+import io
+import os
+from typing import BinaryIO, Dict, List, Optional
 
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 
+from .metrics import PDF_RENDER_SECONDS
 from .schema import AuditReport
 
-def generate_pdf(audit: AuditReport, pdf_path: str) -> str:
-    c = canvas.Canvas(pdf_path, pagesize=letter)
+# Font used by the finding / recommendation bullets
+BODY_FONT = "Helvetica"
+BODY_SIZE = 9
+
+# Per-font glyph and word widths in text-space units (1/1000 em), filled lazily
+_GLYPH_WIDTHS: Dict[str, Dict[str, float]] = {}
+_WORD_WIDTHS: Dict[str, Dict[str, float]] = {}
+_WORD_CACHE_MAX = 50_000
+
+
+def _text_units(text: str, widths: Dict[str, float], font_name: str) -> float:
+    """Width of text in 1/1000 em, measuring each distinct glyph only once"""
+    try:
+        return sum(map(widths.__getitem__, text))
+    except KeyError:
+        for ch in set(text).difference(widths):
+            widths[ch] = stringWidth(ch, font_name, 1000)
+        return sum(map(widths.__getitem__, text))
+
+
+def wrap_text(text: str, max_width: float, font_name: str = BODY_FONT, font_size: float = BODY_SIZE) -> List[str]:
+    """
+    Greedily wrap text into lines narrower than max_width
+
+    Each word is measured once and line widths are kept as running sums,
+    so wrapping is linear in the length of the text.
+    """
+    widths = _GLYPH_WIDTHS.setdefault(font_name, {})
+    word_widths = _WORD_WIDTHS.setdefault(font_name, {})
+    if len(word_widths) > _WORD_CACHE_MAX:
+        word_widths.clear()
+    space = _text_units(" ", widths, font_name)
+    limit = max_width * 1000.0 / font_size
+
+    lines = []
+    line: List[str] = []
+    line_units = 0.0
+    for word in text.split():
+        units = word_widths.get(word)
+        if units is None:
+            units = word_widths[word] = _text_units(word, widths, font_name)
+        candidate = line_units + space + units if line else units
+        if candidate < limit:
+            line.append(word)
+            line_units = candidate
+        else:
+            if line:
+                lines.append(" ".join(line))
+            line = [word]
+            line_units = units
+    if line:
+        lines.append(" ".join(line))
+    return lines
+
+
+def write_pdf(audit: AuditReport, stream: BinaryIO) -> int:
+    """Render the audit report as PDF into a writable binary stream and return its page count"""
+    c = canvas.Canvas(stream, pagesize=letter)
     width, height = letter
     margin = 0.75 * inch
 
@@ -43,13 +104,16 @@ def generate_pdf(audit: AuditReport, pdf_path: str) -> str:
         c.setFont("Helvetica-Oblique", 9)
         c.drawString(margin, y, "Key Findings:")
         y -= 12
-        c.setFont("Helvetica", 9)
+        c.setFont(BODY_FONT, BODY_SIZE)
         if not cat.findings:
             c.drawString(margin, y, "• None recorded")
             y -= 12
         else:
             for f in cat.findings[:6]:
                 text = f"• ({f.severity}) {f.text}"
+                refs = [source_id for source_id in f.threats if source_id not in f.text]
+                if refs:
+                    text += f" [{', '.join(refs)}]"
                 y = draw_wrapped(c, text, margin, y, width - 2*margin, 11)
                 if y < margin + 120:
                     c.showPage()
@@ -58,7 +122,7 @@ def generate_pdf(audit: AuditReport, pdf_path: str) -> str:
         c.setFont("Helvetica-Oblique", 9)
         c.drawString(margin, y, "Top Recommendations:")
         y -= 12
-        c.setFont("Helvetica", 9)
+        c.setFont(BODY_FONT, BODY_SIZE)
         if not cat.recommendations:
             c.drawString(margin, y, "• None recorded")
             y -= 12
@@ -71,23 +135,47 @@ def generate_pdf(audit: AuditReport, pdf_path: str) -> str:
                     y = height - margin
         y -= 8
 
+    pages = c.getPageNumber()
     c.showPage()
     c.save()
+    return pages
+
+
+def render_pdf(audit: AuditReport, copy_to: Optional[str] = None) -> bytes:
+    """
+    Render the audit report as PDF in memory
+
+    Args:
+        audit: Report to render
+        copy_to: Optional path to also save the PDF to
+
+    Returns:
+        PDF bytes
+    """
+    buffer = io.BytesIO()
+    with PDF_RENDER_SECONDS.time():
+        write_pdf(audit, buffer)
+    data = buffer.getvalue()
+    if copy_to:
+        save_copy(data, copy_to)
+    return data
+
+
+def save_copy(data: bytes, path: str) -> None:
+    """Write rendered bytes to path, creating its directory"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def generate_pdf(audit: AuditReport, pdf_path: str) -> str:
+    """Render the audit report to a PDF file and return its path"""
+    render_pdf(audit, copy_to=pdf_path)
     return pdf_path
 
-def draw_wrapped(c, text, x, y, max_width, leading):
-    from reportlab.pdfbase.pdfmetrics import stringWidth
-    words = text.split()
-    line = ""
-    for w in words:
-        test = (line + " " + w).strip()
-        if stringWidth(test, "Helvetica", 9) < max_width:
-            line = test
-        else:
-            c.drawString(x, y, line)
-            y -= leading
-            line = w
-    if line:
+
+def draw_wrapped(c, text, x, y, max_width, leading, font_name=BODY_FONT, font_size=BODY_SIZE):
+    for line in wrap_text(text, max_width, font_name, font_size):
         c.drawString(x, y, line)
         y -= leading
     return y
@@ -0,0 +1,232 @@
+"""
+Declarative audit rule engine for AI Shield Auditor
+
+Rules live in ``templates/rules.yml`` and are compiled once into a
+per-section dispatch table keyed by question text and question id, so an
+evaluation is a dictionary lookup per answer with no string scanning.
+The shared engine is recompiled when the templates change on disk.
+"""
+import time
+from typing import Dict, Any, List, Tuple, Optional
+
+from .compact import CompactCategory
+from .metrics import CATEGORY_SECONDS
+from .registry import templates_signature
+from .schema import CategoryResult, Finding, Recommendation
+from .scoring import ANSWER_VALUES, normalize_answer, risk_from_score
+from .utils import TEMPLATES_DIR, load_yaml
+
+DEFAULT_RULES_PATH = TEMPLATES_DIR / "rules.yml"
+DEFAULT_QUESTIONS_PATH = TEMPLATES_DIR / "questions.yml"
+
+SEVERITIES = ("Low", "Medium", "High")
+
+# Spellings accepted in rule predicates (YAML also parses bare Yes/No as booleans)
+_PREDICATE_ANSWERS = {"yes": "Yes", "no": "No", "unknown": "Unknown", True: "Yes", False: "No"}
+
+# (finding (text, severity, evidence), recommendation (text, effort)) emitted when a rule fires
+Action = Tuple[Optional[Tuple[str, str, Optional[str]]], Optional[Tuple[str, str]]]
+
+
+class CompiledQuestion:
+    """A question with its score weight and answer -> actions table"""
+    __slots__ = ("qid", "text", "weight", "actions")
+
+    def __init__(self, qid: str, text: str, weight: float, actions: Dict[str, Tuple[Action, ...]]):
+        self.qid = qid
+        self.text = text
+        self.weight = weight
+        self.actions = actions
+
+
+def _compile_question(section: str, qid: str, spec: Dict[str, Any]) -> CompiledQuestion:
+    actions: Dict[str, List[Action]] = {answer: [] for answer in ANSWER_VALUES}
+    for rule in spec.get("rules") or []:
+        finding = rule.get("finding")
+        recommendation = rule.get("recommendation")
+        if finding and finding.get("severity", "Medium") not in SEVERITIES:
+            raise ValueError(f"{section}/{qid}: invalid severity {finding.get('severity')!r}")
+        # Normalized once here so both result builders skip per-evaluation defaults
+        if finding:
+            finding = (finding["text"], finding.get("severity", "Medium"), finding.get("evidence"))
+        if recommendation:
+            recommendation = (recommendation["text"], recommendation.get("effort", "Medium"))
+        for answer in rule.get("when") or []:
+            key = answer if isinstance(answer, bool) else str(answer).strip().lower()
+            canonical = _PREDICATE_ANSWERS.get(key)
+            if canonical is None:
+                raise ValueError(f"{section}/{qid}: invalid answer predicate {answer!r}")
+            actions[canonical].append((finding, recommendation))
+
+    weight = float(spec.get("weight", 1.0))
+    if weight < 0:
+        raise ValueError(f"{section}/{qid}: weight must be non-negative")
+    return CompiledQuestion(qid, spec["text"], weight, {a: tuple(v) for a, v in actions.items() if v})
+
+
+class RuleEngine:
+    """Evaluates answer sets against compiled audit rules"""
+
+    def __init__(self, rules: Dict[str, Any], questions: Optional[Dict[str, Any]] = None):
+        """
+        Compile rule definitions
+
+        Args:
+            rules: Parsed rules.yml contents
+            questions: Parsed questions.yml contents; when given, every rule
+                must reference a question that exists in the same section
+
+        Raises:
+            ValueError: If the rules are malformed or out of sync with questions
+        """
+        self._dispatch: Dict[str, Dict[str, CompiledQuestion]] = {}
+        self._questions: Dict[str, Tuple[str, ...]] = {}
+
+        template = (questions or {}).get("sections", {})
+        for section, section_spec in (rules.get("sections") or {}).items():
+            table: Dict[str, CompiledQuestion] = {}
+            known = set(template.get(section, {}).get("questions", [])) if questions else None
+            for qid, spec in (section_spec.get("questions") or {}).items():
+                compiled = _compile_question(section, qid, spec)
+                if known is not None and compiled.text not in known:
+                    raise ValueError(f"{section}/{qid}: question text not found in questions template")
+                table[compiled.text] = compiled
+                table[qid] = compiled
+            self._dispatch[section] = table
+            self._questions[section] = tuple(q.text for q in dict.fromkeys(table.values()))
+
+        for section, spec in template.items():
+            self._dispatch.setdefault(section, {})
+            self._questions[section] = tuple(spec.get("questions", []))
+
+    @classmethod
+    def from_files(cls, rules_path=DEFAULT_RULES_PATH, questions_path=DEFAULT_QUESTIONS_PATH) -> "RuleEngine":
+        """Load and compile rules, validating them against the questions template"""
+        return cls(load_yaml(str(rules_path)), load_yaml(str(questions_path)) if questions_path else None)
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self._dispatch)
+
+    def questions(self, section: str) -> Tuple[str, ...]:
+        """Question texts for a section, in template order"""
+        return self._questions.get(section, ())
+
+    def weights(self, section: str) -> Dict[str, float]:
+        """Question text -> score weight for a section"""
+        return {text: q.weight for text, q in self._dispatch.get(section, {}).items() if text == q.text}
+
+    def _evaluate(self, section: str, answers: Dict[str, str]) -> Tuple[float, List[Tuple], List[Tuple]]:
+        table = self._dispatch.get(section)
+        if table is None:
+            raise ValueError(f"Unknown audit section: {section}")
+
+        findings = []
+        recs = []
+        total = 0.0
+        weight_sum = 0.0
+        for question, raw in answers.items():
+            answer = normalize_answer(raw)
+            compiled = table.get(question)
+            weight = compiled.weight if compiled is not None else 1.0
+            total += ANSWER_VALUES[answer] * weight
+            weight_sum += weight
+            if compiled is None:
+                continue
+            for finding, recommendation in compiled.actions.get(answer, ()):
+                if finding:
+                    findings.append(finding)
+                if recommendation:
+                    recs.append(recommendation)
+
+        score = round((total / weight_sum) * 10.0, 2) if weight_sum else 5.0
+        return score, findings, recs
+
+    def evaluate(self, section: str, answers: Dict[str, str]) -> CategoryResult:
+        """
+        Score a section and collect the findings its rules produce
+
+        Args:
+            section: Section name (e.g. "Identity & Access")
+            answers: Question text or question id -> raw answer
+
+        Returns:
+            CategoryResult for the section
+
+        Raises:
+            ValueError: If the section is unknown
+        """
+        score, findings, recs = self._evaluate(section, answers)
+        return CategoryResult(
+            category=section,
+            score=score,
+            risk_level=risk_from_score(score),
+            questions=list(answers.keys()),
+            answers=answers,
+            findings=[Finding(text=t, severity=s, evidence=e) for t, s, e in findings],
+            recommendations=[Recommendation(text=t, effort=e) for t, e in recs],
+        )
+
+    def evaluate_compact(self, section: str, answers: Dict[str, str]) -> CompactCategory:
+        """Same as ``evaluate``, built as an unvalidated CompactCategory for bulk paths"""
+        score, findings, recs = self._evaluate(section, answers)
+        return CompactCategory.build(section, score, risk_from_score(score), answers, findings, recs)
+
+
+# Seconds between checks of the templates on disk; evaluation is hot
+# enough in bulk runs that a stat per call shows up
+RELOAD_CHECK_INTERVAL = 1.0
+
+# ((rules, questions) signature, engine compiled from them)
+_ENGINE: Optional[Tuple[Tuple[Tuple[int, int], ...], "RuleEngine"]] = None
+_checked = 0.0
+
+
+def _current_engine() -> Tuple[Tuple[Tuple[int, int], ...], "RuleEngine"]:
+    global _ENGINE, _checked
+    now = time.monotonic()
+    cached = _ENGINE
+    if cached is not None and now - _checked < RELOAD_CHECK_INTERVAL:
+        return cached
+    sig = templates_signature(DEFAULT_RULES_PATH, DEFAULT_QUESTIONS_PATH)
+    if cached is None or cached[0] != sig:
+        cached = _ENGINE = (sig, RuleEngine.from_files())
+    _checked = now
+    return cached
+
+
+def get_rule_engine() -> RuleEngine:
+    """
+    Return the process-wide engine compiled from the default templates
+
+    Like the audit registry, the engine is recompiled when rules.yml or
+    questions.yml changes (mtime or size); the files are checked at most
+    every RELOAD_CHECK_INTERVAL seconds.
+    """
+    return _current_engine()[1]
+
+
+def rules_signature() -> Tuple[Tuple[int, int], ...]:
+    """Signature of the templates the current engine was compiled from"""
+    return _current_engine()[0]
+
+
+def evaluate(section: str, answers: Dict[str, str]) -> CategoryResult:
+    """Evaluate one section with the default rule engine"""
+    return get_rule_engine().evaluate(section, answers)
+
+
+class RuleBasedAudit:
+    """Base class for audit categories backed by the rule engine"""
+    NAME = ""
+
+    def questions(self) -> List[str]:
+        return list(get_rule_engine().questions(self.NAME))
+
+    def evaluate(self, answers: Dict[str, str]) -> CategoryResult:
+        with CATEGORY_SECONDS.labels(category=self.NAME).time():
+            return evaluate(self.NAME, answers)
+
+    def evaluate_compact(self, answers: Dict[str, str]) -> CompactCategory:
+        with CATEGORY_SECONDS.labels(category=self.NAME).time():
+            return get_rule_engine().evaluate_compact(self.NAME, answers)
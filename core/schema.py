@@ -1,12 +1,21 @@
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+def overall_risk_for(score: float) -> str:
+    """Map an overall score to the report-level risk"""
+    if score >= 8.5:
+        return "Low"
+    if score >= 6.5:
+        return "Moderate"
+    return "High"
+
 class Finding(BaseModel):
     text: str
     severity: str = Field(default="Medium")  # Low, Medium, High
     evidence: Optional[str] = None
+    threats: List[str] = Field(default_factory=list)  # threat-intel source ids, see core.threat_index
 
 class Recommendation(BaseModel):
     text: str
@@ -39,17 +48,19 @@ class AuditReport(BaseModel):
         return round(sum(c.score for c in self.audit_categories) / len(self.audit_categories), 2)
 
     def overall_risk(self) -> str:
-        # Map overall score to risk
-        s = self.overall_score()
-        if s >= 8.5:
-            return "Low"
-        if s >= 6.5:
-            return "Moderate"
-        return "High"
+        return overall_risk_for(self.overall_score())
 
     def meta(self) -> Dict[str, str]:
+        score = self.overall_score()
         return {
             "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-            "overall_score": str(self.overall_score()),
-            "overall_risk": self.overall_risk(),
+            "overall_score": str(score),
+            "overall_risk": overall_risk_for(score),
         }
+
+    def export_payload(self) -> Dict[str, Any]:
+        # JSON export: the dump with the computed overall score/risk in the summary
+        payload = self.model_dump()
+        payload["summary"]["overall_score"] = self.overall_score()
+        payload["summary"]["overall_risk"] = self.overall_risk()
+        return payload
@@ -1,5 +1,13 @@
+from typing import Dict, Tuple, Optional
 
-from typing import Dict, Tuple
+YES_VALUES = ("yes", "y", "true", "enabled")
+NO_VALUES = ("no", "n", "false", "disabled")
+
+# Score contribution of each normalized answer
+ANSWER_VALUES = {"Yes": 1.0, "No": 0.0, "Unknown": 0.5}
+
+# Raw answers seen in practice, resolved without string normalization
+_CANONICAL = {"Yes": "Yes", "No": "No", "Unknown": "Unknown"}
 
 def risk_from_score(score: float) -> str:
     if score >= 8.5:
@@ -8,20 +16,31 @@ def risk_from_score(score: float) -> str:
         return "Medium"
     return "High"
 
-def score_yes_no_answers(answers: Dict[str, str]) -> float:
-    """Simple scoring: Yes = 1, No = 0, Unknown = 0.5; average * 10."""
+def normalize_answer(value: Optional[str]) -> str:
+    """Map a raw answer onto Yes / No / Unknown."""
+    canonical = _CANONICAL.get(value)
+    if canonical is not None:
+        return canonical
+    v = (value or "").strip().lower()
+    if v in YES_VALUES:
+        return "Yes"
+    if v in NO_VALUES:
+        return "No"
+    return "Unknown"
+
+def score_yes_no_answers(answers: Dict[str, str], weights: Optional[Dict[str, float]] = None) -> float:
+    """Simple scoring: Yes = 1, No = 0, Unknown = 0.5; (weighted) average * 10."""
     if not answers:
         return 5.0
     total = 0.0
-    for v in answers.values():
-        v = (v or "").strip().lower()
-        if v in ("yes", "y", "true", "enabled"):
-            total += 1.0
-        elif v in ("no", "n", "false", "disabled"):
-            total += 0.0
-        else:
-            total += 0.5
-    return round((total / len(answers)) * 10.0, 2)
+    weight_sum = 0.0
+    for q, v in answers.items():
+        w = weights.get(q, 1.0) if weights else 1.0
+        total += ANSWER_VALUES[normalize_answer(v)] * w
+        weight_sum += w
+    if not weight_sum:
+        return 5.0
+    return round((total / weight_sum) * 10.0, 2)
 
 def merge_text_blocks(items):
     return [i for i in items if i]
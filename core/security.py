@@ -3,18 +3,77 @@ Security utilities for AI Shield Auditor
 """
 import re
 import hashlib
-from typing import Dict, Any, List
-from functools import lru_cache
-from datetime import datetime, timedelta
-from cachetools import TTLCache
+from typing import Dict, Iterable, List, Optional
 
-# Rate limiting cache (IP -> request times)
-_rate_limit_cache = TTLCache(maxsize=1000, ttl=60)
+from .metrics import RATE_LIMIT_CHECKS
+from .redaction import redact
+from .rate_limit import (
+    ALGORITHMS, SLIDING_WINDOW, TOKEN_BUCKET, RateLimitBackend, InMemoryBackend,
+    sliding_window_step, token_bucket_step,
+)
 
 # Input validation patterns
 SAFE_INPUT_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_.,!?()[\]{}:;"\'/\n\r]+$')
 MAX_INPUT_LENGTH = 100000  # 100KB max input
 
+# Sanitizer rules, precompiled and arranged so the work stays linear in the
+# input length whatever the input
+_SCRIPT_OPEN = re.compile(r'<script', re.IGNORECASE)
+_SCRIPT_CLOSE = re.compile(r'</script>', re.IGNORECASE)
+_JAVASCRIPT_PROTOCOL = re.compile(r'javascript:', re.IGNORECASE)
+# Case-insensitive "on" spelled as classes so the scan can skip ahead to
+# candidates; '=' is optional so an attempt never backtracks (see
+# _strip_event_handlers)
+_HANDLER_CANDIDATE = re.compile(r'[oO][nN]\w+\s*(=)?')
+
+
+def _strip_script_blocks(text: str) -> str:
+    """
+    Remove ``<script[^>]*>.*?</script>`` (case-insensitive) in one pass
+
+    A block runs from ``<script`` to the first '>' after it and then to the
+    first ``</script>`` after that. If the earliest ``<script`` has no such
+    '>' or closing tag, no later one can either, so the scan stops.
+    """
+    pieces = []
+    pos = 0
+    while True:
+        opening = _SCRIPT_OPEN.search(text, pos)
+        if opening is None:
+            break
+        tag_end = text.find('>', opening.end())
+        if tag_end < 0:
+            break
+        closing = _SCRIPT_CLOSE.search(text, tag_end + 1)
+        if closing is None:
+            break
+        pieces.append(text[pos:opening.start()])
+        pos = closing.end()
+    if not pieces:
+        return text
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+
+def _strip_event_handlers(text: str) -> str:
+    """
+    Remove ``on\\w+\\s*=`` (case-insensitive) in one pass
+
+    When a candidate has no '=', no later "on" inside the same word can
+    match either, so scanning resumes after the word (where finditer
+    continues anyway) instead of retrying from each of its characters.
+    """
+    pieces = []
+    last = 0
+    for candidate in _HANDLER_CANDIDATE.finditer(text):
+        if candidate.group(1):
+            pieces.append(text[last:candidate.start()])
+            last = candidate.end()
+    if not pieces:
+        return text
+    pieces.append(text[last:])
+    return ''.join(pieces)
+
 
 class SecurityValidator:
     """Validates and sanitizes user inputs"""
@@ -24,6 +83,8 @@ class SecurityValidator:
         """
         Sanitize user input to prevent injection attacks
 
+        Runs in time linear in the input length, including adversarial input.
+
         Args:
             text: Input text to sanitize
             max_length: Maximum allowed length
@@ -44,18 +105,35 @@ class SecurityValidator:
         # Basic sanitization - remove null bytes and control characters
         sanitized = text.replace('\x00', '')
 
-        # Remove potentially dangerous patterns
-        dangerous_patterns = [
-            r'<script[^>]*>.*?</script>',  # Script tags
-            r'javascript:',  # JavaScript protocol
-            r'on\w+\s*=',  # Event handlers
-        ]
-
-        for pattern in dangerous_patterns:
-            sanitized = re.sub(pattern, '', sanitized, flags=re.IGNORECASE | re.DOTALL)
+        # Remove potentially dangerous patterns; each rule needs a literal
+        # character that is cheap to look for first
+        if '<' in sanitized:
+            sanitized = _strip_script_blocks(sanitized)  # <script ...>...</script>
+        if ':' in sanitized:
+            sanitized = _JAVASCRIPT_PROTOCOL.sub('', sanitized)  # javascript:
+        if '=' in sanitized:
+            sanitized = _strip_event_handlers(sanitized)  # on<word> =
 
         return sanitized.strip()
 
+    @staticmethod
+    def sanitize_many(texts: Iterable[str], max_length: int = MAX_INPUT_LENGTH) -> List[str]:
+        """
+        Sanitize a batch of inputs (e.g. every free-text field of a form)
+
+        Args:
+            texts: Input texts to sanitize
+            max_length: Maximum allowed length of each input
+
+        Returns:
+            Sanitized texts, in input order
+
+        Raises:
+            ValueError: If any input is invalid
+        """
+        sanitize = SecurityValidator.sanitize_input
+        return [sanitize(text, max_length) for text in texts]
+
     @staticmethod
     def validate_api_key(api_key: str) -> bool:
         """
@@ -94,19 +172,48 @@ class SecurityValidator:
         return hashlib.sha256(data.encode()).hexdigest()
 
 
+_ALLOWED = RATE_LIMIT_CHECKS.labels(result="allowed")
+_REJECTED = RATE_LIMIT_CHECKS.labels(result="rejected")
+
+# Default state store for every RateLimiter in the process; keys are prefixed
+# per limiter settings, so limiters share it without colliding
+_DEFAULT_BACKEND = InMemoryBackend()
+
+
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """Thread-safe rate limiter with O(1) checks and a pluggable backend"""
 
-    def __init__(self, max_requests: int = 100, window_seconds: int = 60):
+    def __init__(self, max_requests: int = 100, window_seconds: int = 60,
+                 algorithm: str = SLIDING_WINDOW, backend: Optional[RateLimitBackend] = None):
         """
         Initialize rate limiter
 
         Args:
-            max_requests: Maximum requests allowed in window
-            window_seconds: Time window in seconds
+            max_requests: Maximum requests allowed in window (bucket size for token_bucket)
+            window_seconds: Time window in seconds (time to refill the bucket for token_bucket)
+            algorithm: "sliding_window" (weighted two-window counter) or "token_bucket"
+            backend: State storage; defaults to one in-process backend shared by
+                every limiter, so limiters rebuilt on a Streamlit rerun keep state.
+                Use core.rate_limit.SQLiteBackend to share one quota across replicas.
+
+        Raises:
+            ValueError: If the algorithm or limits are invalid
         """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        if max_requests < 1 or window_seconds <= 0:
+            raise ValueError("max_requests and window_seconds must be positive")
+
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.algorithm = algorithm
+        self.backend = backend if backend is not None else _DEFAULT_BACKEND
+
+        factory = token_bucket_step if algorithm == TOKEN_BUCKET else sliding_window_step
+        self._step = factory(max_requests, float(window_seconds))
+        self._idle_ttl = 2.0 * window_seconds
+        # Limiters with different settings can share a backend without colliding
+        self._prefix = f"{algorithm}:{max_requests}/{window_seconds}:"
 
     def is_allowed(self, identifier: str) -> bool:
         """
@@ -118,27 +225,9 @@ class RateLimiter:
         Returns:
             True if request is allowed, False if rate limited
         """
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.window_seconds)
-
-        # Get or initialize request list for this identifier
-        if identifier not in _rate_limit_cache:
-            _rate_limit_cache[identifier] = []
-
-        requests = _rate_limit_cache[identifier]
-
-        # Remove old requests outside the window
-        requests = [req_time for req_time in requests if req_time > cutoff]
-
-        # Check if under limit
-        if len(requests) >= self.max_requests:
-            return False
-
-        # Add current request
-        requests.append(now)
-        _rate_limit_cache[identifier] = requests
-
-        return True
+        allowed = self.backend.apply(self._prefix + identifier, self._step, self._idle_ttl)
+        (_ALLOWED if allowed else _REJECTED).inc()
+        return allowed
 
 
 def get_security_headers() -> Dict[str, str]:
@@ -163,22 +252,13 @@ def redact_sensitive_info(text: str) -> str:
     """
     Redact sensitive information from text for logging
 
+    Uses core.redaction.redact; see redact_stream there
+    for files and other large inputs.
+
     Args:
         text: Text that may contain sensitive info
 
     Returns:
         Text with sensitive info redacted
     """
-    patterns = {
-        'api_key': r'(sk-|api[_-]?key[_-]?)[a-zA-Z0-9]{20,}',
-        'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        'ip_address': r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
-        'credit_card': r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
-        'ssn': r'\b\d{3}-\d{2}-\d{4}\b',
-    }
-
-    redacted = text
-    for pattern_name, pattern in patterns.items():
-        redacted = re.sub(pattern, f'[REDACTED_{pattern_name.upper()}]', redacted)
-
-    return redacted
+    return redact(text)
@@ -0,0 +1,429 @@
+"""
+Report serialization for AI Shield Auditor
+
+Streams reports to files one at a time instead of building a full dict
+tree and one large string in memory:
+
+- compact JSON: the same payload as ``AuditReport.export_payload()``,
+  without indentation, written category by category
+- JSONL: one compact JSON report per line (readable by ``core.bulk_pdf``)
+- binary: a versioned archive format. It starts with a header (magic,
+  schema version) followed by length-prefixed msgpack records. The records
+  use a positional, column-wise layout defined by the schema version.
+
+The binary format is lossless. Records decode either to ``AuditReport``
+(validated in pydantic-core) or, for bulk paths, straight into
+``core.compact.CompactReport`` columns without building any models.
+msgpack is used when installed; otherwise a pure-Python codec reads and
+writes the same bytes.
+
+Usage:
+    python -m core.serialization reports.jsonl -o reports.asar --to binary
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from .compact import CompactCategory, CompactReport
+from .schema import AuditReport, UserEnvironment
+
+try:
+    import msgpack
+except ImportError:  # optional: the pure-Python codec below writes the same bytes
+    msgpack = None
+
+Report = Union[AuditReport, CompactReport]
+
+SCHEMA_VERSION = 2
+MAGIC = b"ASAR"
+_HEADER = struct.Struct(">4sHH")  # magic, schema version, flags (reserved)
+_LENGTH = struct.Struct(">I")
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _compact(report: Report) -> CompactReport:
+    return report if isinstance(report, CompactReport) else CompactReport.from_model(report)
+
+
+# --- JSON / JSONL ---
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=_COMPACT_SEPARATORS, ensure_ascii=False)
+
+
+def write_json(report: Report, stream: TextIO) -> None:
+    """
+    Write one report as compact JSON, one category at a time
+
+    The output parses to the same value as ``report.export_payload()``.
+    """
+    if isinstance(report, CompactReport):
+        categories = (c.to_dict() for c in report.categories)
+    else:
+        categories = (c.model_dump() for c in report.audit_categories)
+    summary = dict(report.summary)
+    summary["overall_score"] = report.overall_score()
+    summary["overall_risk"] = report.overall_risk()
+
+    stream.write('{"user_environment":' + _dumps(report.user_environment.model_dump()) + ',"audit_categories":[')
+    for i, category in enumerate(categories):
+        stream.write(("," if i else "") + _dumps(category))
+    stream.write('],"summary":' + _dumps(summary) + "}")
+
+
+def write_jsonl(reports: Iterable[Report], stream: TextIO) -> int:
+    """
+    Write reports as JSONL
+
+    Returns:
+        Number of reports written
+    """
+    count = 0
+    for report in reports:
+        write_json(report, stream)
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def payload_to_report(payload: Dict[str, Any]) -> AuditReport:
+    """
+    Build an AuditReport from an export payload
+
+    The summary may hold the numeric overall score; like every summary
+    value it is stored as a string. Validation runs in pydantic-core, which
+    is faster than building the models field by field with
+    ``model_construct``.
+    """
+    summary = {k: str(v) for k, v in (payload.get("summary") or {}).items()}
+    return AuditReport.model_validate({**payload, "summary": summary})
+
+
+def read_jsonl(stream: Iterable[str]) -> Iterator[AuditReport]:
+    """
+    Read reports from JSONL
+
+    Lines may be bare report payloads or ``core.bulk_audit`` output
+    (``{"app_id", "report"}``); blank lines are skipped.
+
+    Raises:
+        ValueError: On a bulk audit error line
+    """
+    for line in stream:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "error" in record and "report" not in record:
+            raise ValueError(f"Upstream audit failed: {record['error']}")
+        yield payload_to_report(record.get("report", record))
+
+
+# --- Binary ---
+#
+# Schema version 2 record layout (a msgpack array):
+#   [user_environment dict, summary dict, [category, ...]]
+# category:
+#   [name, score, risk_level, questions or None (= answer keys), answers,
+#    finding texts, finding severities, finding evidence or None,
+#    recommendation texts, recommendation efforts,
+#    finding threat ids (one list per finding) or None]
+# Version 1 categories are the same without the last element.
+
+def _record(report: CompactReport) -> List[Any]:
+    return [
+        report.user_environment.model_dump(),
+        report.summary,
+        [[c.category, c.score, c.risk_level, c._questions, c.answers,
+          c.finding_texts, [s for _, s, _ in c.findings()], c.finding_evidence,
+          c.rec_texts, [e for _, e in c.recommendations()], c.finding_threats]
+         for c in report.categories],
+    ]
+
+
+def _categories(record: List[Any]) -> Iterator[List[Any]]:
+    """Category rows of a decoded record, version 1 rows padded to the current layout"""
+    for row in record[2]:
+        yield row if len(row) > 10 else row + [None]
+
+
+def _record_payload(record: List[Any]) -> Dict[str, Any]:
+    """Model-shaped dict for a decoded record"""
+    env, summary, _ = record
+    return {
+        "user_environment": env,
+        "audit_categories": [
+            {"category": name, "score": score, "risk_level": risk,
+             "questions": list(answers) if questions is None else questions, "answers": answers,
+             "findings": [{"text": t, "severity": s, "evidence": e, "threats": ids}
+                          for t, s, e, ids in zip(f_texts, f_levels, f_evidence or [None] * len(f_texts),
+                                                  f_threats or [[]] * len(f_texts))],
+             "recommendations": [{"text": t, "effort": e} for t, e in zip(r_texts, r_levels)]}
+            for name, score, risk, questions, answers, f_texts, f_levels, f_evidence, r_texts, r_levels, f_threats
+            in _categories(record)
+        ],
+        "summary": summary,
+    }
+
+
+def _from_record(record: List[Any]) -> CompactReport:
+    env, summary, _ = record
+    out = []
+    for (name, score, risk, questions, answers, f_texts, f_levels, f_evidence, r_texts, r_levels,
+         f_threats) in _categories(record):
+        compact = CompactCategory.build(
+            name, score, risk, answers,
+            zip(f_texts, f_levels, f_evidence or [None] * len(f_texts)),
+            zip(r_texts, r_levels),
+            f_threats,
+        )
+        compact._questions = questions
+        out.append(compact)
+    return CompactReport(UserEnvironment.model_construct(**env), out, summary)
+
+
+def _pack(obj: Any, out: bytearray) -> None:
+    """Pure-Python msgpack encoder for None/bool/int/float/str/list/dict"""
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif obj >= 0:
+            for tag, fmt, limit in ((0xCC, ">B", 1 << 8), (0xCD, ">H", 1 << 16),
+                                    (0xCE, ">I", 1 << 32), (0xCF, ">Q", 1 << 64)):
+                if obj < limit:
+                    out.append(tag)
+                    out += struct.pack(fmt, obj)
+                    return
+            raise ValueError(f"Integer too large to serialize: {obj}")
+        else:
+            for tag, fmt, limit in ((0xD0, ">b", 1 << 7), (0xD1, ">h", 1 << 15),
+                                    (0xD2, ">i", 1 << 31), (0xD3, ">q", 1 << 63)):
+                if obj >= -limit:
+                    out.append(tag)
+                    out += struct.pack(fmt, obj)
+                    return
+            raise ValueError(f"Integer too large to serialize: {obj}")
+    elif isinstance(obj, float):
+        out.append(0xCB)
+        out += struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        n = len(data)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n < 1 << 8:
+            out += b"\xd9" + struct.pack(">B", n)
+        elif n < 1 << 16:
+            out += b"\xda" + struct.pack(">H", n)
+        else:
+            out += b"\xdb" + struct.pack(">I", n)
+        out += data
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n < 1 << 16:
+            out += b"\xdc" + struct.pack(">H", n)
+        else:
+            out += b"\xdd" + struct.pack(">I", n)
+        for item in obj:
+            _pack(item, out)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n < 1 << 16:
+            out += b"\xde" + struct.pack(">H", n)
+        else:
+            out += b"\xdf" + struct.pack(">I", n)
+        for key, value in obj.items():
+            _pack(key, out)
+            _pack(value, out)
+    else:
+        raise ValueError(f"Cannot serialize {type(obj).__name__}")
+
+
+_FIXED = {tag: struct.Struct(fmt) for tag, fmt in (
+    (0xCC, ">B"), (0xCD, ">H"), (0xCE, ">I"), (0xCF, ">Q"), (0xD0, ">b"), (0xD1, ">h"),
+    (0xD2, ">i"), (0xD3, ">q"), (0xCA, ">f"), (0xCB, ">d"))}
+_STR_LEN = {0xD9: _FIXED[0xCC], 0xDA: _FIXED[0xCD], 0xDB: _FIXED[0xCE]}
+_ARRAY_LEN = {0xDC: _FIXED[0xCD], 0xDD: _FIXED[0xCE]}
+_MAP_LEN = {0xDE: _FIXED[0xCD], 0xDF: _FIXED[0xCE]}
+_CONSTANTS = {0xC0: None, 0xC2: False, 0xC3: True}
+
+
+def _unpack(data: bytes, pos: int):
+    """Pure-Python msgpack decoder for the types ``_pack`` writes; returns (value, next position)"""
+    tag = data[pos]
+    pos += 1
+    # Most common first: short strings, small ints, short arrays and maps
+    if 0xA0 <= tag <= 0xBF:
+        end = pos + (tag & 0x1F)
+        return data[pos:end].decode("utf-8"), end
+    if tag < 0x80:
+        return tag, pos
+    if 0x90 <= tag <= 0x9F:
+        n, kind = tag & 0x0F, list
+    elif tag <= 0x8F:
+        n, kind = tag & 0x0F, dict
+    elif tag in _FIXED:
+        fixed = _FIXED[tag]
+        return fixed.unpack_from(data, pos)[0], pos + fixed.size
+    elif tag in _STR_LEN:
+        prefix = _STR_LEN[tag]
+        n = prefix.unpack_from(data, pos)[0]
+        pos += prefix.size
+        return data[pos:pos + n].decode("utf-8"), pos + n
+    elif tag in _CONSTANTS:
+        return _CONSTANTS[tag], pos
+    elif tag >= 0xE0:
+        return tag - 0x100, pos
+    elif tag in _ARRAY_LEN:
+        prefix = _ARRAY_LEN[tag]
+        n, kind = prefix.unpack_from(data, pos)[0], list
+        pos += prefix.size
+    elif tag in _MAP_LEN:
+        prefix = _MAP_LEN[tag]
+        n, kind = prefix.unpack_from(data, pos)[0], dict
+        pos += prefix.size
+    else:
+        raise ValueError(f"Unsupported msgpack type 0x{tag:02x}")
+
+    if kind is list:
+        items = [None] * n
+        for i in range(n):
+            items[i], pos = _unpack(data, pos)
+        return items, pos
+    mapping = {}
+    for _ in range(n):
+        key, pos = _unpack(data, pos)
+        mapping[key], pos = _unpack(data, pos)
+    return mapping, pos
+
+
+def _encode(record: Any) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(record, use_bin_type=True)
+    out = bytearray()
+    _pack(record, out)
+    return bytes(out)
+
+
+def _decode(data: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    value, pos = _unpack(data, 0)
+    if pos != len(data):
+        raise ValueError("Trailing bytes after record")
+    return value
+
+
+def encode_report(report: Report) -> bytes:
+    """One report as a binary record body (without header or length prefix)"""
+    return _encode(_record(_compact(report)))
+
+
+def decode_report(data: bytes, compact: bool = False) -> Report:
+    """Inverse of ``encode_report``; returns a CompactReport when compact is set"""
+    record = _decode(data)
+    return _from_record(record) if compact else AuditReport.model_validate(_record_payload(record))
+
+
+def write_binary(reports: Iterable[Report], stream: BinaryIO) -> int:
+    """
+    Write reports as a binary archive
+
+    Returns:
+        Number of reports written
+    """
+    stream.write(_HEADER.pack(MAGIC, SCHEMA_VERSION, 0))
+    count = 0
+    for report in reports:
+        body = encode_report(report)
+        stream.write(_LENGTH.pack(len(body)))
+        stream.write(body)
+        count += 1
+    return count
+
+
+def read_binary(stream: BinaryIO, compact: bool = False) -> Iterator[Report]:
+    """
+    Read reports from a binary archive, one record at a time
+
+    Args:
+        stream: Binary file positioned at the archive header
+        compact: Yield CompactReport instead of AuditReport
+
+    Raises:
+        ValueError: If the header is missing, the schema version is newer
+            than this code, or the archive is truncated
+    """
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("Not a report archive: missing header")
+    magic, version, _ = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a report archive: bad magic")
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Unsupported archive schema version {version} (newest known: {SCHEMA_VERSION})")
+    while True:
+        prefix = stream.read(_LENGTH.size)
+        if not prefix:
+            return
+        if len(prefix) < _LENGTH.size:
+            raise ValueError("Truncated archive")
+        size = _LENGTH.unpack(prefix)[0]
+        body = stream.read(size)
+        if len(body) < size:
+            raise ValueError("Truncated archive")
+        yield decode_report(body, compact=compact)
+
+
+def is_binary(path: str) -> bool:
+    """Whether a file starts with the binary archive magic"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert report archives between JSONL and the binary format")
+    parser.add_argument("input", help="JSONL or binary report archive (format is detected)")
+    parser.add_argument("-o", "--output", required=True, help="Destination file")
+    parser.add_argument("--to", choices=("jsonl", "binary"), default="binary", help="Output format")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if is_binary(args.input):
+        src = open(args.input, "rb")
+        reports = read_binary(src, compact=True)
+    else:
+        src = open(args.input, "r", encoding="utf-8")
+        reports = read_jsonl(src)
+    try:
+        if args.to == "binary":
+            with open(args.output, "wb") as dst:
+                count = write_binary(reports, dst)
+        else:
+            with open(args.output, "w", encoding="utf-8") as dst:
+                count = write_jsonl(reports, dst)
+    finally:
+        src.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {count} reports to {args.output} in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+"""
+Local threat intelligence index for AI Shield Auditor
+
+Loads the ``threat_intel`` rows from ``seed.sql`` (or an exported
+snapshot) into in-memory dictionaries keyed by threat type, severity and
+platform, and uses them to link audit findings to the threats and
+mitigations they relate to.
+
+A finding is linked through its category (see ``CATEGORY_THREAT_TYPES``),
+its severity and the audited platform. Findings that already name a threat
+(``core.threat_matcher`` findings start with ``[source_id]``) are linked
+to it directly. Links are memoized per (category, severity, platform), so
+after the first finding of a kind each lookup is one dict access.
+
+Parsing the seed is done once: the parsed rows are written to a snapshot
+(JSON, or SQLite when the path ends in ``.sqlite3``/``.db``) tagged with
+the seed's sha256, and later startups load the snapshot while the hash
+still matches. A snapshot also works on its own when no seed is shipped.
+
+Usage:
+    python -m core.threat_index -o .cache/threat_intel.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .compact import CompactReport
+from .logging_config import get_logger
+from .schema import AuditReport
+from .threat_intel import DEFAULT_SEED_PATH, JSON_COLUMNS, parse_threat_intel
+
+logger = get_logger(__name__)
+
+Report = Union[AuditReport, CompactReport]
+
+SNAPSHOT_VERSION = 1
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(".cache", "threat_intel.json")
+
+# Threats linked to one finding, most severe first
+MAX_LINKS = 3
+
+# Threat severities, most severe first
+SEVERITY_ORDER = ("critical", "high", "medium", "low")
+
+# Audit category -> threat types its findings relate to
+CATEGORY_THREAT_TYPES: Dict[str, Tuple[str, ...]] = {
+    "Identity & Access": ("credential_exposure", "excessive_agency"),
+    "Data Governance": ("credential_exposure", "data_poisoning"),
+    "RAG Privacy": ("vector_security", "prompt_injection", "data_poisoning"),
+    "Integrations": ("mcp_security", "agentic_security", "supply_chain"),
+    "Model Safety": ("prompt_injection", "prompt_leakage", "output_handling", "misinformation"),
+    "Compliance": ("credential_exposure", "misinformation"),
+    "Deployment": ("resource_limits", "supply_chain", "output_handling"),
+}
+
+# Finding severity -> threat severities preferred when linking
+FINDING_THREAT_SEVERITIES: Dict[str, Tuple[str, ...]] = {
+    "High": ("critical", "high"),
+    "Medium": ("high", "medium"),
+    "Low": ("medium", "low"),
+}
+
+_SQLITE_SUFFIXES = (".sqlite3", ".sqlite", ".db")
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS threat_intel (
+    source TEXT NOT NULL,
+    source_id TEXT PRIMARY KEY,
+    threat_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    severity TEXT NOT NULL,
+    indicators TEXT,
+    affected_systems TEXT,
+    mitigation TEXT,
+    "references" TEXT,
+    published_at TEXT,
+    is_active INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_threat_intel_severity ON threat_intel(severity);
+CREATE INDEX IF NOT EXISTS idx_threat_intel_threat_type ON threat_intel(threat_type);
+"""
+
+_SQLITE_COLUMNS = ("source", "source_id", "threat_type", "title", "description", "severity", "indicators",
+                   "affected_systems", "mitigation", "references", "published_at", "is_active")
+_QUOTED_COLUMNS = ", ".join(f'"{c}"' for c in _SQLITE_COLUMNS)  # "references" is an SQL keyword
+
+
+class Threat(NamedTuple):
+    source_id: str
+    source: str
+    threat_type: str
+    title: str
+    severity: str  # critical, high, medium, low
+    mitigation: str
+    references: Tuple[Tuple[str, str], ...]  # (title, url)
+    platforms: Tuple[str, ...]  # lowercased; "all" when not platform-specific
+    systems: Tuple[str, ...]  # lowercased framework and tool names
+    published_at: str
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Threat":
+        systems = row.get("affected_systems") or {}
+        return cls(
+            source_id=row["source_id"],
+            source=row.get("source") or "",
+            threat_type=row.get("threat_type") or "",
+            title=row.get("title") or "",
+            severity=(row.get("severity") or "medium").lower(),
+            mitigation=row.get("mitigation") or "",
+            references=tuple((r.get("title") or r.get("url", ""), r.get("url", "")) for r in row.get("references") or ()),
+            platforms=tuple(p.lower() for p in systems.get("platforms", ())),
+            systems=tuple(s.lower() for key in ("frameworks", "tools") for s in systems.get(key, ())
+                          if s.lower() != "all"),
+            published_at=str(row.get("published_at") or ""),
+        )
+
+    def applies_to(self, platform: Optional[str]) -> bool:
+        """Whether the threat affects a platform, framework or tool (None matches every threat)"""
+        if platform is None or "all" in self.platforms:
+            return True
+        platform = platform.lower()
+        return platform in self.platforms or platform in self.systems
+
+
+def _severity_rank(threat: Threat) -> int:
+    return SEVERITY_ORDER.index(threat.severity) if threat.severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+
+class ThreatIndex:
+    """Threats keyed by id, type, severity and platform, with memoized finding links"""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            rows: Threat rows as returned by ``load_threat_intel``
+        """
+        self.rows = list(rows)
+        # Most severe first, then most recently published
+        threats = sorted((Threat.from_row(row) for row in self.rows), key=lambda t: t.published_at, reverse=True)
+        threats.sort(key=_severity_rank)
+        self._position = {t.source_id: i for i, t in enumerate(threats)}
+        self.threats: Dict[str, Threat] = {t.source_id: t for t in threats}
+        self.by_type: Dict[str, List[Threat]] = {}
+        self.by_severity: Dict[str, List[Threat]] = {}
+        self.by_platform: Dict[str, List[Threat]] = {}
+        for threat in threats:
+            self.by_type.setdefault(threat.threat_type, []).append(threat)
+            self.by_severity.setdefault(threat.severity, []).append(threat)
+            for platform in {*threat.platforms, *threat.systems}:
+                self.by_platform.setdefault(platform, []).append(threat)
+        self._lookups: Dict[Tuple[Optional[str], Optional[str], Optional[str]], Tuple[Threat, ...]] = {}
+        self._links: Dict[Tuple[str, str, Optional[str]], Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.threats)
+
+    def get(self, source_id: str) -> Optional[Threat]:
+        return self.threats.get(source_id)
+
+    def lookup(self, threat_type: Optional[str] = None, severity: Optional[str] = None,
+               platform: Optional[str] = None) -> Tuple[Threat, ...]:
+        """
+        Threats matching every given key, most severe first
+
+        Args:
+            threat_type: e.g. ``prompt_injection``
+            severity: critical, high, medium or low
+            platform: Platform, framework or tool name (case-insensitive);
+                threats affecting "all" platforms always match
+        """
+        key = (threat_type, severity and severity.lower(), platform and platform.lower())
+        found = self._lookups.get(key)
+        if found is None:
+            if threat_type is not None:
+                candidates: Sequence[Threat] = self.by_type.get(threat_type, ())
+            elif key[1] is not None:
+                candidates = self.by_severity.get(key[1], ())
+            elif key[2] is not None:
+                candidates = sorted({*self.by_platform.get(key[2], ()), *self.by_platform.get("all", ())},
+                                    key=lambda t: self._position[t.source_id])
+            else:
+                candidates = list(self.threats.values())
+            found = self._lookups[key] = tuple(
+                t for t in candidates
+                if (key[1] is None or t.severity == key[1]) and t.applies_to(key[2]))
+        return found
+
+    def links(self, category: str, severity: str, platform: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Ids of the threats linked to findings of one category and severity
+
+        Threats of the category's types are taken in severity order,
+        preferring the threat severities that correspond to the finding's;
+        at most ``MAX_LINKS`` are returned.
+        """
+        key = (category, severity, platform)
+        ids = self._links.get(key)
+        if ids is None:
+            candidates = sorted((t for threat_type in CATEGORY_THREAT_TYPES.get(category, ())
+                                 for t in self.lookup(threat_type, platform=platform)),
+                                key=lambda t: self._position[t.source_id])
+            preferred = FINDING_THREAT_SEVERITIES.get(severity, SEVERITY_ORDER)
+            ranked = [t for t in candidates if t.severity in preferred] or candidates
+            ids = self._links[key] = tuple(t.source_id for t in ranked[:MAX_LINKS])
+        return ids
+
+    def finding_links(self, category: str, text: str, severity: str,
+                      platform: Optional[str] = None) -> Tuple[str, ...]:
+        """Threat ids for one finding; a ``[source_id]`` prefix naming a known threat wins"""
+        if text.startswith("["):
+            source_id = text[1:text.find("]")]
+            if source_id in self.threats:
+                return (source_id,)
+        return self.links(category, severity, platform)
+
+    def enrich(self, report: Report, platform: Optional[str] = None) -> int:
+        """
+        Set ``threats`` on every finding of a report, in place
+
+        Args:
+            report: AuditReport or CompactReport
+            platform: Defaults to the report's environment platform
+
+        Returns:
+            Number of findings linked to at least one threat
+        """
+        if platform is None:
+            platform = report.user_environment.platform
+        linked = 0
+        if isinstance(report, CompactReport):
+            for c in report.categories:
+                ids = [list(self.finding_links(c.category, t, s, platform)) for t, s, _ in c.findings()]
+                c.finding_threats = ids if any(ids) else None
+                linked += sum(1 for i in ids if i)
+            return linked
+        for result in report.audit_categories:
+            for finding in result.findings:
+                finding.threats = list(self.finding_links(result.category, finding.text, finding.severity, platform))
+                linked += bool(finding.threats)
+        return linked
+
+    def resolve(self, ids: Iterable[str]) -> List[Threat]:
+        """Threats for a finding's ``threats`` ids, unknown ids skipped"""
+        return [self.threats[i] for i in ids if i in self.threats]
+
+
+# --- Snapshots ---
+
+def _is_sqlite(path: str) -> bool:
+    return path.lower().endswith(_SQLITE_SUFFIXES)
+
+
+def write_snapshot(path: str, rows: List[Dict[str, Any]], seed_hash: str) -> None:
+    """
+    Write parsed threat rows to a JSON or SQLite snapshot
+
+    The JSON file is replaced atomically; the SQLite cache is rewritten in
+    one transaction.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if not _is_sqlite(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "seed_sha256": seed_hash, "threats": rows}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        return
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SQLITE_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM threat_intel")
+        conn.executemany(
+            f"INSERT INTO threat_intel ({_QUOTED_COLUMNS}) "
+            f"VALUES ({', '.join('?' * len(_SQLITE_COLUMNS))})",
+            [tuple(json.dumps(row.get(c)) if c in JSON_COLUMNS else row.get(c) for c in _SQLITE_COLUMNS)
+             for row in rows])
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                         [("version", str(SNAPSHOT_VERSION)), ("seed_sha256", seed_hash)])
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def read_snapshot(path: str) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Read a snapshot written by ``write_snapshot``
+
+    Returns:
+        (seed sha256, threat rows), or None when the file is missing,
+        unreadable or from another snapshot version
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        if not _is_sqlite(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            return data["seed_sha256"], data["threats"]
+
+        conn = sqlite3.connect(path)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            if meta.get("version") != str(SNAPSHOT_VERSION):
+                return None
+            rows = []
+            for values in conn.execute(f"SELECT {_QUOTED_COLUMNS} FROM threat_intel"):
+                row = dict(zip(_SQLITE_COLUMNS, values))
+                for column in JSON_COLUMNS:
+                    row[column] = json.loads(row[column]) if row[column] is not None else None
+                row["is_active"] = bool(row["is_active"])
+                rows.append(row)
+            return meta["seed_sha256"], rows
+        finally:
+            conn.close()
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        logger.warning("Ignoring unreadable threat intel snapshot", path=path, error=str(e))
+        return None
+
+
+def load_index(seed_path: Union[str, Path] = DEFAULT_SEED_PATH,
+               snapshot_path: Optional[str] = None) -> ThreatIndex:
+    """
+    Build the threat index, reusing a snapshot while it matches the seed
+
+    Args:
+        seed_path: SQL seed script
+        snapshot_path: JSON or SQLite snapshot; written after a seed parse.
+            Used as is when the seed file does not exist.
+
+    Raises:
+        ValueError: If neither the seed nor a usable snapshot exists
+    """
+    seed_hash = sql = None
+    if os.path.exists(seed_path):
+        with open(seed_path, "rb") as f:
+            data = f.read()
+        seed_hash = hashlib.sha256(data).hexdigest()
+        sql = data.decode("utf-8")
+
+    if snapshot_path is not None:
+        cached = read_snapshot(snapshot_path)
+        if cached is not None and (seed_hash is None or cached[0] == seed_hash):
+            return ThreatIndex(cached[1])
+    if sql is None:
+        raise ValueError(f"Threat intel seed not found: {seed_path}")
+
+    rows = parse_threat_intel(sql)
+    if snapshot_path is not None:
+        try:
+            write_snapshot(snapshot_path, rows, seed_hash)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Failed to write threat intel snapshot", path=snapshot_path, error=str(e))
+    return ThreatIndex(rows)
+
+
+@lru_cache(maxsize=1)
+def get_threat_index() -> Optional[ThreatIndex]:
+    """
+    Process-wide threat index
+
+    The snapshot path comes from THREAT_INTEL_SNAPSHOT (default
+    .cache/threat_intel.json, "none" disables the snapshot). Returns None
+    when no threat intel is available.
+    """
+    path = os.getenv("THREAT_INTEL_SNAPSHOT", DEFAULT_SNAPSHOT_PATH)
+    if path.strip().lower() in ("", "none"):
+        path = None
+    try:
+        return load_index(DEFAULT_SEED_PATH, path)
+    except ValueError as e:
+        logger.warning("Threat intel unavailable, findings are not enriched", error=str(e))
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export the threat intel seed to an index snapshot")
+    parser.add_argument("-o", "--output", default=DEFAULT_SNAPSHOT_PATH,
+                        help="Snapshot file (.json, or .sqlite3/.db for a SQLite cache)")
+    parser.add_argument("--seed", default=str(DEFAULT_SEED_PATH), help="SQL seed script")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.seed):
+        parser.error(f"seed file not found: {args.seed}")
+
+    start = time.perf_counter()
+    with open(args.seed, "rb") as f:
+        data = f.read()
+    rows = parse_threat_intel(data.decode("utf-8"))
+    write_snapshot(args.output, rows, hashlib.sha256(data).hexdigest())
+    index = ThreatIndex(rows)
+    elapsed = time.perf_counter() - start
+
+    types = ", ".join(f"{name}={len(threats)}" for name, threats in sorted(index.by_type.items()))
+    print(f"Wrote {len(index)} threats to {args.output} in {elapsed * 1000:.1f}ms ({types})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Threat intelligence loading for AI Shield Auditor
+
+Parses the ``threat_intel`` rows shipped in ``seed.sql`` so the Python code
+can use the same OWASP/CVE indicators as the Postgres deployment.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Tuple
+
+DEFAULT_SEED_PATH = Path(__file__).resolve().parent.parent / "seed.sql"
+
+# Columns stored as JSON text in the seed data
+JSON_COLUMNS = ("indicators", "affected_systems", "references")
+
+_INSERT_HEADER = re.compile(
+    r"INSERT\s+INTO\s+(?:\w+\.)?(?P<table>\w+)\s*\((?P<columns>[^)]*)\)\s*VALUES",
+    re.IGNORECASE,
+)
+
+
+def _skip_comment(sql: str, i: int) -> int:
+    """Return the index just past a ``--`` comment starting at ``i``."""
+    end = sql.find("\n", i)
+    return len(sql) if end == -1 else end + 1
+
+
+def _read_string(sql: str, i: int) -> Tuple[str, int]:
+    """Read a single-quoted SQL literal starting at ``i`` (the opening quote)."""
+    parts = []
+    i += 1
+    while True:
+        end = sql.find("'", i)
+        if end == -1:
+            raise ValueError("Unterminated string literal in seed data")
+        parts.append(sql[i:end])
+        if sql.startswith("''", end):
+            parts.append("'")
+            i = end + 2
+            continue
+        return "".join(parts), end + 1
+
+
+def _convert_bare(token: str) -> Any:
+    lowered = token.lower()
+    if lowered == "null":
+        return None
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _iter_value_tuples(sql: str, i: int) -> Iterator[Tuple[List[Any], int]]:
+    """Yield ``(values, next_index)`` for each tuple of a VALUES list."""
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch.isspace() or ch == ",":
+            i += 1
+        elif sql.startswith("--", i):
+            i = _skip_comment(sql, i)
+        elif ch == ";":
+            return
+        elif ch == "(":
+            values: List[Any] = []
+            i += 1
+            while True:
+                while i < n and sql[i].isspace():
+                    i += 1
+                if sql.startswith("--", i):
+                    i = _skip_comment(sql, i)
+                    continue
+                if i >= n:
+                    raise ValueError("Unterminated VALUES tuple in seed data")
+                ch = sql[i]
+                if ch == ")":
+                    i += 1
+                    break
+                if ch == ",":
+                    i += 1
+                elif ch == "'":
+                    value, i = _read_string(sql, i)
+                    values.append(value)
+                else:
+                    start = i
+                    while i < n and sql[i] not in ",)" and not sql[i].isspace():
+                        i += 1
+                    values.append(_convert_bare(sql[start:i]))
+            yield values, i
+        else:
+            raise ValueError(f"Unexpected character {ch!r} in VALUES list at offset {i}")
+
+
+def parse_seed_inserts(sql: str, table: str) -> List[Dict[str, Any]]:
+    """
+    Extract the rows inserted into ``table`` by a SQL seed script
+
+    Args:
+        sql: Contents of the seed script
+        table: Unqualified table name (e.g. ``threat_intel``)
+
+    Returns:
+        List of rows as column -> value dictionaries
+    """
+    rows: List[Dict[str, Any]] = []
+    for header in _INSERT_HEADER.finditer(sql):
+        if header.group("table").lower() != table.lower():
+            continue
+        columns = [c.strip() for c in header.group("columns").split(",")]
+        for values, _ in _iter_value_tuples(sql, header.end()):
+            if len(values) != len(columns):
+                raise ValueError(
+                    f"Row for {table} has {len(values)} values, expected {len(columns)}"
+                )
+            rows.append(dict(zip(columns, values)))
+    return rows
+
+
+def load_threat_intel(path: Path = DEFAULT_SEED_PATH, active_only: bool = True) -> List[Dict[str, Any]]:
+    """
+    Load threat intelligence rows from a seed script
+
+    Args:
+        path: Path to the SQL seed file
+        active_only: Drop rows whose ``is_active`` flag is false
+
+    Returns:
+        List of threat dictionaries with JSON columns decoded
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_threat_intel(f.read(), active_only)
+
+
+def parse_threat_intel(sql: str, active_only: bool = True) -> List[Dict[str, Any]]:
+    """Same as ``load_threat_intel`` for seed script contents already in memory"""
+    rows = parse_seed_inserts(sql, "threat_intel")
+    threats = []
+    for row in rows:
+        if active_only and row.get("is_active") is False:
+            continue
+        for column in JSON_COLUMNS:
+            if isinstance(row.get(column), str):
+                row[column] = json.loads(row[column])
+        threats.append(row)
+    return threats
@@ -0,0 +1,359 @@
+"""
+Compiled threat-indicator matching for AI Shield Auditor
+
+All keyword and regex indicators from the threat intelligence feed are
+compiled once into a single literal trie. A scan lowercases the input,
+walks the trie over it in one pass (the trie is emitted as one regular
+expression so the walk runs inside the regex engine) and collects:
+
+- every keyword hit, checked for whole-word boundaries, and
+- every literal "atom" that a regex indicator requires in order to match.
+
+Only the regex indicators whose required atoms are all present are then
+confirmed with their own compiled pattern, so a clean prompt costs one
+pass instead of one ``re.search`` per indicator.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, NamedTuple, Optional, Tuple, FrozenSet
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+from .schema import Finding
+from .threat_intel import DEFAULT_SEED_PATH, load_threat_intel
+
+# Shortest literal worth using as a prefilter atom
+MIN_ATOM_LENGTH = 3
+
+# Map threat-intel severities onto the Finding severity scale
+FINDING_SEVERITY = {
+    "critical": "High",
+    "high": "High",
+    "medium": "Medium",
+    "low": "Low",
+}
+
+
+class ThreatMatch(NamedTuple):
+    """A single indicator hit inside scanned text"""
+    source_id: str
+    severity: str
+    threat_type: str
+    title: str
+    kind: str  # "pattern" or "keyword"
+    indicator: str
+    start: int
+    end: int
+    excerpt: str
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# --- Regex atom extraction -------------------------------------------------
+
+def _required_atoms(parsed) -> Tuple[List[FrozenSet[str]], Optional[str]]:
+    """
+    Collect literal runs that every match of a parsed pattern must contain
+
+    Returns:
+        (atoms, prefix) where each atom is a set of alternatives of which at
+        least one must occur, and prefix is a literal every match starts with
+    """
+    atoms: List[FrozenSet[str]] = []
+    run: List[str] = []
+    prefix: Optional[str] = None
+    leading = True
+
+    def flush() -> None:
+        nonlocal prefix, leading
+        if run:
+            literal = "".join(run).lower()
+            if len(literal) >= MIN_ATOM_LENGTH:
+                atoms.append(frozenset([literal]))
+                if leading:
+                    prefix = literal
+            run.clear()
+        leading = False
+
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            inner, _ = _required_atoms(av[-1])
+            atoms.extend(inner)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)):
+            low, _high, body = av
+            if low >= 1:
+                inner, _ = _required_atoms(body)
+                atoms.extend(inner)
+        elif op is sre_parse.BRANCH:
+            choices = []
+            for alternative in av[1]:
+                inner, _ = _required_atoms(alternative)
+                if not inner:
+                    choices = []
+                    break
+                # The longest single-literal atom is the most selective
+                best = max((a for a in inner if len(a) == 1), key=lambda a: len(next(iter(a))), default=None)
+                if best is None:
+                    choices = []
+                    break
+                choices.append(next(iter(best)))
+            if choices:
+                atoms.append(frozenset(choices))
+    flush()
+    return atoms, prefix
+
+
+def required_literals(pattern: str) -> List[FrozenSet[str]]:
+    """
+    Lowercase literals every match of a regex must contain
+
+    Args:
+        pattern: Regular expression
+
+    Returns:
+        Sets of alternatives, one of each of which occurs in every match;
+        literals shorter than MIN_ATOM_LENGTH are left out
+    """
+    atoms, _ = _required_atoms(sre_parse.parse(pattern))
+    return atoms
+
+
+# --- Literal trie ----------------------------------------------------------
+
+class _TrieNode:
+    __slots__ = ("children", "keywords", "atom")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.keywords: List[int] = []  # keyword ids ending here
+        self.atom: Optional[str] = None  # literal atom ending here
+
+
+class LiteralTrie:
+    """Trie of lowercase literals compiled into a single regular expression"""
+
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+
+    def add(self, literal: str) -> _TrieNode:
+        node = self.root
+        for ch in literal:
+            node = node.children.setdefault(ch, _TrieNode())
+        return node
+
+    def to_regex(self) -> str:
+        """Emit an alternation matching the shortest literal starting at a position"""
+
+        def emit(node: _TrieNode) -> str:
+            if node.keywords or node.atom is not None:
+                return ""
+            branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.children.items())]
+            if len(branches) == 1:
+                return branches[0]
+            return "(?:" + "|".join(branches) + ")"
+
+        if not self.root.children:
+            return "(?!)"
+        return "(?=" + emit(self.root) + ")"
+
+    def walk(self, text: str, start: int, fold: bool = False) -> Iterable[Tuple[_TrieNode, int]]:
+        """Yield every terminal node reachable from ``start`` with its end offset"""
+        node = self.root
+        for i in range(start, len(text)):
+            node = node.children.get(text[i].lower() if fold else text[i])
+            if node is None:
+                return
+            if node.keywords or node.atom is not None:
+                yield node, i + 1
+
+
+# --- Matcher ---------------------------------------------------------------
+
+class _PatternRule:
+    __slots__ = ("pattern", "compiled", "atoms", "prefix", "threats")
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.compiled = re.compile(pattern, re.IGNORECASE)
+        self.atoms, self.prefix = _required_atoms(sre_parse.parse(pattern))
+        self.threats: List[int] = []
+
+
+class ThreatMatcher:
+    """Scans text against every active threat indicator in a single pass"""
+
+    def __init__(self, threats: Iterable[Dict[str, Any]]):
+        """
+        Compile threat indicators into a matcher
+
+        Args:
+            threats: Threat intel rows as returned by ``load_threat_intel``
+        """
+        self.threats: List[Dict[str, Any]] = []
+        self.keywords: List[str] = []
+        self._keyword_threats: List[List[int]] = []
+        self._patterns: List[_PatternRule] = []
+
+        trie = LiteralTrie()
+        keyword_ids: Dict[str, int] = {}
+        pattern_ids: Dict[str, int] = {}
+
+        for threat in threats:
+            if threat.get("is_active") is False:
+                continue
+            tid = len(self.threats)
+            self.threats.append(threat)
+            indicators = threat.get("indicators") or {}
+
+            for keyword in indicators.get("keywords", []):
+                literal = keyword.lower()
+                if literal not in keyword_ids:
+                    keyword_ids[literal] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self._keyword_threats.append([])
+                    trie.add(literal).keywords.append(keyword_ids[literal])
+                self._keyword_threats[keyword_ids[literal]].append(tid)
+
+            for pattern in indicators.get("patterns", []):
+                if pattern not in pattern_ids:
+                    pattern_ids[pattern] = len(self._patterns)
+                    rule = _PatternRule(pattern)
+                    self._patterns.append(rule)
+                    for atom in rule.atoms:
+                        for literal in atom:
+                            trie.add(literal).atom = literal
+                self._patterns[pattern_ids[pattern]].threats.append(tid)
+
+        self._trie = trie
+        trie_regex = trie.to_regex()
+        self._scan = re.compile(trie_regex)
+        self._scan_ci = re.compile(trie_regex, re.IGNORECASE)
+
+    @classmethod
+    def from_seed(cls, path: Path = DEFAULT_SEED_PATH) -> "ThreatMatcher":
+        """Build a matcher from the ``threat_intel`` rows of a seed script"""
+        return cls(load_threat_intel(path))
+
+    @property
+    def indicator_count(self) -> int:
+        return len(self.keywords) + len(self._patterns)
+
+    def _match(self, tid: int, kind: str, indicator: str, text: str, start: int, end: int) -> ThreatMatch:
+        threat = self.threats[tid]
+        return ThreatMatch(
+            source_id=threat.get("source_id") or threat.get("title", ""),
+            severity=threat.get("severity", "medium"),
+            threat_type=threat.get("threat_type", ""),
+            title=threat.get("title", ""),
+            kind=kind,
+            indicator=indicator,
+            start=start,
+            end=end,
+            excerpt=text[max(0, start - 40):end + 40],
+        )
+
+    def scan(self, text: str) -> List[ThreatMatch]:
+        """
+        Scan text against all indicators
+
+        Each (threat, indicator) pair is reported once, at its first occurrence.
+
+        Args:
+            text: System prompt, document or other free text
+
+        Returns:
+            Matches ordered by position in the text
+        """
+        if not text:
+            return []
+
+        lowered = text.lower()
+        aligned = len(lowered) == len(text)
+        if aligned:
+            haystack, scanner = lowered, self._scan
+        else:
+            # Case mapping changed the length; keep offsets aligned with the input
+            haystack, scanner = text, self._scan_ci
+
+        keyword_hits: Dict[int, Tuple[int, int]] = {}
+        atoms_seen: Dict[str, int] = {}
+        walk = self._trie.walk
+        n = len(haystack)
+
+        for m in scanner.finditer(haystack):
+            start = m.start()
+            for node, end in walk(haystack, start, not aligned):
+                if node.atom is not None and node.atom not in atoms_seen:
+                    atoms_seen[node.atom] = start
+                if node.keywords:
+                    if start > 0 and _is_word_char(haystack[start - 1]):
+                        continue
+                    if end < n and _is_word_char(haystack[end]):
+                        continue
+                    for kid in node.keywords:
+                        keyword_hits.setdefault(kid, (start, end))
+
+        matches: List[ThreatMatch] = []
+        for kid, (start, end) in keyword_hits.items():
+            for tid in self._keyword_threats[kid]:
+                matches.append(self._match(tid, "keyword", self.keywords[kid], text, start, end))
+
+        for rule in self._patterns:
+            if not all(any(a in atoms_seen for a in atom) for atom in rule.atoms):
+                continue
+            pos = atoms_seen[rule.prefix] if rule.prefix is not None and aligned else 0
+            found = rule.compiled.search(text, pos)
+            if found is None:
+                continue
+            for tid in rule.threats:
+                matches.append(self._match(tid, "pattern", rule.pattern, text, found.start(), found.end()))
+
+        matches.sort(key=lambda mt: (mt.start, mt.source_id, mt.indicator))
+        return matches
+
+    def findings(self, text: str) -> List[Finding]:
+        """Scan text and summarize the hits as one Finding per threat"""
+        return matches_to_findings(self.scan(text))
+
+
+def matches_to_findings(matches: Iterable[ThreatMatch]) -> List[Finding]:
+    """
+    Group indicator hits by threat into report findings
+
+    Args:
+        matches: Output of ``ThreatMatcher.scan``
+
+    Returns:
+        One Finding per threat, tagged with its source id
+    """
+    grouped: Dict[str, List[ThreatMatch]] = {}
+    for match in matches:
+        grouped.setdefault(match.source_id, []).append(match)
+
+    findings = []
+    for source_id, hits in grouped.items():
+        first = hits[0]
+        indicators = ", ".join(sorted({h.indicator for h in hits}))
+        findings.append(Finding(
+            text=f"[{source_id}] {first.title}: matched {indicators}",
+            severity=FINDING_SEVERITY.get(first.severity.lower(), "Medium"),
+            evidence=first.excerpt.strip(),
+            threats=[source_id],
+        ))
+    return findings
+
+
+@lru_cache(maxsize=1)
+def get_threat_matcher(path: str = str(DEFAULT_SEED_PATH)) -> ThreatMatcher:
+    """Return the process-wide matcher compiled from the seed threat intel"""
+    return ThreatMatcher.from_seed(Path(path))
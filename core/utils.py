@@ -1,7 +1,64 @@
-
+import os
 import yaml
-from typing import Dict, Any
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def load_yaml(path: str) -> Dict[str, Any]:
     with open(path, "r") as f:
         return yaml.safe_load(f)
+
+
+def numbered_chunks(lines: Iterable[str], size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Non-blank lines with their 1-based line numbers, in lists of at most size"""
+    numbered = ((n, line) for n, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_process_map(fn: Callable[[T], R], tasks: Iterable[T], workers: Optional[int] = None,
+                        initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()) -> Iterator[R]:
+    """
+    fn(task) for every task, in task order, on a pool of worker processes
+
+    At most ``2 * workers`` tasks are in flight at once and tasks are pulled
+    lazily, so memory stays flat regardless of input size.
+
+    Args:
+        fn: Picklable function run in the workers
+        tasks: Picklable task arguments
+        workers: Worker processes (default: CPU count); 0 runs in-process
+        initializer: Called with initargs once per worker (once in-process)
+        initargs: Arguments for initializer
+
+    Returns:
+        Iterator of results
+    """
+    if workers == 0:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield fn(task)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
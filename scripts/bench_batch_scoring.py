@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark vectorized fleet scoring against the scalar per-report path
+
+Usage:
+    python scripts/bench_batch_scoring.py [--apps 100000] [--check 5000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.batch_scoring import QuestionLayout, score_answer_sets, score_matrix  # noqa: E402
+from core.scoring import score_yes_no_answers, risk_from_score  # noqa: E402
+
+ANSWERS = ("No", "Yes", "Unknown")
+
+
+def decode(matrix: np.ndarray, layout: QuestionLayout):
+    """Answer dicts for each row, in question order like the app builds them"""
+    answer_sets = []
+    for row in matrix:
+        sets = {s: {} for s in layout.sections}
+        for (section, question), code in zip(layout.columns, row):
+            if code >= 0:
+                sets[section][question] = ANSWERS[code]
+        answer_sets.append(sets)
+    return answer_sets
+
+
+def count_mismatches(result, answer_sets, layout: QuestionLayout, weights: np.ndarray) -> int:
+    """Rows where the vectorized scores or risks differ from the scalar path"""
+    section_weights = {s: {} for s in layout.sections}
+    for (section, question), w in zip(layout.columns, weights):
+        section_weights[section][question] = float(w)
+    mismatches = 0
+    for i, sets in enumerate(answer_sets):
+        scores = [score_yes_no_answers(sets[s], section_weights[s]) for s in layout.sections]
+        overall = round(sum(scores) / len(scores), 2) if scores else 0.0
+        if (scores != result.category_scores[i].tolist()
+                or [risk_from_score(s) for s in scores] != result.category_risk[i].tolist()
+                or overall != result.overall_score[i]):
+            mismatches += 1
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--apps", type=int, default=100_000, help="Applications to score")
+    parser.add_argument("--check", type=int, default=5_000, help="Applications scored via the scalar path")
+    args = parser.parse_args()
+
+    layout = QuestionLayout.from_engine()
+    rng = np.random.default_rng(11)
+    matrix = rng.integers(-1, 3, size=(args.apps, len(layout.columns)), dtype=np.int8)
+
+    start = time.perf_counter()
+    result = score_matrix(matrix, layout)
+    batch_s = time.perf_counter() - start
+
+    # Re-score after a weighting change
+    new_weights = layout.weights.copy()
+    new_weights[::3] = 2.0
+    start = time.perf_counter()
+    score_matrix(matrix, layout, new_weights)
+    reweight_s = time.perf_counter() - start
+
+    # Scalar path on a sample, decoding the matrix back into answer dicts
+    sample = matrix[:args.check]
+    answer_sets = decode(sample, layout)
+    start = time.perf_counter()
+    for sets in answer_sets:
+        [score_yes_no_answers(sets[s]) for s in layout.sections]
+    scalar_s = time.perf_counter() - start
+    mismatches = count_mismatches(result, answer_sets, layout, layout.weights)
+
+    # Random non-unit weights: about one score in 20k sits on a tie where
+    # np.round and round disagree, so try many weight vectors
+    for _ in range(300):
+        random_weights = np.round(rng.uniform(0.1, 3.0, size=len(layout.columns)), 2)
+        mismatches += count_mismatches(score_matrix(sample[:200], layout, random_weights),
+                                       answer_sets[:200], layout, random_weights)
+
+    # Questions outside the layout count with weight 1, like in the scalar path
+    extra = [dict(sets) for sets in answer_sets[:100]]
+    for i, sets in enumerate(extra):
+        section = layout.sections[i % len(layout.sections)]
+        sets[section] = {**sets[section], "Custom question": ANSWERS[i % 3]}
+    extended = layout.with_questions(extra)
+    mismatches += count_mismatches(score_answer_sets(extra, layout), extra, extended, extended.weights)
+
+    per_app_scalar = scalar_s / len(answer_sets)
+    print(f"Layout:              {len(layout.columns)} questions in {len(layout.sections)} categories")
+    print(f"Vectorized scoring:  {args.apps:,} apps in {batch_s * 1000:.1f} ms")
+    print(f"Re-weighted scoring: {args.apps:,} apps in {reweight_s * 1000:.1f} ms")
+    print(f"Scalar scoring:      {len(answer_sets):,} apps in {scalar_s * 1000:.1f} ms "
+          f"(~{per_app_scalar * args.apps:.2f} s projected for {args.apps:,})")
+    print(f"Result mismatches:   {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
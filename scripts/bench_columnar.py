@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Portfolio scan benchmark for core.columnar
+
+Writes the same audit reports two ways, one JSON file per report and
+Parquet tables from ParquetExporter, then times a typical BI query over
+each: the average score per category across the portfolio. The two
+results are checked against each other. Requires pyarrow.
+
+Usage:
+    python scripts/bench_columnar.py [--reports 20000] [--row-group-size 131072]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from importlib.util import find_spec
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_audit import build_compact_report, load_audits  # noqa: E402
+from core.columnar import DEFAULT_ROW_GROUP_SIZE, ParquetExporter  # noqa: E402
+from core.registry import get_registry  # noqa: E402
+from core.schema import UserEnvironment  # noqa: E402
+
+
+def make_reports(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    registry, audits = get_registry(), load_audits()
+    env = UserEnvironment(platform="OpenAI", agent_mode=False, connectors=[])
+    variants = []
+    for _ in range(200):
+        answers = {e.section: {q: rng.choice(["Yes", "No", "Unknown"]) for q in e.questions} for e in registry}
+        variants.append(build_compact_report(env, answers, audits))
+    return [(f"app-{i % 1000}", rng.choice(variants)) for i in range(count)]
+
+
+def scan_json(directory: str):
+    totals = defaultdict(lambda: [0.0, 0])
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+            for c in json.load(f)["audit_categories"]:
+                cell = totals[c["category"]]
+                cell[0] += c["score"]
+                cell[1] += 1
+    return {k: round(total / n, 4) for k, (total, n) in totals.items()}
+
+
+def scan_parquet(directory: str):
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(os.path.join(directory, "categories.parquet"), columns=["category", "score"])
+    grouped = table.group_by("category").aggregate([("score", "mean")]).to_pydict()
+    return {str(k): round(v, 4) for k, v in zip(grouped["category"], grouped["score_mean"])}
+
+
+def size_of(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+    if not find_spec("pyarrow"):
+        print("pyarrow is not installed; nothing to compare")
+        return 0
+
+    reports = make_reports(args.reports)
+    root = tempfile.mkdtemp()
+    json_dir, parquet_dir = os.path.join(root, "json"), os.path.join(root, "parquet")
+    os.makedirs(json_dir)
+
+    start = time.perf_counter()
+    for i, (_, report) in enumerate(reports):
+        with open(os.path.join(json_dir, f"{i:08d}.json"), "w", encoding="utf-8") as f:
+            json.dump(report.export_payload(), f, indent=2)
+    json_write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ParquetExporter(parquet_dir, row_group_size=args.row_group_size) as exporter:
+        for app_id, report in reports:
+            exporter.add(report, app_id)
+    parquet_write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_json = scan_json(json_dir)
+    json_scan = time.perf_counter() - start
+    start = time.perf_counter()
+    from_parquet = scan_parquet(parquet_dir)
+    parquet_scan = time.perf_counter() - start
+
+    ok = from_json == from_parquet
+    rows = ", ".join(f"{n:,} {t}" for t, n in exporter.rows.items())
+    print(f"{len(reports):,} reports -> {rows}")
+    print(f"JSON files: write {json_write:6.2f}s  scan {json_scan:7.3f}s  {size_of(json_dir) / 1024 / 1024:7.1f}MB")
+    print(f"Parquet:    write {parquet_write:6.2f}s  scan {parquet_scan:7.3f}s  "
+          f"{size_of(parquet_dir) / 1024 / 1024:7.1f}MB  ({json_scan / parquet_scan:,.0f}x faster scan)")
+    print(f"per-category averages match: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput benchmark for core.compact
+
+Builds one report holding a million findings twice: as validated pydantic
+models (Finding / CategoryResult / AuditReport) and as CompactReport. For
+each it measures construction time, memory retained (tracemalloc), the
+cost of repeated overall_score()/meta() calls and of the JSON export
+payload. The two export payloads and the round-tripped models are checked
+for equality.
+
+Usage:
+    python scripts/bench_compact.py [--findings 1000000] [--per-category 100]
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.compact import CompactCategory, CompactReport  # noqa: E402
+from core.schema import AuditReport, CategoryResult, Finding, Recommendation, UserEnvironment  # noqa: E402
+
+LEVELS = ("Low", "Medium", "High")
+SUMMARY = {"overall_score": "auto", "overall_risk": "auto"}
+
+
+def make_rows(findings: int, per_category: int, seed: int = 7):
+    """Plain (category, score, answers, findings, recommendations) rows shared by both builders"""
+    rng = random.Random(seed)
+    texts = [f"Finding {i}: control missing or unknown" for i in range(64)]
+    rows = []
+    for c in range(max(1, findings // per_category)):
+        answers = {f"Question {q}?": rng.choice(("Yes", "No", "Unknown")) for q in range(5)}
+        found = [(rng.choice(texts), rng.choice(LEVELS), None) for _ in range(per_category)]
+        recs = [(f"Fix {t[:10]}", rng.choice(LEVELS)) for t, _, _ in found[:per_category // 2]]
+        rows.append((f"Category {c}", round(rng.uniform(0, 10), 2), answers, found, recs))
+    return rows
+
+
+def build_pydantic(env, rows):
+    cats = []
+    for name, score, answers, found, recs in rows:
+        level = "Low" if score >= 8 else "Medium" if score >= 6 else "High"
+        cats.append(CategoryResult(
+            category=name, score=score, risk_level=level, questions=list(answers), answers=answers,
+            findings=[Finding(text=t, severity=s, evidence=e) for t, s, e in found],
+            recommendations=[Recommendation(text=t, effort=e) for t, e in recs],
+        ))
+    return AuditReport(user_environment=env, audit_categories=cats, summary=SUMMARY)
+
+
+def build_compact(env, rows):
+    cats = []
+    for name, score, answers, found, recs in rows:
+        level = "Low" if score >= 8 else "Medium" if score >= 6 else "High"
+        cats.append(CompactCategory.build(name, score, level, answers, found, recs))
+    return CompactReport(env, cats, SUMMARY)
+
+
+def measure(build, env, rows):
+    """(report, seconds, bytes retained) for one construction"""
+    gc.collect()
+    start = time.perf_counter()
+    report = build(env, rows)
+    seconds = time.perf_counter() - start
+    del report
+    gc.collect()
+    tracemalloc.start()
+    report = build(env, rows)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return report, seconds, retained
+
+
+def per_second(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    parser.add_argument("--per-category", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000, help="overall_score()+meta() calls timed")
+    args = parser.parse_args()
+
+    env = UserEnvironment(platform="OpenAI", agent_mode=True, connectors=["Google Drive"])
+    rows = make_rows(args.findings, args.per_category)
+    total = sum(len(r[3]) for r in rows)
+
+    model, model_s, model_mem = measure(build_pydantic, env, rows)
+    compact, compact_s, compact_mem = measure(build_compact, env, rows)
+
+    model_meta = per_second(lambda: (model.overall_score(), model.meta()), args.repeat)
+    compact_meta = per_second(lambda: (compact.overall_score(), compact.meta()), args.repeat)
+
+    start = time.perf_counter()
+    model_payload = model.export_payload()
+    model_export = time.perf_counter() - start
+    start = time.perf_counter()
+    compact_payload = compact.export_payload()
+    compact_export = time.perf_counter() - start
+
+    start = time.perf_counter()
+    round_trip = CompactReport.from_model(compact.to_model()).to_model()
+    convert = time.perf_counter() - start
+    ok = model_payload == compact_payload and round_trip == model
+
+    mb = 1024 * 1024
+    print(f"{total:,} findings in {len(rows):,} categories")
+    print(f"build     pydantic: {model_s:6.2f}s   compact: {compact_s:6.2f}s  ({model_s / compact_s:.1f}x)")
+    print(f"memory    pydantic: {model_mem / mb:6.1f}MB  compact: {compact_mem / mb:6.1f}MB"
+          f"  ({model_mem / compact_mem:.1f}x smaller)")
+    print(f"score+meta pydantic: {model_meta:,.0f}/s  compact: {compact_meta:,.0f}/s"
+          f"  ({compact_meta / model_meta:.0f}x)")
+    print(f"export    pydantic: {model_export:6.2f}s   compact: {compact_export:6.2f}s"
+          f"  ({model_export / compact_export:.1f}x)")
+    print(f"to_model/from_model round trip: {convert:.2f}s, equivalent: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
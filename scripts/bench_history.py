@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Write and trend-query benchmark for core.history
+
+Fills a fresh history database with audits of random answer sets spread
+over a year and over many apps, written in batches, then times the trend
+queries. The trend and regression results are checked against a
+brute-force computation over the same audits.
+
+Usage:
+    python scripts/bench_history.py [--audits 100000] [--apps 5000] [--db /tmp/history.sqlite3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_audit import build_compact_report, load_audits  # noqa: E402
+from core.history import DAY, AuditHistory  # noqa: E402
+from core.registry import get_registry  # noqa: E402
+from core.schema import UserEnvironment  # noqa: E402
+
+START = 1_700_000_000.0
+
+
+def make_audits(count: int, apps: int, seed: int = 5):
+    """(app_id, compact report, created) with a few distinct answer sets reused, like real fleets"""
+    rng = random.Random(seed)
+    registry, audits = get_registry(), load_audits()
+    env = UserEnvironment(platform="OpenAI", agent_mode=True, connectors=["Slack"])
+    variants = []
+    for _ in range(200):
+        answers = {e.section: {q: rng.choice(["Yes", "No", "Unknown"]) for q in e.questions} for e in registry}
+        variants.append(build_compact_report(env, answers, audits))
+    return [(f"app-{rng.randrange(apps)}", rng.choice(variants), START + rng.uniform(0, 365 * DAY))
+            for _ in range(count)]
+
+
+def timed(fn, repeat: int = 20):
+    fn()  # warm the page cache and statement cache
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--audits", type=int, default=100_000)
+    parser.add_argument("--apps", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--db", default=None, help="Database path (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "history.sqlite3")
+    if os.path.exists(path):
+        os.remove(path)
+    data = make_audits(args.audits, args.apps)
+    store = AuditHistory(path, batch_size=args.batch_size)
+
+    start = time.perf_counter()
+    store.add_many(data)
+    write_s = time.perf_counter() - start
+    size = sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+    print(f"{len(store):,} audits written in {write_s:.1f}s ({len(data) / write_s:,.0f}/s), "
+          f"{size / 1024 / 1024:,.0f}MB")
+
+    category = data[0][1].categories[0].category
+    trend, trend_ms = timed(lambda: store.category_trend(category, bucket_days=7))
+    month, month_ms = timed(lambda: store.category_trend(category, since=START + 100 * DAY,
+                                                         until=START + 130 * DAY))
+    regressed, regressed_ms = timed(lambda: store.regressed_apps(min_drop=0.5))
+    app_id = data[0][0]
+    history, history_ms = timed(lambda: store.app_history(app_id))
+    scores, scores_ms = timed(lambda: store.app_category_scores(app_id, category))
+    _, load_ms = timed(lambda: store.load_report(history[0].id))
+    print(f"category_trend (weekly, full year): {trend_ms:7.2f}ms  {len(trend)} points")
+    print(f"category_trend (daily, 30 days):    {month_ms:7.2f}ms  {len(month)} points")
+    print(f"regressed_apps:                     {regressed_ms:7.2f}ms  {len(regressed)} apps")
+    print(f"app_history:                        {history_ms:7.2f}ms  {len(history)} audits")
+    print(f"app_category_scores:                {scores_ms:7.2f}ms  {len(scores)} rows")
+    print(f"load_report:                        {load_ms:7.2f}ms")
+
+    # Brute-force checks
+    total = count = 0
+    latest = {}
+    for i, (app, report, created) in enumerate(data, 1):
+        for c in report.categories:
+            if c.category == category:
+                total += c.score
+                count += 1
+        latest.setdefault(app, []).append((created, i, report.overall_score()))
+    expected = set()
+    for app, audits in latest.items():
+        if len(audits) > 1:
+            (_, _, new), (_, _, old) = sorted(audits, reverse=True)[:2]
+            if old - new > 0.5:
+                expected.add(app)
+    ok = (sum(p.audits for p in trend) == count
+          and abs(sum(p.average * p.audits for p in trend) - total) < count * 0.01
+          and {r.app_id for r in regressed} == expected
+          and store.load_report(history[0].id) == data[history[0].id - 1][1].to_model())
+    print(f"results match brute force: {ok}")
+    store.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
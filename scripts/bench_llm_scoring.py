@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for core.llm_scoring
+
+Runs a full 7-category audit through the fake provider with a fixed
+per-call latency, one category per call in sequence (the naive approach)
+and through the concurrent, batched pipeline.
+
+Usage:
+    python scripts/bench_llm_scoring.py [--latency 2.0] [--concurrency 4] [--batch-size 2]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_audit import build_report, load_audits  # noqa: E402
+from core.llm_scoring import FakeProvider, enhance_results  # noqa: E402
+from core.schema import UserEnvironment  # noqa: E402
+
+
+async def sequential(results, env, latency):
+    provider = FakeProvider(latency=latency)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    out = []
+    for result in results:
+        outcome = await enhance_results([result], env, provider, concurrency=1, batch_size=1)
+        out.extend(outcome.categories)
+    return out, provider.calls, loop.time() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=2.0, help="Seconds per fake provider call")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=2)
+    args = parser.parse_args()
+
+    audits = load_audits()
+    env = UserEnvironment(platform="OpenAI", agent_mode=True, connectors=["Slack"])
+    answers = {s: {q: ("No", "Unknown", "Yes")[i % 3] for i, q in enumerate(a.questions())}
+               for s, a in audits.items()}
+    results = build_report(env, answers, audits).audit_categories
+
+    seq, seq_calls, seq_s = asyncio.run(sequential(results, env, args.latency))
+    provider = FakeProvider(latency=args.latency)
+    outcome = asyncio.run(enhance_results(results, env, provider, concurrency=args.concurrency,
+                                          batch_size=args.batch_size))
+    same = [c.model_dump() for c in seq] == [c.model_dump() for c in outcome.categories]
+
+    print(f"{len(results)} categories, {args.latency:.2f}s per call")
+    print(f"sequential: {seq_s:6.2f}s  ({seq_calls} calls)")
+    print(f"pipeline:   {outcome.seconds:6.2f}s  ({outcome.calls} calls, peak {provider.peak_in_flight} in flight, "
+          f"{seq_s / outcome.seconds:.1f}x)")
+    print(f"same results: {same}")
+    return 0 if same and not outcome.errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
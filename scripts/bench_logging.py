@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Caller-side cost of logging in core.logging_config, sync vs async
+
+Threads log structured events to a JSON log file (and to stdout, sent to
+/dev/null) first in synchronous mode, then through the async queue. The
+time each logging call takes in the calling thread is recorded. In async
+mode, events dropped because the queue was full are counted and the
+written lines are checked against the events that were accepted.
+
+By default each thread logs at a steady --rate the listener keeps up
+with, which is the case async mode is for. The listener's CPU time is
+reported too: while it renders it holds the GIL, and callers that need
+the GIL then wait, which is what shows up in their p99. --rate 0 logs as
+fast as possible, saturating the queue, so most events are dropped.
+
+Usage:
+    python scripts/bench_logging.py [--threads 4] [--events 5000] [--rate 1000] [--queue-size 10000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import structlog  # noqa: E402
+
+from core import logging_config  # noqa: E402
+
+
+def run(threads: int, events: int, rate: float, **options):
+    """(per-call latencies in seconds, wall seconds, log file path, dropped events, listener CPU seconds)"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    structlog.reset_defaults()
+    log_file = os.path.join(tempfile.mkdtemp(), "bench.log")
+    logging_config.setup_logging("INFO", log_file=log_file, **options)
+    logger = logging_config.get_logger("bench")
+
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(out) -> None:
+        barrier.wait()
+        clock = time.perf_counter
+        begin = clock()
+        for i in range(events):
+            if rate:
+                delay = begin + i / rate - clock()
+                if delay > 0:
+                    time.sleep(delay)
+            start = clock()
+            logger.info("Audit completed", overall_score=7.5, categories=7, recomputed=i % 7, session="abc123")
+            out.append(clock() - start)
+
+    pool = [threading.Thread(target=worker, args=(out,)) for out in latencies]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    wall = time.perf_counter() - start
+
+    dropped, listener_cpu = 0, 0.0
+    handler = logging_config._active_handler
+    if handler is not None:
+        dropped = handler.dropped
+        clock_id = time.pthread_getcpuclockid(logging_config._active._thread.ident)
+        listener_cpu = time.clock_gettime(clock_id)
+    logging_config._stop_active()
+    return sorted(x for out in latencies for x in out), wall, log_file, dropped, listener_cpu
+
+
+def describe(name: str, latencies, wall: float) -> str:
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6
+
+    return (f"{name:<6} p50 {pct(0.50):7.1f}us  p99 {pct(0.99):8.1f}us  max {latencies[-1] * 1e3:7.2f}ms  "
+            f"caller wall {wall:5.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--events", type=int, default=5_000, help="Events per thread")
+    parser.add_argument("--rate", type=float, default=1_000, help="Events per second per thread (0 = unpaced)")
+    parser.add_argument("--queue-size", type=int, default=logging_config.DEFAULT_QUEUE_SIZE)
+    args = parser.parse_args()
+    total = args.threads * args.events
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        sync_lat, sync_wall, _, _, _ = run(args.threads, args.events, args.rate, async_mode=False)
+        async_lat, async_wall, async_file, dropped, listener_cpu = run(
+            args.threads, args.events, args.rate, async_mode=True, queue_size=args.queue_size)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    with open(async_file, "r", encoding="utf-8") as f:
+        written = sum(1 for _ in f)
+    pace = f"at {args.rate:,.0f}/s each" if args.rate else "unpaced"
+    print(f"{args.threads} threads x {args.events:,} events {pace}")
+    print(describe("sync", sync_lat, sync_wall))
+    print(describe("async", async_lat, async_wall))
+    print(f"async: {written:,} written, {dropped:,} dropped (queue size {args.queue_size:,})")
+    print(f"async: listener CPU {listener_cpu:.2f}s, {listener_cpu / async_wall:.0%} of caller wall "
+          f"(GIL held while rendering)")
+    ok = written + dropped == total
+    print(f"every event written or counted: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Recording-overhead benchmark for core.metrics
+
+Threads record into one histogram and one counter, first through the
+per-thread shards of core.metrics, then through a single lock-protected
+accumulator of the same shape. The totals are checked against the number
+of calls made, and the shards of the finished threads must have been
+folded away.
+
+Usage:
+    python scripts/bench_metrics.py [--threads 8] [--calls 200000]
+"""
+import argparse
+import sys
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.metrics import DEFAULT_BUCKETS, MetricsRegistry  # noqa: E402
+
+
+class LockedHistogram:
+    """Baseline: one shared accumulator guarded by a lock"""
+
+    def __init__(self, bounds):
+        self._bounds = bounds
+        self._cells = [0.0] * (len(bounds) + 3)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._cells[bisect_left(self._bounds, value)] += 1
+            self._cells[-2] += value
+            self._cells[-1] += 1
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._cells[-1] += amount
+
+
+def hammer(observe, inc, threads: int, calls: int) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        for i in range(calls):
+            observe((i % 1000) / 10000.0)
+            inc()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    total = args.threads * args.calls
+
+    registry = MetricsRegistry()
+    hist = registry.histogram("bench_seconds", "bench")
+    counter = registry.counter("bench_calls", "bench")
+    sharded = hammer(hist.observe, counter.inc, args.threads, args.calls)
+    _, _, count = hist.labels().snapshot()
+    ok = count == total and counter.labels().value == total
+    # The benchmark threads have exited; their shards should be gone
+    leftover = len(hist.labels()._cells._shards) + len(counter.labels()._cells._shards)
+
+    locked = LockedHistogram(DEFAULT_BUCKETS)
+    baseline = hammer(locked.observe, locked.inc, args.threads, args.calls)
+
+    print(f"{args.threads} threads x {args.calls:,} observe+inc")
+    print(f"locked:  {baseline:6.2f}s  ({baseline / total * 1e9:,.0f} ns/call)")
+    print(f"sharded: {sharded:6.2f}s  ({sharded / total * 1e9:,.0f} ns/call, {baseline / sharded:.2f}x)")
+    print(f"render:  {len(registry.render()):,} bytes, totals match: {ok}, shards left: {leftover}")
+    return 0 if ok and not leftover else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark for core.security.RateLimiter
+
+Many threads hammer one limiter, either on a single hot key or spread over
+a large key space, and the allowed count on the hot key is checked against
+the quota.
+
+Usage:
+    python scripts/bench_rate_limiter.py [--threads 32] [--calls 5000] [--keys 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.rate_limit import InMemoryBackend, SQLiteBackend  # noqa: E402
+from core.security import RateLimiter  # noqa: E402
+
+# Long enough that token refill during a run is negligible
+WINDOW = 3600
+
+
+class ListRateLimiter:
+    """The previous implementation: a per-key list of datetimes rebuilt on every call"""
+
+    def __init__(self, max_requests: int, window_seconds: int):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.cache = {}
+
+    def is_allowed(self, identifier: str) -> bool:
+        now = datetime.now()
+        cutoff = now - timedelta(seconds=self.window_seconds)
+        requests = [t for t in self.cache.get(identifier, []) if t > cutoff]
+        if len(requests) >= self.max_requests:
+            return False
+        requests.append(now)
+        self.cache[identifier] = requests
+        return True
+
+
+def hammer(limiter, threads: int, calls: int, keys):
+    allowed = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(n: int) -> None:
+        rng = random.Random(n)
+        check = limiter.is_allowed
+        barrier.wait()
+        count = 0
+        for _ in range(calls):
+            count += check(keys[rng.randrange(len(keys))] if len(keys) > 1 else keys[0])
+        allowed[n] = count
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, sum(allowed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per thread")
+    parser.add_argument("--keys", type=int, default=20000, help="Distinct identifiers in the spread test")
+    parser.add_argument("--limit", type=int, default=1000, help="Quota per window")
+    args = parser.parse_args()
+
+    spread = [f"session-{i}" for i in range(args.keys)]
+    hot = ["hot-session"]
+    total = args.threads * args.calls
+    failures = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        limiters = {
+            "legacy list (unlocked)": lambda: ListRateLimiter(args.limit, WINDOW),
+            "sliding window": lambda: RateLimiter(args.limit, WINDOW, backend=InMemoryBackend()),
+            "token bucket": lambda: RateLimiter(args.limit, WINDOW, algorithm="token_bucket", backend=InMemoryBackend()),
+            "sliding window / sqlite": lambda: RateLimiter(args.limit, WINDOW, backend=SQLiteBackend(os.path.join(tmp, "rl.db"))),
+        }
+        print(f"{args.threads} threads x {args.calls} calls, quota {args.limit}/{WINDOW}s")
+        for name, factory in limiters.items():
+            calls = args.calls if "sqlite" not in name else max(1, args.calls // 10)
+            spread_s, _ = hammer(factory(), args.threads, calls, spread)
+            hot_s, hot_allowed = hammer(factory(), args.threads, calls, hot)
+            ok = hot_allowed == min(args.limit, args.threads * calls)
+            failures += not ok and "legacy" not in name
+            print(f"  {name:26s} spread: {args.threads * calls / spread_s:>10,.0f} checks/s   "
+                  f"hot key: {args.threads * calls / hot_s:>10,.0f} checks/s   "
+                  f"hot allowed {hot_allowed} ({'ok' if ok else 'OVER/UNDER QUOTA'})")
+    print(f"Total checks per in-process run: {total:,}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
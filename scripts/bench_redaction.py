@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark for core.redaction against the previous five-pass re.sub redactor
+
+Generates a synthetic conversation log, redacts it whole with both
+implementations and then streams it in chunks. Both outputs must equal the
+five-pass output. So must the output for fuzzed strings built from
+pattern fragments glued together (emails running into API keys, digits
+running into emails, non-ASCII digits and letters), whole and streamed
+in small random chunks.
+
+Usage:
+    python scripts/bench_redaction.py [--mb 64] [--chunk-size 1048576] [--fuzz 100000]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.redaction import redact, redact_stream  # noqa: E402
+
+LEGACY_PATTERNS = {
+    'api_key': r'(sk-|api[_-]?key[_-]?)[a-zA-Z0-9]{20,}',
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    'ip_address': r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
+    'credit_card': r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
+    'ssn': r'\b\d{3}-\d{2}-\d{4}\b',
+}
+
+LINES = [
+    "user: how do I rotate my key sk-{key}?",
+    "assistant: Contact {name}@example.com and include the request id.",
+    "user: the service on 10.{a}.{b}.7 keeps timing out",
+    "user: my card 4111 1111 1111 {a:04d} was charged twice",
+    "user: SSN 123-45-{a:04d} appears in the export",
+    "assistant: Sure, here is a summary of the retrieval-augmented generation setup you described.",
+    "assistant: Prompt injection risks are reduced by isolating tool outputs from instructions.",
+    "user: api_key={key}",
+    "user: reach me at {name}@example.comsk-{key} or 10.{a}.{b}.7sk-{key}",
+]
+
+FUZZ_PIECES = [
+    "sk-", "api_key", "api-key", "apikey", "@", ".", "com", "io", "bob", "corp", "-", "_", "|", "%", "+",
+    " ", "\n", "\t", "[", "]", ":", "=", "é", "٣", "7", "12", "123", "1234", "4111", "10.0.0.1",
+    "123-45-6789", "4111 1111 1111 1111", "bob@corp.com", "ABCDEFGHIJKLMNOPQRSTUVWX",
+]
+
+
+def legacy_redact(text: str) -> str:
+    for name, pattern in LEGACY_PATTERNS.items():
+        text = re.sub(pattern, f'[REDACTED_{name.upper()}]', text)
+    return text
+
+
+def fuzz_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 24)):
+        if rng.random() < 0.8:
+            parts.append(rng.choice(FUZZ_PIECES))
+        else:
+            parts.append("".join(rng.choice("abcXYZ0189") for _ in range(rng.randint(1, 24))))
+    return "".join(parts)
+
+
+def check_fuzz(count: int, seed: int = 13) -> int:
+    """Number of fuzzed strings where whole or streamed output differs from the five-pass output"""
+    rng = random.Random(seed)
+    mismatches = 0
+    for i in range(count):
+        text = fuzz_text(rng)
+        expected = legacy_redact(text)
+        size = rng.randint(1, 16)
+        streamed = "".join(redact_stream(text[j:j + size] for j in range(0, len(text), size)))
+        if redact(text) != expected or streamed != expected:
+            if mismatches < 5:
+                print(f"  mismatch: {text!r}")
+            mismatches += 1
+    return mismatches
+
+
+def make_log(size: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size:
+        line = rng.choice(LINES).format(
+            key="".join(rng.choice("abcdefABCDEF0123456789") for _ in range(32)),
+            name=f"user{rng.randrange(1000)}", a=rng.randrange(256), b=rng.randrange(256),
+        ) + "\n"
+        parts.append(line)
+        total += len(line)
+    return "".join(parts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mb", type=float, default=64, help="Size of the synthetic log in MB")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="Characters per streamed chunk")
+    parser.add_argument("--fuzz", type=int, default=100_000, help="Fuzzed strings compared with the five-pass output")
+    args = parser.parse_args()
+
+    text = make_log(int(args.mb * 1024 * 1024))
+    mb = len(text) / (1024 * 1024)
+
+    start = time.perf_counter()
+    expected = legacy_redact(text)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    whole = redact(text)
+    whole_s = time.perf_counter() - start
+
+    chunks = (text[i:i + args.chunk_size] for i in range(0, len(text), args.chunk_size))
+    start = time.perf_counter()
+    streamed = "".join(redact_stream(chunks))
+    stream_s = time.perf_counter() - start
+
+    print(f"{mb:.1f} MB synthetic log")
+    print(f"  legacy five-pass:  {mb / legacy_s:8.1f} MB/s")
+    print(f"  combined scanner:  {mb / whole_s:8.1f} MB/s ({legacy_s / whole_s:.1f}x)")
+    print(f"  streamed ({args.chunk_size} char chunks): {mb / stream_s:8.1f} MB/s")
+    ok = whole == expected and streamed == expected
+    print(f"  whole and streamed output equal five-pass output: {ok}")
+    mismatches = check_fuzz(args.fuzz)
+    print(f"{args.fuzz:,} fuzzed strings: {mismatches} mismatches")
+    return 0 if ok and not mismatches else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
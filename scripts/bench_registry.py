@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Rerun-cost benchmark for core.registry
+
+Times the template and audit-resolution work a Streamlit rerun of the app
+does: the previous per-rerun YAML parsing and importlib lookups against
+registry lookups, and checks both resolve the same sections and questions.
+
+Usage:
+    python scripts/bench_registry.py [--reruns 200]
+"""
+import argparse
+import importlib
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.registry import DEFAULT_PROVIDERS_PATH, DEFAULT_QUESTIONS_PATH, get_providers, get_registry  # noqa: E402
+from core.utils import load_yaml  # noqa: E402
+
+
+def legacy_rerun():
+    """The previous per-rerun work: parse both templates, resolve every audit twice"""
+    questions = load_yaml(DEFAULT_QUESTIONS_PATH)
+    load_yaml(DEFAULT_PROVIDERS_PATH)
+    resolved = {}
+    for _ in range(2):  # tab rendering, then run_audit
+        for section, spec in questions["sections"].items():
+            module_name = section.lower().replace(" & ", "_").replace(" ", "_")
+            mod = importlib.import_module(f"audits.{module_name}")
+            class_name = "".join([w.capitalize() for w in module_name.split("_")]) + "Audit"
+            resolved[section] = (getattr(mod, class_name)(), tuple(spec["questions"]))
+    return resolved
+
+
+def registry_rerun():
+    registry = get_registry()
+    get_providers()
+    resolved = {}
+    for _ in range(2):
+        for entry in registry:
+            resolved[entry.section] = (entry.audit, entry.questions)
+    return resolved
+
+
+def timed(fn, reruns: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        fn()
+    return (time.perf_counter() - start) / reruns
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=200)
+    args = parser.parse_args()
+
+    old = legacy_rerun()
+    new = registry_rerun()
+    same = list(old) == list(new) and all(old[s][1] == new[s][1] for s in old)
+
+    old_t = timed(legacy_rerun, args.reruns)
+    new_t = timed(registry_rerun, args.reruns)
+    print(f"legacy:   {old_t * 1000:8.3f} ms/rerun")
+    print(f"registry: {new_t * 1000:8.3f} ms/rerun  ({old_t / new_t:,.0f}x)")
+    print(f"same sections/questions: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF rendering: in-memory renderer vs the previous file-based one
+
+Builds reports with long findings, renders them with both implementations
+(reportlab in invariant mode so output is deterministic) and checks that
+the PDFs are byte-identical.
+
+Usage:
+    python scripts/bench_report.py [--categories 50] [--words 400] [--runs 3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.report import render_pdf  # noqa: E402
+from core.schema import AuditReport, CategoryResult, Finding, Recommendation, UserEnvironment  # noqa: E402
+
+VOCABULARY = ("retrieval", "connector", "tenant", "isolation", "prompt", "injection", "token", "scope",
+              "embedding", "vector", "store", "audit", "log", "retention", "PII", "redaction", "model")
+
+
+class FixedTimeReport(AuditReport):
+    """Report whose header timestamp is constant, so renders are comparable"""
+
+    def meta(self):
+        meta = super().meta()
+        meta["generated_at"] = "2024-01-01T00:00:00Z"
+        return meta
+
+
+def legacy_generate_pdf(audit, pdf_path):
+    """The previous implementation: file output and a re-measuring wrapper"""
+    c = canvas.Canvas(pdf_path, pagesize=letter)
+    width, height = letter
+    margin = 0.75 * inch
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(margin, height - margin, "AI Shield Security Audit Report")
+    c.setFont("Helvetica", 10)
+    meta = audit.meta()
+    c.drawString(margin, height - margin - 16, f"Generated: {meta['generated_at']}  |  Overall Score: {meta['overall_score']}  |  Overall Risk: {meta['overall_risk']}")
+    y = height - margin - 40
+    env = audit.user_environment
+    env_text = f"Platform: {env.platform} | Agent Mode: {env.agent_mode} | Connectors: {', '.join(env.connectors) or 'None'}"
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(margin, y, "Environment")
+    y -= 14
+    c.setFont("Helvetica", 10)
+    c.drawString(margin, y, env_text)
+    y -= 20
+    for cat in audit.audit_categories:
+        if y < margin + 120:
+            c.showPage()
+            y = height - margin
+        c.setFont("Helvetica-Bold", 12)
+        c.setFillColor(colors.black)
+        c.drawString(margin, y, f"{cat.category} — Score: {cat.score} | Risk: {cat.risk_level}")
+        y -= 12
+        for label, items, attr in (("Key Findings:", cat.findings, "severity"),
+                                   ("Top Recommendations:", cat.recommendations, "effort")):
+            c.setFont("Helvetica-Oblique", 9)
+            c.drawString(margin, y, label)
+            y -= 12
+            c.setFont("Helvetica", 9)
+            if not items:
+                c.drawString(margin, y, "• None recorded")
+                y -= 12
+            else:
+                for item in items[:6]:
+                    y = legacy_draw_wrapped(c, f"• ({getattr(item, attr)}) {item.text}", margin, y, width - 2*margin, 11)
+                    if y < margin + 120:
+                        c.showPage()
+                        y = height - margin
+        y -= 8
+    c.showPage()
+    c.save()
+    return pdf_path
+
+
+def legacy_draw_wrapped(c, text, x, y, max_width, leading):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    line = ""
+    for w in text.split():
+        test = (line + " " + w).strip()
+        if stringWidth(test, "Helvetica", 9) < max_width:
+            line = test
+        else:
+            c.drawString(x, y, line)
+            y -= leading
+            line = w
+    if line:
+        c.drawString(x, y, line)
+        y -= leading
+    return y
+
+
+def make_report(categories: int, words: int, seed: int = 3) -> FixedTimeReport:
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+    cats = [
+        CategoryResult(
+            category=f"Category {i}", score=round(rng.uniform(0, 10), 2), risk_level="Medium",
+            questions=[], answers={},
+            findings=[Finding(text=sentence(), severity="High") for _ in range(8)],
+            recommendations=[Recommendation(text=sentence(), effort="Low") for _ in range(8)],
+        )
+        for i in range(categories)
+    ]
+    env = UserEnvironment(platform="ChatGPT Enterprise", agent_mode=True, connectors=["Slack", "Google Drive"])
+    return FixedTimeReport(user_environment=env, audit_categories=cats, summary={})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--words", type=int, default=400, help="Words per finding / recommendation")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    rl_config.invariant = 1
+    report = make_report(args.categories, args.words)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.pdf")
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            legacy_generate_pdf(report, path)
+            with open(path, "rb") as f:
+                legacy = f.read()
+        legacy_s = (time.perf_counter() - start) / args.runs
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        data = render_pdf(report)
+    new_s = (time.perf_counter() - start) / args.runs
+
+    print(f"{args.categories} categories, {args.words}-word findings, {len(data) / 1024:.0f} KB PDF")
+    print(f"  legacy (disk):  {legacy_s * 1e3:8.1f} ms")
+    print(f"  in-memory:      {new_s * 1e3:8.1f} ms ({legacy_s / new_s:.1f}x)")
+    if data != legacy:
+        print("PDF output differs from the legacy renderer")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
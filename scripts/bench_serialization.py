@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Archive serialization benchmark for core.serialization
+
+Generates audit reports from random answer sets, then writes and reads
+them back three ways: the existing export path (``model_dump`` plus
+``json.dumps(indent=2)`` per report, read back with ``model_validate``),
+streaming compact JSONL, and the binary archive format. Write time, read
+time and file size are reported, and every read-back report is checked
+against the original.
+
+Usage:
+    python scripts/bench_serialization.py [--reports 2000]
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_audit import build_report, load_audits  # noqa: E402
+from core.registry import get_registry  # noqa: E402
+from core.schema import AuditReport, UserEnvironment  # noqa: E402
+from core import serialization  # noqa: E402
+
+
+def make_reports(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    registry, audits = get_registry(), load_audits()
+    reports = []
+    for i in range(count):
+        env = UserEnvironment(platform=rng.choice(["OpenAI", "Anthropic", "Azure"]), agent_mode=bool(i % 2),
+                              connectors=rng.sample(["Google Drive", "Slack", "Jira", "GitHub"], i % 4))
+        answers = {e.section: {q: rng.choice(["Yes", "No", "Unknown"]) for q in e.questions} for e in registry}
+        reports.append(build_report(env, answers, audits))
+    return reports
+
+
+def indented_write(reports):
+    buffer = io.StringIO()
+    for report in reports:
+        buffer.write(json.dumps(report.export_payload(), indent=2) + "\n\x1e\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def indented_read(data):
+    out = []
+    for chunk in data.decode("utf-8").split("\n\x1e\n")[:-1]:
+        payload = json.loads(chunk)
+        payload["summary"] = {k: str(v) for k, v in payload["summary"].items()}
+        out.append(AuditReport.model_validate(payload))
+    return out
+
+
+def jsonl_write(reports):
+    buffer = io.StringIO()
+    serialization.write_jsonl(reports, buffer)
+    return buffer.getvalue().encode("utf-8")
+
+
+def jsonl_read(data):
+    return list(serialization.read_jsonl(io.StringIO(data.decode("utf-8"))))
+
+
+def binary_write(reports):
+    buffer = io.BytesIO()
+    serialization.write_binary(reports, buffer)
+    return buffer.getvalue()
+
+
+def binary_read(data):
+    return list(serialization.read_binary(io.BytesIO(data)))
+
+
+def timed(fn, arg):
+    start = time.perf_counter()
+    result = fn(arg)
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=2000)
+    args = parser.parse_args()
+
+    reports = make_reports(args.reports)
+    expected = [r.export_payload() for r in reports]
+    codec = "msgpack" if serialization.msgpack is not None else "pure-Python codec"
+    print(f"{len(reports):,} reports, binary via {codec}")
+    print(f"{'format':<16}{'write':>9}{'read':>9}{'size':>12}")
+
+    ok = True
+    baseline = None
+    for name, write, read, lossless in (("indented JSON", indented_write, indented_read, False),
+                                        ("compact JSONL", jsonl_write, jsonl_read, False),
+                                        ("binary", binary_write, binary_read, True)):
+        data, write_s = timed(write, reports)
+        back, read_s = timed(read, data)
+        if lossless:
+            ok &= back == reports
+        else:
+            ok &= [r.export_payload() for r in back] == expected
+        baseline = baseline or (write_s, read_s, len(data))
+        print(f"{name:<16}{write_s:8.2f}s{read_s:8.2f}s{len(data) / 1024:10,.0f}KB"
+              f"   ({baseline[0] / write_s:.1f}x / {baseline[1] / read_s:.1f}x / {baseline[2] / len(data):.1f}x)")
+    print(f"round trips match: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Streamlit apps
+
+Each measurement runs in a fresh interpreter so nothing is cached in
+sys.modules:
+
+- import: the module-level imports of the app (read from its source, so
+  the list cannot go stale), plus building the audit registry, against
+  the same set with the heavy dependencies (pandas, ReportLab) imported
+  eagerly as before. Fails if a heavy module is loaded at startup.
+- first render: AppTest.from_file(app).run(), when streamlit is installed.
+
+Usage:
+    python scripts/bench_startup.py [--runs 7] [--app app_enhanced.py] [--max-import-ms 500]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must stay out of sys.modules until first use
+HEAVY = ("pandas", "reportlab")
+
+# Left to the first-render probe
+EXCLUDED_IMPORTS = ("streamlit",)
+
+# Startup work the apps do at import time, run when the app imports the name
+STARTUP_CALLS = ("get_registry", "get_providers", "check_dependencies")
+
+
+def startup_imports(app: Path) -> str:
+    """Source of the app's module-level import statements, followed by its startup calls"""
+    lines, names = [], set()
+    for node in ast.parse(app.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            modules = [node.module]
+        else:
+            continue
+        if any(module.split(".")[0] in EXCLUDED_IMPORTS for module in modules):
+            continue
+        lines.append(ast.unparse(node))
+        names.update(alias.asname or alias.name for alias in node.names)
+    lines.extend(f"{name}()" for name in STARTUP_CALLS if name in names)
+    return "\n".join(lines) + "\n"
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "exceptions": len(at.exception)}}))
+"""
+
+
+def probe(source: str) -> dict:
+    out = subprocess.run([sys.executable, "-c", source], cwd=ROOT, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"})
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip())
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(source: str, runs: int):
+    results = [probe(source) for _ in range(runs)]
+    return statistics.median(r["seconds"] for r in results) * 1000, results[-1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--app", default="app_enhanced.py")
+    parser.add_argument("--max-import-ms", type=float, default=None, help="Fail if the median lazy import exceeds this")
+    args = parser.parse_args()
+
+    startup_code = startup_imports(ROOT / args.app)
+    eager_code = startup_code + "".join(f"import {m}\n" for m in HEAVY if find_spec(m))
+    if find_spec("reportlab"):
+        eager_code += "import reportlab.pdfgen.canvas\n"
+    lazy_ms, lazy = measure(IMPORT_PROBE.format(code=startup_code, heavy=HEAVY), args.runs)
+    eager_ms, _ = measure(IMPORT_PROBE.format(code=eager_code, heavy=HEAVY), args.runs)
+    print(f"startup imports (lazy):  {lazy_ms:8.1f} ms median of {args.runs}")
+    print(f"startup imports (eager): {eager_ms:8.1f} ms  ({eager_ms - lazy_ms:+.1f} ms for {', '.join(HEAVY)})")
+
+    failed = False
+    if lazy["heavy"]:
+        print(f"FAIL: loaded at startup: {', '.join(lazy['heavy'])}")
+        failed = True
+    if args.max_import_ms is not None and lazy_ms > args.max_import_ms:
+        print(f"FAIL: startup imports took {lazy_ms:.1f} ms (limit {args.max_import_ms:.1f} ms)")
+        failed = True
+
+    if find_spec("streamlit"):
+        render_ms, render = measure(RENDER_PROBE.format(app=args.app), args.runs)
+        print(f"first render ({args.app}): {render_ms:8.1f} ms median, {render['exceptions']} exceptions")
+        failed |= render["exceptions"] > 0
+    else:
+        print("first render: skipped (streamlit not installed)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
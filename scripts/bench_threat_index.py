@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup and enrichment cost of core.threat_index
+
+Times building the index from seed.sql against loading it from a JSON and
+a SQLite snapshot, then links the findings of synthetic reports to
+threats. The links are checked against a naive reference that filters
+every threat row for each finding.
+
+Usage:
+    python scripts/bench_threat_index.py [--reports 2000] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bulk_audit import build_compact_report, load_audits  # noqa: E402
+from core.registry import get_registry  # noqa: E402
+from core.schema import UserEnvironment  # noqa: E402
+from core.threat_index import (CATEGORY_THREAT_TYPES, FINDING_THREAT_SEVERITIES, MAX_LINKS,  # noqa: E402
+                               SEVERITY_ORDER, load_index)
+from core.threat_intel import load_threat_intel  # noqa: E402
+
+PLATFORMS = ("OpenAI", "Azure", "Anthropic", "Google", "Custom")
+
+
+def make_reports(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    registry, audits = get_registry(), load_audits()
+    reports = []
+    for _ in range(count):
+        env = UserEnvironment(platform=rng.choice(PLATFORMS), agent_mode=False, connectors=[])
+        answers = {e.section: {q: rng.choice(["Yes", "No", "Unknown"]) for q in e.questions} for e in registry}
+        reports.append(build_compact_report(env, answers, audits))
+    return reports
+
+
+def reference_links(rows, category: str, text: str, severity: str, platform: str):
+    """Threat ids for one finding, recomputed from the raw rows"""
+    if text.startswith("["):
+        source_id = text[1:text.find("]")]
+        if any(row["source_id"] == source_id for row in rows):
+            return [source_id]
+    types = CATEGORY_THREAT_TYPES.get(category, ())
+    candidates = []
+    for row in rows:
+        systems = row["affected_systems"]
+        names = [s.lower() for key in ("frameworks", "tools") for s in systems.get(key, ())]
+        platforms = [p.lower() for p in systems.get("platforms", ())]
+        if row["threat_type"] in types and ("all" in platforms or platform.lower() in platforms + names):
+            candidates.append(row)
+    candidates.sort(key=lambda row: row["published_at"], reverse=True)
+    candidates.sort(key=lambda row: SEVERITY_ORDER.index(row["severity"]))
+    preferred = FINDING_THREAT_SEVERITIES.get(severity, SEVERITY_ORDER)
+    ranked = [row for row in candidates if row["severity"] in preferred] or candidates
+    return [row["source_id"] for row in ranked[:MAX_LINKS]]
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50, help="Startup timings keep the best of this many runs")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, "threat_intel.json")
+    sqlite_path = os.path.join(directory, "threat_intel.sqlite3")
+    load_index(snapshot_path=json_path)
+    load_index(snapshot_path=sqlite_path)
+    for label, fn in (("seed parse", lambda: load_index()),
+                      ("JSON snapshot", lambda: load_index(snapshot_path=json_path)),
+                      ("SQLite snapshot", lambda: load_index(snapshot_path=sqlite_path))):
+        print(f"startup {label:<16} {best_of(args.repeat, fn) * 1000:7.2f}ms")
+
+    reports = make_reports(args.reports)
+    findings = sum(r.finding_count() for r in reports)
+    index = load_index(snapshot_path=json_path)
+    start = time.perf_counter()
+    for report in reports:
+        index.enrich(report)
+    elapsed = time.perf_counter() - start
+
+    rows = load_threat_intel()
+    start = time.perf_counter()
+    expected = [[reference_links(rows, c.category, t, s, r.user_environment.platform) for t, s, _ in c.findings()]
+                for r in reports for c in r.categories]
+    naive = time.perf_counter() - start
+    ok = expected == [list(c.threats()) for r in reports for c in r.categories]
+
+    print(f"enrich    {findings:,} findings in {elapsed:6.3f}s  {elapsed / findings * 1e6:6.2f}us per finding")
+    print(f"reference {findings:,} findings in {naive:6.3f}s  {naive / findings * 1e6:6.2f}us per finding")
+    print(f"links match reference: {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())